@@ -4,7 +4,7 @@ from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks
 from pydantic import BaseModel
 from sqlalchemy.orm import Session
 from starlette import status
-from starlette.responses import JSONResponse
+from app.core.responses import JSONResponse
 
 from app.core.auth import get_current_verified_user
 from app.core.config import settings
@@ -13,6 +13,7 @@ from app.services import user_service
 from app.models.topic import Topic
 from app.models.user import User
 from app.services.mistral.conversation_service import MistralConversationService
+from app.services.mistral.model_router import model_router
 from app.services.topic_service import TopicService
 from app.services.task_schedule.schedule_update_collection_service import schedule_topic_update_at
 
@@ -26,6 +27,38 @@ class ChatRequest(BaseModel):
 class CollectUpdatesRequest(BaseModel):
     topic_id: str
 
+
+def _check_admin(current_user: dict, db: Session) -> Optional[JSONResponse]:
+    admin_email = (settings.ADMIN_EMAIL or "").strip().lower()
+    if not admin_email:
+        return JSONResponse(
+            content={"message": "ADMIN_EMAIL is not configured"},
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+        )
+
+    user_email = str(current_user.get("user_email") or "").strip().lower()
+    if user_email != admin_email:
+        return JSONResponse(
+            content={"message": "Only admin can access this endpoint"},
+            status_code=status.HTTP_403_FORBIDDEN,
+        )
+
+    user = db.query(User).filter(User.id == current_user["user_id"]).first()
+    if not user:
+        return JSONResponse(
+            content={"message": "Only admin can access this endpoint"},
+            status_code=status.HTTP_404_NOT_FOUND,
+        )
+
+    if not user.is_verified:
+        return JSONResponse(
+            content={"message": "User must be verified"},
+            status_code=status.HTTP_403_FORBIDDEN,
+        )
+
+    return None
+
+
 @router.post("/chat/")
 def chat_with_ai(current_user: dict = Depends(get_current_verified_user), db: Session = Depends(get_db), chat_request: ChatRequest = None):
     try:
@@ -44,34 +77,10 @@ def generate_agent(
 ):
 
     try:
-        admin_email = (settings.ADMIN_EMAIL or "").strip().lower()
-        if not admin_email:
-            return JSONResponse(
-                content={"message": "ADMIN_EMAIL is not configured"},
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            )
-
-        user_email = str(current_user.get("user_email") or "").strip().lower()
-        if user_email != admin_email:
-            return JSONResponse(
-                content={"message": "Only admin can access this endpoint"},
-                status_code=status.HTTP_403_FORBIDDEN,
-            )
+        admin_error = _check_admin(current_user, db)
+        if admin_error:
+            return admin_error
 
-        user = db.query(User).filter(User.id == current_user["user_id"]).first()
-        if not user:
-            return JSONResponse(
-                content={"message": "Only admin can access this endpoint"},
-                status_code=status.HTTP_404_NOT_FOUND,
-            )
-
-        if not user.is_verified:
-            return JSONResponse(
-                content={"message": "User must be verified"},
-                status_code=status.HTTP_403_FORBIDDEN,
-            )
-
-        
         main_agent = conversation_service.create_agent("mistral-large-2512")
 
         conversation_service.create_serp_topic_agent("mistral-large-2512", db)
@@ -83,6 +92,26 @@ def generate_agent(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 
+@router.get("/routing-stats/")
+def get_routing_stats(
+    current_user: dict = Depends(get_current_verified_user),
+    db: Session = Depends(get_db),
+):
+    try:
+        admin_error = _check_admin(current_user, db)
+        if admin_error:
+            return admin_error
+
+        return JSONResponse(
+            content={"message": "Routing stats fetched successfully", "routes": model_router.snapshot()},
+            status_code=status.HTTP_200_OK,
+        )
+    except Exception as e:
+        return JSONResponse(
+            content={"message": str(e)},
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
 @router.post("/collect-updates/")
 def collect_updates(
     collect_request: CollectUpdatesRequest,
@@ -23,9 +23,9 @@ class UserLogin(BaseModel):
     password: str
 
 @router.post("/signup", response_model=TokenResponse)
-def signup(user: UserCreate, db: Session = Depends(get_db)):
+async def signup(user: UserCreate, db: Session = Depends(get_db)):
     try:
-        return auth_service.create_user(user, db)
+        return await auth_service.create_user(user, db)
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -33,9 +33,9 @@ def signup(user: UserCreate, db: Session = Depends(get_db)):
         )
 
 @router.post("/login", response_model=TokenResponse)
-def login(credentials: UserLogin, db: Session = Depends(get_db)):
+async def login(credentials: UserLogin, db: Session = Depends(get_db)):
     try:
-        return auth_service.authenticate_user(credentials.email, credentials.password, db)
+        return await auth_service.authenticate_user(credentials.email, credentials.password, db)
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
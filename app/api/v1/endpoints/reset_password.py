@@ -3,7 +3,7 @@ from pydantic import BaseModel
 from sqlalchemy.orm import Session
 from starlette import status
 from starlette.requests import Request
-from starlette.responses import JSONResponse
+from app.core.responses import JSONResponse
 
 from app.core.auth import get_current_user
 from app.core.security import hash_password
@@ -26,9 +26,9 @@ class Verification(BaseModel):
     verification_code: int
 
 @router.patch("/password/reset")
-def reset_password_using_token(password_reset_request:PasswordResetRequest, current_user:dict = Depends(get_current_user), db: Session = Depends(get_db)) ->JSONResponse:
+async def reset_password_using_token(password_reset_request:PasswordResetRequest, current_user:dict = Depends(get_current_user), db: Session = Depends(get_db)) ->JSONResponse:
     try:
-       return reset_password_with_reset_code(password_reset_request.new_password, password_reset_request.reset_password_code, current_user, db)
+       return await reset_password_with_reset_code(password_reset_request.new_password, password_reset_request.reset_password_code, current_user, db)
 
 
     except Exception as e:
@@ -4,7 +4,8 @@ from fastapi import APIRouter, Depends, HTTPException
 from pydantic import BaseModel
 from sqlalchemy.orm import Session
 from starlette import status
-from starlette.responses import JSONResponse
+from starlette.requests import Request
+from app.core.responses import JSONResponse
 
 from app.core.auth import get_current_verified_user
 from app.db.session import get_db
@@ -50,9 +51,9 @@ def create_topic(current_user: dict = Depends(get_current_verified_user), db: Se
 
 
 @router.get("/user")
-def get_all_topics_by_user(current_user: dict = Depends(get_current_verified_user), db: Session = Depends(get_db)):
+def get_all_topics_by_user(request: Request, current_user: dict = Depends(get_current_verified_user), db: Session = Depends(get_db)):
     try:
-        return topic_service.get_topics_for_user(current_user["user_id"], db)
+        return topic_service.get_topics_for_user(current_user["user_id"], db, request.headers.get("if-none-match"))
     except Exception as e:
         JSONResponse(
             content={"message": str(e)},
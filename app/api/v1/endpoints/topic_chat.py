@@ -4,10 +4,12 @@ from fastapi import APIRouter, Depends, HTTPException
 from pydantic import BaseModel
 from sqlalchemy.orm import Session
 from starlette import status
-from starlette.responses import JSONResponse
+from starlette.requests import Request
+from app.core.responses import JSONResponse
 
 from app.core.auth import get_current_verified_user
 from app.db.session import get_db
+from app.schemas.topic_chat import TopicChatPage
 from app.services import user_service
 from app.models.topic import Topic
 from app.services.topic_chat_service import TopicChatService
@@ -20,10 +22,26 @@ class GetTopicChatRequest(BaseModel):
     topic_id: str
 
 
-@router.get("/{topic_id}")
-def get_topic_chat_by_topic_id(topic_id:str, current_user: dict = Depends(get_current_verified_user), db: Session = Depends(get_db)):
+@router.get("/{topic_id}", response_model=TopicChatPage)
+def get_topic_chat_by_topic_id(
+    topic_id: str,
+    request: Request,
+    limit: Optional[int] = None,
+    cursor: Optional[str] = None,
+    order: str = "asc",
+    current_user: dict = Depends(get_current_verified_user),
+    db: Session = Depends(get_db),
+):
     try:
-        return topic_chat_service.get_topic_chat(topic_id, current_user, db)
+        return topic_chat_service.get_topic_chat(
+            topic_id,
+            current_user,
+            db,
+            request.headers.get("if-none-match"),
+            limit=limit,
+            cursor=cursor,
+            order=order,
+        )
     except Exception as e:
         JSONResponse(
             content={"message": str(e)},
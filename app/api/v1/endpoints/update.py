@@ -1,10 +1,14 @@
+from typing import Optional
+
 from fastapi import APIRouter, Depends
 from sqlalchemy.orm import Session
+from starlette.requests import Request
 from starlette import status
-from starlette.responses import JSONResponse
+from app.core.responses import JSONResponse
 
 from app.core.auth import get_current_verified_user
 from app.db.session import get_db
+from app.schemas.update import UpdateBatchPage, UpdatePage, UpdateSearchPage
 from app.services.update_service import UpdateService
 
 
@@ -13,17 +17,81 @@ update_service = UpdateService()
 router = APIRouter()
 
 
-@router.get("/{topic_id}")
+@router.get("/search", response_model=UpdateSearchPage)
+def search_updates(
+	q: str,
+	limit: Optional[int] = None,
+	offset: Optional[int] = None,
+	topic_id: Optional[str] = None,
+	current_user: dict = Depends(get_current_verified_user),
+	db: Session = Depends(get_db),
+):
+	try:
+		return update_service.search_updates(
+			current_user["user_id"],
+			q,
+			db,
+			limit=limit,
+			offset=offset,
+			topic_id=topic_id,
+		)
+	except Exception as e:
+		return JSONResponse(
+			content={"message": str(e)},
+			status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+		)
+
+
+@router.get("/{topic_id}", response_model=UpdatePage)
 def get_updates_by_topic_id(
 	topic_id: str,
+	request: Request,
+	limit: Optional[int] = None,
+	cursor: Optional[str] = None,
+	since: Optional[str] = None,
+	key_point: Optional[str] = None,
 	current_user: dict = Depends(get_current_verified_user),
 	db: Session = Depends(get_db),
 ):
 	try:
-		return update_service.get_updates_for_topic(topic_id, current_user["user_id"], db)
+		return update_service.get_updates_for_topic(
+			topic_id,
+			current_user["user_id"],
+			db,
+			limit=limit,
+			cursor=cursor,
+			since=since,
+			key_point=key_point,
+			if_none_match=request.headers.get("if-none-match"),
+		)
 	except Exception as e:
 		return JSONResponse(
 			content={"message": str(e)},
 			status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
 		)
 
+
+
+@router.get("/{topic_id}/batches", response_model=UpdateBatchPage)
+def get_update_batches_by_topic_id(
+	topic_id: str,
+	request: Request,
+	limit: Optional[int] = None,
+	cursor: Optional[str] = None,
+	current_user: dict = Depends(get_current_verified_user),
+	db: Session = Depends(get_db),
+):
+	try:
+		return update_service.get_update_batches_for_topic(
+			topic_id,
+			current_user["user_id"],
+			db,
+			limit=limit,
+			cursor=cursor,
+			if_none_match=request.headers.get("if-none-match"),
+		)
+	except Exception as e:
+		return JSONResponse(
+			content={"message": str(e)},
+			status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+		)
@@ -1,8 +1,10 @@
+from typing import Optional
+
 from fastapi import APIRouter, Depends, HTTPException
 from pydantic import BaseModel
 from sqlalchemy.orm import Session
 from starlette import status
-from starlette.responses import JSONResponse
+from app.core.responses import JSONResponse
 
 from app.core.auth import get_current_user
 from app.db.session import get_db
@@ -14,6 +16,10 @@ class UpdatedUserInfo(BaseModel):
     first_name: str
     last_name: str
 
+class DigestPreferences(BaseModel):
+    digest_mode: Optional[str] = None
+    digest_window_minutes: Optional[int] = None
+
 @router.get("/me")
 def read_current_user(current_user: dict = Depends(get_current_user), db: Session = Depends(get_db)):
     try:
@@ -43,3 +49,28 @@ def delete_user_by_id(current_user:dict = Depends(get_current_user), db: Session
         JSONResponse(
             content={"message": str(e)},
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+@router.get("/me/digest-preferences")
+def read_digest_preferences(current_user: dict = Depends(get_current_user), db: Session = Depends(get_db)):
+    try:
+        return user_service.get_digest_preferences(current_user, db)
+    except Exception as e:
+        return JSONResponse(
+            content={"message": str(e)},
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+@router.put("/me/digest-preferences")
+def update_digest_preferences(preferences: DigestPreferences, current_user: dict = Depends(get_current_user), db: Session = Depends(get_db)):
+    try:
+        return user_service.update_digest_preferences(
+            preferences.digest_mode,
+            preferences.digest_window_minutes,
+            current_user,
+            db,
+        )
+    except Exception as e:
+        return JSONResponse(
+            content={"message": str(e)},
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR)
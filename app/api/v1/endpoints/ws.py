@@ -0,0 +1,151 @@
+import asyncio
+import json
+from typing import Optional
+
+from fastapi import APIRouter, HTTPException, WebSocket, WebSocketDisconnect
+from starlette import status
+from starlette.concurrency import run_in_threadpool
+
+from app.core.auth import verified_user_cache, verify_jwt_token
+from app.core.config import settings
+from app.db.session import SessionLocal
+from app.models.user import User
+from app.services.connection_hub import connection_hub
+from app.services.mistral.conversation_service import MistralConversationService
+
+conversation_service = MistralConversationService()
+
+router = APIRouter()
+
+
+def _token_from_header(websocket: WebSocket) -> Optional[str]:
+    authorization = websocket.headers.get("authorization") or ""
+    if authorization.lower().startswith("bearer "):
+        return authorization[7:].strip()
+    return None
+
+
+async def _token_from_first_message(websocket: WebSocket) -> Optional[str]:
+    # Browsers cannot set headers on a WebSocket handshake, so they send {"type": "auth", "token"}
+    # first. The token is never taken from the URL, where proxy and access logs would keep it.
+    try:
+        incoming = await asyncio.wait_for(websocket.receive_json(), timeout=settings.WS_AUTH_TIMEOUT_SECONDS)
+    except (asyncio.TimeoutError, ValueError, KeyError):
+        return None
+    if not isinstance(incoming, dict) or incoming.get("type") != "auth":
+        return None
+    return incoming.get("token")
+
+
+def _authenticate(token: Optional[str]) -> dict:
+    """Same checks as get_current_verified_user; raises HTTPException on failure."""
+    if not token:
+        raise HTTPException(status_code=401, detail="Missing token")
+
+    payload = verify_jwt_token(token)
+    if not payload.get("user_id") or not payload.get("user_email"):
+        raise HTTPException(status_code=401, detail="Invalid token, try logging in again")
+
+    if verified_user_cache.get(payload["user_id"]):
+        return payload
+
+    db = SessionLocal()
+    try:
+        user = db.query(User).filter(User.id == payload["user_id"]).first()
+        if not user:
+            raise HTTPException(status_code=404, detail="User not found")
+        if not user.is_verified:
+            raise HTTPException(status_code=403, detail="User needs to be verified")
+    finally:
+        db.close()
+
+    verified_user_cache.set(payload["user_id"], True)
+
+    return payload
+
+
+def _chat_turn(message: str, topic_id: str, current_user: dict):
+    db = SessionLocal()
+    try:
+        response = conversation_service.chat_with_ai(message, topic_id, current_user, db)
+    finally:
+        db.close()
+    if response is None:
+        return status.HTTP_500_INTERNAL_SERVER_ERROR, {"message": "AI response missing required fields"}
+    return response.status_code, json.loads(response.body)
+
+
+@router.websocket("/")
+async def realtime_channel(websocket: WebSocket):
+    """Chat turns and live topic events over one authenticated connection.
+
+    Clients that can't send an Authorization header on the handshake must send
+    {"type": "auth", "token"} as their first message.
+    Client messages: {"type": "chat", "topic_id", "message"} and {"type": "ping"}.
+    Server messages: "chat_reply", "updates_available", "pong" and "error".
+    """
+    token = _token_from_header(websocket)
+    if token:
+        try:
+            current_user = await run_in_threadpool(_authenticate, token)
+        except HTTPException as e:
+            await websocket.close(code=status.WS_1008_POLICY_VIOLATION, reason=str(e.detail))
+            return
+        await websocket.accept()
+    else:
+        await websocket.accept()
+        try:
+            current_user = await run_in_threadpool(_authenticate, await _token_from_first_message(websocket))
+        except WebSocketDisconnect:
+            return
+        except HTTPException as e:
+            await websocket.close(code=status.WS_1008_POLICY_VIOLATION, reason=str(e.detail))
+            return
+
+    subscription = connection_hub.subscribe(current_user["user_id"])
+    send_lock = asyncio.Lock()
+
+    async def send(event: dict) -> None:
+        async with send_lock:
+            await websocket.send_json(event)
+
+    async def forward_events() -> None:
+        while True:
+            await send(await subscription.queue.get())
+
+    forwarder = asyncio.create_task(forward_events())
+    try:
+        while True:
+            try:
+                incoming = await websocket.receive_json()
+            except (ValueError, KeyError):
+                await send({"type": "error", "message": "Messages must be JSON objects"})
+                continue
+
+            message_type = incoming.get("type") if isinstance(incoming, dict) else None
+            if message_type == "ping":
+                await send({"type": "pong"})
+            elif message_type == "chat":
+                topic_id = incoming.get("topic_id")
+                message = incoming.get("message")
+                if not topic_id or not message:
+                    await send({"type": "error", "message": "chat needs topic_id and message"})
+                    continue
+
+                # Turns run one at a time per connection, so replies keep the order they were sent in.
+                status_code, body = await run_in_threadpool(_chat_turn, message, topic_id, current_user)
+                await send({"type": "chat_reply", "topic_id": topic_id, "status_code": status_code, "data": body})
+            else:
+                await send({"type": "error", "message": f"Unknown message type: {message_type}"})
+    except WebSocketDisconnect:
+        pass
+    finally:
+        forwarder.cancel()
+        connection_hub.unsubscribe(subscription)
+        # Retrieve the forwarder's outcome so a crash is logged instead of dropped.
+        try:
+            await forwarder
+        except (asyncio.CancelledError, WebSocketDisconnect):
+            pass
+        except Exception as e:
+            print(f"WebSocket event forwarder failed: {e}")
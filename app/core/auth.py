@@ -1,7 +1,9 @@
 from fastapi.security import OAuth2PasswordBearer
 from jose import jwt, JWTError
 from fastapi import HTTPException, status, Depends
+import hashlib
 import time
+from app.core.cache import TTLCache
 from app.core.config import settings
 from sqlalchemy.orm import Session
 from app.db.session import get_db
@@ -36,10 +38,33 @@ def create_jwt_token(
     )
 
     return token
+
+
+# sha256(token) -> decoded payload of tokens that passed full verification, so a token
+# presented on every poll is only decoded once. Entries never outlive the token's exp.
+token_cache = TTLCache(maxsize=settings.JWT_CACHE_SIZE, ttl=settings.JWT_CACHE_TTL_SECONDS)
+
+
+def _cached_payload(digest: bytes):
+    payload = token_cache.get(digest)
+    if payload is None:
+        return None
+    # Same whole-second comparisons jwt.decode makes (no leeway).
+    now = int(time.time())
+    if now > payload["exp"] or now < payload.get("nbf", now):
+        return None
+    return dict(payload)
+
+
 def verify_jwt_token(
     token: str
 
 ) -> dict:
+    digest = hashlib.sha256(token.encode()).digest()
+    payload = _cached_payload(digest)
+    if payload is not None:
+        return payload
+
     try:
 
         secret_key = settings.JWT_SECRET_KEY
@@ -55,6 +80,9 @@ def verify_jwt_token(
             issuer=issuer,
         )
 
+        if isinstance(payload.get("exp"), int):
+            token_cache.set(digest, dict(payload), expires_at=payload["exp"] + 1)
+
         return payload
 
     except JWTError:
@@ -67,6 +95,8 @@ def verify_jwt_token(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="An unexpected error occurred",
         )
+
+
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/login")
 def get_current_user(token: str = Depends(oauth2_scheme)) -> dict:
     try:
@@ -86,6 +116,19 @@ def get_current_user(token: str = Depends(oauth2_scheme)) -> dict:
         )
 
 
+# user_id -> True for users seen verified. Only the positive state is cached, so a user who
+# just verified is never held back by another worker's stale entry.
+verified_user_cache = TTLCache(
+    maxsize=settings.VERIFIED_USER_CACHE_SIZE,
+    ttl=settings.VERIFIED_USER_CACHE_TTL_SECONDS,
+)
+
+
+def invalidate_verified_user(user_id: str) -> None:
+    """Forget a user's cached verification state; call when it changes or the account goes away."""
+    verified_user_cache.pop(user_id)
+
+
 def get_current_verified_user(
     current_user: dict = Depends(get_current_user),
     db: Session = Depends(get_db),
@@ -94,6 +137,9 @@ def get_current_verified_user(
     if not user_id:
         raise HTTPException(status_code=401, detail="Invalid token, try logging in again")
 
+    if verified_user_cache.get(user_id):
+        return current_user
+
     user = db.query(User).filter(User.id == user_id).first()
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
@@ -110,4 +156,5 @@ def get_current_verified_user(
             },
         )
 
+    verified_user_cache.set(user_id, True)
     return current_user
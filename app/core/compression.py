@@ -0,0 +1,161 @@
+import zlib
+from typing import List, Optional
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:
+    import brotli
+except ImportError:  # optional, gzip is always available
+    brotli = None
+
+
+def _accepted_encodings(accept_encoding: str) -> set:
+    """Encodings the client accepts with a non-zero q-value."""
+    accepted = set()
+    for item in accept_encoding.split(","):
+        coding, _, params = item.strip().partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        quality = 1.0
+        for param in params.split(";"):
+            name, _, value = param.strip().partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        if quality > 0:
+            accepted.add(coding)
+    return accepted
+
+
+class _Compressor:
+    def __init__(self, encoding: str, gzip_level: int, brotli_quality: int):
+        self.encoding = encoding
+        if encoding == "br":
+            self._brotli = brotli.Compressor(quality=brotli_quality)
+        else:
+            self._zlib = zlib.compressobj(gzip_level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    def compress(self, data: bytes) -> bytes:
+        if self.encoding == "br":
+            return self._brotli.process(data) + self._brotli.flush()
+        return self._zlib.compress(data) + self._zlib.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self, data: bytes = b"") -> bytes:
+        if self.encoding == "br":
+            return self._brotli.process(data) + self._brotli.finish()
+        return self._zlib.compress(data) + self._zlib.flush()
+
+
+class CompressionMiddleware:
+    """gzip/brotli response compression for compressible content types.
+
+    Bodies sent in one message are compressed only when they reach ``minimum_size``.
+    Streamed bodies are buffered up to ``minimum_size`` and then compressed chunk by
+    chunk with a sync flush, so clients keep receiving data as it is produced.
+    Responses that carry no body (304 from the ETag paths, HEAD) or are already
+    encoded pass through untouched; all compressible responses get
+    ``Vary: Accept-Encoding`` so caches keep the variants apart. ETags stay valid
+    because the API only issues weak ones.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = 1024,
+        gzip_level: int = 6,
+        brotli_quality: int = 4,
+        content_types: Optional[List[str]] = None,
+    ):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+        self.content_types = [content_type.lower() for content_type in (content_types or ["application/json", "text/"])]
+
+    def _choose_encoding(self, scope: Scope) -> Optional[str]:
+        accepted = _accepted_encodings(Headers(scope=scope).get("accept-encoding", ""))
+        if brotli is not None and "br" in accepted:
+            return "br"
+        if "gzip" in accepted:
+            return "gzip"
+        return None
+
+    def _is_compressible(self, headers: Headers) -> bool:
+        content_type = headers.get("content-type", "").lower()
+        return any(content_type.startswith(prefix) for prefix in self.content_types)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = self._choose_encoding(scope)
+        if encoding is None or scope["method"] == "HEAD":
+            await self.app(scope, receive, send)
+            return
+
+        start_message: Optional[Message] = None
+        compressor: Optional[_Compressor] = None
+        buffered = b""
+        passthrough = False
+
+        async def send_compressed(message: Message) -> None:
+            nonlocal start_message, compressor, buffered, passthrough
+
+            if message["type"] == "http.response.start":
+                headers = Headers(raw=message["headers"])
+                compressible = self._is_compressible(headers)
+                if compressible or message["status"] == 304:
+                    MutableHeaders(raw=message["headers"]).add_vary_header("Accept-Encoding")
+                if not compressible or "content-encoding" in headers or message["status"] in (204, 304):
+                    passthrough = True
+                    await send(message)
+                    return
+                start_message = message
+                return
+
+            if passthrough or message["type"] != "http.response.body":
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+
+            if compressor is None:
+                buffered += body
+                if len(buffered) < self.minimum_size:
+                    if more_body:
+                        return
+                    # Too small to be worth it, send as is.
+                    passthrough = True
+                    await send(start_message)
+                    await send({"type": "http.response.body", "body": buffered, "more_body": False})
+                    return
+
+                compressor = _Compressor(encoding, self.gzip_level, self.brotli_quality)
+                headers = MutableHeaders(raw=start_message["headers"])
+                headers["Content-Encoding"] = encoding
+                if more_body:
+                    del headers["Content-Length"]
+                    await send(start_message)
+                    await send({"type": "http.response.body", "body": compressor.compress(buffered), "more_body": True})
+                else:
+                    compressed = compressor.finish(buffered)
+                    headers["Content-Length"] = str(len(compressed))
+                    await send(start_message)
+                    await send({"type": "http.response.body", "body": compressed, "more_body": False})
+                buffered = b""
+                return
+
+            if more_body:
+                chunk = compressor.compress(body)
+                if chunk:
+                    await send({"type": "http.response.body", "body": chunk, "more_body": True})
+            else:
+                await send({"type": "http.response.body", "body": compressor.finish(body), "more_body": False})
+
+        await self.app(scope, receive, send_compressed)
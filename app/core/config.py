@@ -1,3 +1,5 @@
+from typing import Optional
+
 from pydantic_settings import BaseSettings
 
 class Settings(BaseSettings):
@@ -14,10 +16,80 @@ class Settings(BaseSettings):
     SMTP_SERVER: str = "smtp.gmail.com"
     SMTP_PORT: int = 587
     SMTP_SENDER_NAME: str = "Neuraletter"
+    SMTP_USE_TLS: bool = True
+    SMTP_TIMEOUT_SECONDS: float = 30.0
+    # Logged-in sessions kept open and reused across messages.
+    SMTP_POOL_SIZE: int = 4
+    SMTP_POOL_HEALTH_CHECK_SECONDS: float = 30.0
+    SMTP_POOL_MAX_IDLE_SECONDS: float = 300.0
+
+    # Outbox worker: emails are committed with the business data and sent in the background.
+    EMAIL_OUTBOX_POLL_SECONDS: int = 5
+    EMAIL_OUTBOX_BATCH_SIZE: int = 50
+    EMAIL_OUTBOX_MAX_ATTEMPTS: int = 8
+    EMAIL_OUTBOX_BACKOFF_BASE_SECONDS: int = 30
+    EMAIL_OUTBOX_BACKOFF_MAX_SECONDS: int = 3600
+    EMAIL_OUTBOX_SENT_RETENTION_DAYS: int = 7
+    # A claimed row is hidden from other workers this long, renewed right before it is sent;
+    # if the worker dies mid-send it is retried after. Must exceed one send's worst case.
+    EMAIL_OUTBOX_CLAIM_SECONDS: int = 300
+
+    # Users without a preference keep one email per collection run ("immediate"); they can
+    # opt into a per-user "digest" across topics, or "off".
+    DIGEST_DEFAULT_MODE: str = "immediate"
+    DIGEST_DEFAULT_WINDOW_MINUTES: int = 60
+    DIGEST_MIN_WINDOW_MINUTES: int = 5
+    DIGEST_MAX_WINDOW_MINUTES: int = 7 * 24 * 60
+    DIGEST_POLL_MINUTES: int = 5
+    # Rendered per-update email fragments kept in memory; a story shared by many digests renders once.
+    EMAIL_FRAGMENT_CACHE_SIZE: int = 4096
+
+    # Verified users remembered per process so authenticated requests skip the users lookup.
+    # Deletion and verification invalidate locally; other workers catch up within the TTL.
+    VERIFIED_USER_CACHE_TTL_SECONDS: float = 30.0
+    VERIFIED_USER_CACHE_SIZE: int = 10000
+    # Decoded access tokens kept by digest so a polling client's token is verified once.
+    JWT_CACHE_SIZE: int = 10000
+    JWT_CACHE_TTL_SECONDS: float = 300.0
+
+    # Password hashing runs on its own processes; past MAX_PENDING queued or running hashes,
+    # auth endpoints answer 503 with Retry-After instead of waiting.
+    PASSWORD_POOL_WORKERS: int = 2
+    PASSWORD_POOL_MAX_PENDING: int = 16
+    PASSWORD_POOL_RETRY_AFTER_SECONDS: int = 2
+    # Hash cost is calibrated at startup so one hash takes about this long on the host;
+    # set the rounds to pin them instead (recommended with several workers or nodes, see
+    # benchmarks/bench_password_hash). Stored hashes below the fixed floor are upgraded at login.
+    PASSWORD_HASH_TARGET_MS: float = 250.0
+    PASSWORD_BCRYPT_ROUNDS: Optional[int] = None
+    PASSWORD_PBKDF2_ROUNDS: Optional[int] = None
+
+    # Token buckets on the auth, code and email-sending routes; requests over a limit get 429.
+    # "postgres" shares the buckets between nodes through the rate_limit_buckets table.
+    RATE_LIMIT_ENABLED: bool = True
+    RATE_LIMIT_STORE: str = "memory"
+    RATE_LIMIT_SHARDS: int = 16
+    RATE_LIMIT_MAX_KEYS: int = 100_000
+    RATE_LIMIT_TRUST_FORWARDED_FOR: bool = False
+    RATE_LIMIT_CREDENTIALS_PER_IP_PER_MINUTE: int = 20
+    RATE_LIMIT_CREDENTIALS_PER_EMAIL_PER_MINUTE: int = 5
+    # Login's per-email bucket above is per (email, IP); this one caps an account across all IPs.
+    RATE_LIMIT_LOGIN_PER_ACCOUNT_PER_MINUTE: int = 30
+    RATE_LIMIT_CREDENTIALS_PER_ROUTE_PER_SECOND: int = 50
+    RATE_LIMIT_EMAILS_PER_IP_PER_HOUR: int = 20
+    RATE_LIMIT_EMAILS_PER_ADDRESS_PER_HOUR: int = 5
+    RATE_LIMIT_EMAILS_PER_ROUTE_PER_SECOND: int = 10
 
     GOOGLE_CLIENT_ID: str
     GOOGLE_CLIENT_SECRET: str
     GOOGLE_REDIRECT_URI: str
+    # Point at a local OIDC stand-in (benchmarks/oidc_stub.py) to exercise the flow offline.
+    GOOGLE_DISCOVERY_URL: str = "https://accounts.google.com/.well-known/openid-configuration"
+    # Discovery and JWKS are prefetched at startup and refreshed once REFRESH_AHEAD of
+    # their TTL (the responses' max-age, capped here) has passed.
+    GOOGLE_METADATA_TTL_SECONDS: float = 6 * 60 * 60
+    GOOGLE_METADATA_REFRESH_AHEAD: float = 0.8
+    GOOGLE_HTTP_TIMEOUT_SECONDS: float = 10.0
 
     SELF_BASE_URL:str
 
@@ -34,6 +106,27 @@ class Settings(BaseSettings):
     MISTRAL_API_KEY: str
     SERP_API_KEY: str
 
+    # "remote" keeps the provider-side conversation (topic.ai_conversation_id),
+    # "local" rebuilds the prompt from our own topic_chats rows.
+    CHAT_CONTEXT_MODE: str = "remote"
+    CHAT_CONTEXT_MAX_TOKENS: int = 3000
+    CHAT_CONTEXT_KEEP_RECENT_MESSAGES: int = 6
+
+    # Seconds a WebSocket client has to send its {"type": "auth"} message after connecting.
+    WS_AUTH_TIMEOUT_SECONDS: float = 10.0
+
+    # Days of updates kept per topic tier before they are archived and removed.
+    UPDATE_RETENTION_DAYS: dict[str, int] = {"free": 90, "premium": 365, "pay_as_you_go": 365}
+    # Must be an absolute path on durable storage (not the serverless cwd or /tmp); while
+    # unset, retention is skipped rather than deleting updates without an archive.
+    UPDATE_ARCHIVE_DIR: Optional[str] = None
+    UPDATE_PARTITION_MONTHS_AHEAD: int = 2
+
+    # Response compression; brotli is used when installed and accepted by the client.
+    COMPRESSION_MINIMUM_SIZE: int = 1024
+    COMPRESSION_GZIP_LEVEL: int = 6
+    COMPRESSION_BROTLI_QUALITY: int = 4
+    COMPRESSION_CONTENT_TYPES: list[str] = ["application/json", "text/"]
 
     class Config:
         env_file = ".env"
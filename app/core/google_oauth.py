@@ -1,14 +1,146 @@
+import asyncio
+import re
+import time
+from typing import Optional
+
 from authlib.integrations.starlette_client import OAuth
+
+try:
+    # authlib builds its clients with httpx2 when that is installed and with httpx otherwise;
+    # the shared transport (and our own client) must come from the same library, or requests
+    # fail inside the client.
+    from authlib.integrations.httpx_client._compat import httpx2 as httpx
+except ImportError:
+    import httpx
 from app.core.config import settings
 
+
+class _SharedTransport(httpx.AsyncBaseTransport):
+    """Lets authlib's per-request httpx clients share one connection pool.
+
+    authlib opens and closes an AsyncClient around every call; closing would tear
+    down the pool, so this wrapper ignores it and the app closes the pool on shutdown.
+    """
+
+    def __init__(self, transport: httpx.AsyncBaseTransport):
+        self.transport = transport
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        return await self.transport.handle_async_request(request)
+
+    async def aclose(self) -> None:
+        pass
+
+
+http_transport = _SharedTransport(httpx.AsyncHTTPTransport(
+    limits=httpx.Limits(max_connections=20, max_keepalive_connections=10, keepalive_expiry=60),
+))
+
 oauth = OAuth()
 
 oauth.register(
     name="google",
     client_id=settings.GOOGLE_CLIENT_ID,
     client_secret=settings.GOOGLE_CLIENT_SECRET,
-    server_metadata_url="https://accounts.google.com/.well-known/openid-configuration",
+    server_metadata_url=settings.GOOGLE_DISCOVERY_URL,
     client_kwargs={
-        "scope": "openid email profile"
+        "scope": "openid email profile",
+        "transport": http_transport,
+        "timeout": settings.GOOGLE_HTTP_TIMEOUT_SECONDS,
     },
 )
+
+
+def _max_age(response: httpx.Response) -> Optional[int]:
+    match = re.search(r"max-age=(\d+)", response.headers.get("cache-control", ""))
+    return int(match.group(1)) if match else None
+
+
+class GoogleMetadataCache:
+    """Discovery document and JWKS fetched at startup and refreshed ahead of expiry.
+
+    authlib only fetches metadata when ``server_metadata`` lacks ``_loaded_at`` and
+    only fetches keys when it lacks ``jwks``, so filling both in here keeps those
+    round trips off the login and callback requests. The TTL follows the responses'
+    Cache-Control max-age (Google rotates keys with ~6h max-age), capped by
+    GOOGLE_METADATA_TTL_SECONDS, and a refresh starts once GOOGLE_METADATA_REFRESH_AHEAD
+    of it has elapsed. A failed refresh keeps serving the previous document and retries.
+    """
+
+    def __init__(self, client, discovery_url: str, ttl_seconds: float, refresh_ahead: float, retry_seconds: float = 60.0):
+        self.client = client
+        self.discovery_url = discovery_url
+        self.ttl_seconds = ttl_seconds
+        self.refresh_ahead = refresh_ahead
+        self.retry_seconds = retry_seconds
+        self.expires_at = 0.0
+        self.refreshes = 0
+        self._task: Optional[asyncio.Task] = None
+
+    async def refresh(self) -> float:
+        """Fetch both documents and swap them in together. Returns their TTL in seconds."""
+        async with httpx.AsyncClient(transport=http_transport, timeout=settings.GOOGLE_HTTP_TIMEOUT_SECONDS) as http:
+            discovery = await http.get(self.discovery_url)
+            discovery.raise_for_status()
+            metadata = discovery.json()
+            jwks = await http.get(metadata["jwks_uri"])
+            jwks.raise_for_status()
+
+        ttl = min(
+            [self.ttl_seconds] + [age for age in (_max_age(discovery), _max_age(jwks)) if age is not None]
+        )
+        metadata["jwks"] = jwks.json()
+        metadata["_loaded_at"] = time.time()
+        # One assignment, so a concurrent callback never sees new metadata with old keys.
+        self.client.server_metadata = metadata
+        self.expires_at = time.time() + ttl
+        self.refreshes += 1
+        return ttl
+
+    async def _refresh_loop(self, ttl: float) -> None:
+        while True:
+            await asyncio.sleep(max(1.0, ttl * self.refresh_ahead))
+            try:
+                ttl = await self.refresh()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                # Keys Google rotated in the meantime are still picked up: authlib refetches
+                # the JWKS itself when an id_token names an unknown key id.
+                print(f"Google metadata refresh failed, keeping the cached copy: {e}")
+                ttl = self.retry_seconds / self.refresh_ahead
+
+    async def start(self) -> None:
+        try:
+            ttl = await self.refresh()
+        except Exception as e:
+            # Login still works; authlib falls back to fetching on the first request.
+            print(f"Google metadata prefetch failed: {e}")
+            ttl = self.retry_seconds / self.refresh_ahead
+        self._task = asyncio.create_task(self._refresh_loop(ttl))
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+google_metadata = GoogleMetadataCache(
+    oauth.google,
+    settings.GOOGLE_DISCOVERY_URL,
+    ttl_seconds=settings.GOOGLE_METADATA_TTL_SECONDS,
+    refresh_ahead=settings.GOOGLE_METADATA_REFRESH_AHEAD,
+)
+
+
+async def start_google_oauth() -> None:
+    await google_metadata.start()
+
+
+async def stop_google_oauth() -> None:
+    await google_metadata.stop()
+    await http_transport.transport.aclose()
@@ -0,0 +1,165 @@
+import asyncio
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import partial
+from typing import Optional, Tuple
+
+from starlette.concurrency import run_in_threadpool
+
+from app.core import security
+from app.core.config import settings
+from app.core.responses import JSONResponse
+
+
+class PasswordPoolBusy(Exception):
+    """Raised instead of queueing when PASSWORD_POOL_MAX_PENDING operations are already in flight."""
+
+
+# Run inside the worker processes, which only import passlib and app.core.security.
+def _hash(password: str) -> str:
+    return security.hash_password(password)
+
+
+def _verify(password: str, hashed_password: str) -> bool:
+    return security.verify_password(password, hashed_password)
+
+
+def _verify_and_update(password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    return security.verify_and_update(password, hashed_password)
+
+
+def _warm_up() -> bool:
+    return True
+
+
+class PasswordHasherPool:
+    """Password hashing on a few dedicated processes instead of the request threadpool.
+
+    At most ``max_pending`` hashes may be running or queued; past that ``hash``/``verify``
+    raise PasswordPoolBusy so a login burst is turned away with a 503 up front rather than
+    queueing behind bcrypt and tying up the event loop and threadpool. ``workers=0`` runs
+    the work on the threadpool with the same admission limit.
+    """
+
+    def __init__(self, workers: int, max_pending: int):
+        self.workers = workers
+        self.max_pending = max_pending
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._pending = 0
+        self.completed = 0
+        self.rejected = 0
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                # spawn, not fork: the parent runs scheduler and SMTP threads.
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=partial(security.configure_policy, **security.current_policy()),
+                )
+            return self._executor
+
+    def _discard_executor(self, broken: ProcessPoolExecutor) -> None:
+        with self._lock:
+            if self._executor is broken:
+                self._executor = None
+        broken.shutdown(wait=False, cancel_futures=True)
+
+    def start(self) -> None:
+        """Calibrate the hashing policy, then start the workers with it so the first logins don't pay for either."""
+        policy = security.calibrate_policy()
+        print(f"Password hashing policy: {policy}")
+        if self.workers <= 0:
+            return
+        try:
+            executor = self._get_executor()
+            for future in [executor.submit(_warm_up) for _ in range(self.workers)]:
+                future.result()
+        except (OSError, BrokenProcessPool) as e:
+            # e.g. no /dev/shm for multiprocessing semaphores on serverless runtimes.
+            print(f"Password hashing processes unavailable, using the threadpool instead: {e}")
+            self.shutdown()
+            self.workers = 0
+
+    def shutdown(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    def _admit(self) -> None:
+        with self._lock:
+            if self._pending >= self.max_pending:
+                self.rejected += 1
+                raise PasswordPoolBusy(f"{self._pending} password operations already pending")
+            self._pending += 1
+
+    def _release(self, _=None) -> None:
+        with self._lock:
+            self._pending -= 1
+            self.completed += 1
+
+    async def _run(self, fn, *args):
+        self._admit()
+        if self.workers <= 0:
+            try:
+                return await run_in_threadpool(fn, *args)
+            finally:
+                self._release()
+
+        for attempt in range(2):
+            executor = self._get_executor()
+            try:
+                future = executor.submit(fn, *args)
+            except BrokenProcessPool:
+                self._discard_executor(executor)
+                continue
+            # Released when the worker finishes, not when the caller stops waiting, so a
+            # disconnected client's hash still counts against the limit while it runs.
+            future.add_done_callback(self._release)
+            try:
+                return await asyncio.wrap_future(future)
+            except BrokenProcessPool:
+                # A worker died (e.g. the OOM killer); replace the pool and retry once.
+                self._discard_executor(executor)
+                if attempt:
+                    raise
+                self._admit()
+        self._release()
+        raise BrokenProcessPool("Password hashing pool could not be started")
+
+    async def hash(self, password: str) -> str:
+        return await self._run(_hash, password)
+
+    async def verify(self, password: str, hashed_password: str) -> bool:
+        return await self._run(_verify, password, hashed_password)
+
+    async def verify_and_update(self, password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+        return await self._run(_verify_and_update, password, hashed_password)
+
+    def stats(self) -> dict:
+        return {
+            "workers": self.workers,
+            "max_pending": self.max_pending,
+            "pending": self._pending,
+            "completed": self.completed,
+            "rejected": self.rejected,
+        }
+
+
+def busy_response() -> JSONResponse:
+    return JSONResponse(
+        content={"message": "Too many sign-in attempts right now, please retry shortly"},
+        status_code=503,
+        headers={"Retry-After": str(settings.PASSWORD_POOL_RETRY_AFTER_SECONDS)},
+    )
+
+
+password_pool = PasswordHasherPool(
+    workers=settings.PASSWORD_POOL_WORKERS,
+    max_pending=settings.PASSWORD_POOL_MAX_PENDING,
+)
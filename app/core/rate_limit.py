@@ -0,0 +1,297 @@
+import json
+import math
+import random
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import text
+from starlette.concurrency import run_in_threadpool
+from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.auth import verify_jwt_token
+from app.core.responses import JSONResponse
+
+# Bodies larger than this are passed through without looking for an email.
+_MAX_INSPECTED_BODY = 16 * 1024
+
+
+@dataclass(frozen=True)
+class Limit:
+    """``capacity`` requests in a burst, refilled evenly over ``per_seconds``."""
+    capacity: int
+    per_seconds: float
+
+    @property
+    def rate(self) -> float:
+        return self.capacity / self.per_seconds
+
+
+@dataclass(frozen=True)
+class RateLimitRule:
+    method: str
+    path: str
+    per_ip: Optional[Limit] = None
+    per_email: Optional[Limit] = None
+    per_route: Optional[Limit] = None
+    # Where the email comes from: "body" (JSON "email" field) or "token" (the bearer's user_email).
+    email_from: Optional[str] = None
+    # Key the email bucket by (email, client IP), so requests from other IPs naming someone's
+    # email can't lock that person out of their own sign-in. Pair it with ``per_account``, a
+    # looser bucket on the email alone, so spreading guesses over many IPs stays bounded.
+    email_per_ip: bool = False
+    per_account: Optional[Limit] = None
+
+
+class MemoryRateLimitStore:
+    """Token buckets in process memory, split over ``shards`` locks so concurrent
+    requests for different keys rarely contend. Each shard keeps its most recently
+    used keys; an evicted key simply starts again with a full bucket."""
+
+    blocking = False
+
+    def __init__(self, shards: int = 16, max_keys: int = 100_000):
+        self._shards = [(threading.Lock(), OrderedDict()) for _ in range(max(1, shards))]
+        self._max_keys_per_shard = max(1, max_keys // len(self._shards))
+
+    def take(self, key: str, limit: Limit, cost: float = 1.0) -> float:
+        """Spend ``cost`` tokens from ``key``'s bucket. Returns 0 if allowed, else seconds until it would be."""
+        lock, buckets = self._shards[hash(key) % len(self._shards)]
+        now = time.monotonic()
+        with lock:
+            tokens, updated_at = buckets.get(key, (limit.capacity, now))
+            tokens = min(limit.capacity, tokens + (now - updated_at) * limit.rate)
+            allowed = tokens >= cost
+            buckets[key] = (tokens - cost if allowed else tokens, now)
+            buckets.move_to_end(key)
+            while len(buckets) > self._max_keys_per_shard:
+                buckets.popitem(last=False)
+        return 0.0 if allowed else (cost - tokens) / limit.rate
+
+    def refund(self, key: str, limit: Limit, cost: float = 1.0) -> None:
+        """Give back tokens spent by a request that a later bucket rejected."""
+        lock, buckets = self._shards[hash(key) % len(self._shards)]
+        with lock:
+            if key in buckets:
+                tokens, updated_at = buckets[key]
+                buckets[key] = (min(limit.capacity, tokens + cost), updated_at)
+
+
+class PostgresRateLimitStore:
+    """Token buckets in the rate_limit_buckets table, shared by every node.
+
+    Refill and spend happen in one conditional upsert, so concurrent nodes can't both
+    spend the last token. Idle buckets are purged now and then by whichever request
+    happens to draw it.
+    """
+
+    blocking = True
+
+    _TAKE = text("""
+        INSERT INTO rate_limit_buckets (key, tokens, updated_at)
+        VALUES (:key, :capacity - :cost, :now)
+        ON CONFLICT (key) DO UPDATE SET
+            tokens = LEAST(:capacity, rate_limit_buckets.tokens + (:now - rate_limit_buckets.updated_at) * :rate) - :cost,
+            updated_at = :now
+        WHERE LEAST(:capacity, rate_limit_buckets.tokens + (:now - rate_limit_buckets.updated_at) * :rate) >= :cost
+        RETURNING tokens
+    """)
+    _PEEK = text("SELECT tokens, updated_at FROM rate_limit_buckets WHERE key = :key")
+    _REFUND = text("UPDATE rate_limit_buckets SET tokens = LEAST(:capacity, tokens + :cost) WHERE key = :key")
+    _PURGE = text("DELETE FROM rate_limit_buckets WHERE updated_at < :cutoff")
+
+    def __init__(self, engine, idle_seconds: float = 24 * 60 * 60, purge_probability: float = 0.001):
+        self.engine = engine
+        self.idle_seconds = idle_seconds
+        self.purge_probability = purge_probability
+
+    def take(self, key: str, limit: Limit, cost: float = 1.0) -> float:
+        now = time.time()
+        params = {"key": key, "capacity": limit.capacity, "rate": limit.rate, "cost": cost, "now": now}
+        with self.engine.begin() as conn:
+            if conn.execute(self._TAKE, params).first() is not None:
+                if random.random() < self.purge_probability:
+                    conn.execute(self._PURGE, {"cutoff": now - self.idle_seconds})
+                return 0.0
+            row = conn.execute(self._PEEK, {"key": key}).first()
+        tokens = min(limit.capacity, row.tokens + (now - row.updated_at) * limit.rate) if row else 0.0
+        return max(cost - tokens, 0.0) / limit.rate
+
+    def refund(self, key: str, limit: Limit, cost: float = 1.0) -> None:
+        with self.engine.begin() as conn:
+            conn.execute(self._REFUND, {"key": key, "capacity": limit.capacity, "cost": cost})
+
+
+def _client_ip(scope: Scope, trust_forwarded_for: bool) -> str:
+    if trust_forwarded_for:
+        forwarded = Headers(scope=scope).get("x-forwarded-for")
+        if forwarded:
+            return forwarded.split(",")[0].strip()
+    client = scope.get("client")
+    return client[0] if client else "unknown"
+
+
+def _email_from_body(body: bytes) -> Optional[str]:
+    if not body or len(body) > _MAX_INSPECTED_BODY:
+        return None
+    try:
+        email = json.loads(body).get("email")
+    except (ValueError, AttributeError):
+        return None
+    return email.strip().lower() if isinstance(email, str) and email.strip() else None
+
+
+def _email_from_token(scope: Scope) -> Optional[str]:
+    authorization = Headers(scope=scope).get("authorization") or ""
+    if not authorization.lower().startswith("bearer "):
+        return None
+    try:
+        email = verify_jwt_token(authorization[7:].strip()).get("user_email")
+    except Exception:
+        # The endpoint rejects the token itself; only the per-IP bucket applies.
+        return None
+    return email.lower() if isinstance(email, str) else None
+
+
+async def _read_body(receive: Receive) -> Tuple[bytes, List[Message]]:
+    chunks, messages = [], []
+    while True:
+        message = await receive()
+        messages.append(message)
+        if message["type"] != "http.request":
+            break
+        chunks.append(message.get("body", b""))
+        if not message.get("more_body", False):
+            break
+    return b"".join(chunks), messages
+
+
+class RateLimitMiddleware:
+    """Token-bucket throttling for the auth and email-sending routes.
+
+    Each matching request spends one token from its client IP's bucket, its email's
+    bucket(s) and the route's shared bucket, in that order. The first empty bucket ends
+    the request with a 429 and Retry-After before the endpoint runs, so no password
+    hashing or email work starts, and the tokens already taken from the earlier buckets
+    are refunded: a rejected request costs nothing. A store that errors lets the request through.
+    """
+
+    def __init__(self, app: ASGIApp, rules: List[RateLimitRule], store=None, trust_forwarded_for: bool = False):
+        self.app = app
+        self.rules: Dict[Tuple[str, str], RateLimitRule] = {
+            (rule.method.upper(), rule.path.rstrip("/")): rule for rule in rules
+        }
+        self.store = store or MemoryRateLimitStore()
+        self.trust_forwarded_for = trust_forwarded_for
+
+    async def _take(self, key: str, limit: Limit) -> float:
+        try:
+            if self.store.blocking:
+                return await run_in_threadpool(self.store.take, key, limit)
+            return self.store.take(key, limit)
+        except Exception as e:
+            print(f"Rate limit store failed, allowing request: {e}")
+            return 0.0
+
+    async def _refund(self, key: str, limit: Limit) -> None:
+        try:
+            if self.store.blocking:
+                await run_in_threadpool(self.store.refund, key, limit)
+            else:
+                self.store.refund(key, limit)
+        except Exception as e:
+            print(f"Rate limit refund failed: {e}")
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        rule = self.rules.get((scope["method"], scope["path"].rstrip("/")))
+        if rule is None:
+            await self.app(scope, receive, send)
+            return
+
+        email = None
+        if rule.per_email and rule.email_from == "body":
+            body, messages = await _read_body(receive)
+            email = _email_from_body(body)
+
+            # Hand the buffered body to the endpoint as if it were read for the first time.
+            async def receive_replay() -> Message:
+                return messages.pop(0) if messages else await receive()
+
+            downstream_receive = receive_replay
+        else:
+            downstream_receive = receive
+            if rule.per_email and rule.email_from == "token":
+                email = _email_from_token(scope)
+
+        client_ip = _client_ip(scope, self.trust_forwarded_for)
+        checks = []
+        if rule.per_ip:
+            checks.append((f"{rule.path}|ip|{client_ip}", rule.per_ip))
+        if rule.per_email and email:
+            email_key = f"{email}|{client_ip}" if rule.email_per_ip else email
+            checks.append((f"{rule.path}|email|{email_key}", rule.per_email))
+        if rule.per_account and email:
+            checks.append((f"{rule.path}|account|{email}", rule.per_account))
+        if rule.per_route:
+            checks.append((f"{rule.path}|route", rule.per_route))
+
+        for position, (key, limit) in enumerate(checks):
+            retry_after = await self._take(key, limit)
+            if retry_after > 0:
+                for spent_key, spent_limit in checks[:position]:
+                    await self._refund(spent_key, spent_limit)
+                response = JSONResponse(
+                    content={"message": "Too many requests, please try again later"},
+                    status_code=429,
+                    headers={"Retry-After": str(max(1, math.ceil(retry_after)))},
+                )
+                await response(scope, downstream_receive, send)
+                return
+
+        await self.app(scope, downstream_receive, send)
+
+
+def default_rules(settings) -> List[RateLimitRule]:
+    """Throttling for the routes that hash passwords, check codes or send email."""
+    prefix = "/api/v1"
+    credential_ip = Limit(settings.RATE_LIMIT_CREDENTIALS_PER_IP_PER_MINUTE, 60)
+    credential_email = Limit(settings.RATE_LIMIT_CREDENTIALS_PER_EMAIL_PER_MINUTE, 60)
+    credential_route = Limit(settings.RATE_LIMIT_CREDENTIALS_PER_ROUTE_PER_SECOND, 1)
+    login_account = Limit(settings.RATE_LIMIT_LOGIN_PER_ACCOUNT_PER_MINUTE, 60)
+    email_ip = Limit(settings.RATE_LIMIT_EMAILS_PER_IP_PER_HOUR, 60 * 60)
+    email_address = Limit(settings.RATE_LIMIT_EMAILS_PER_ADDRESS_PER_HOUR, 60 * 60)
+    email_route = Limit(settings.RATE_LIMIT_EMAILS_PER_ROUTE_PER_SECOND, 1)
+
+    def credentials(method: str, path: str, email_from: str) -> RateLimitRule:
+        # Keyed by the email alone, whatever the IP: a 6-digit code must not become guessable
+        # by spreading attempts over many addresses.
+        return RateLimitRule(method, prefix + path, credential_ip, credential_email, credential_route, email_from)
+
+    def emails(method: str, path: str, email_from: str) -> RateLimitRule:
+        return RateLimitRule(method, prefix + path, email_ip, email_address, email_route, email_from)
+
+    return [
+        RateLimitRule(
+            "POST", prefix + "/auth/login", credential_ip, credential_email, credential_route, "body",
+            email_per_ip=True, per_account=login_account,
+        ),
+        credentials("POST", "/auth/signup", "body"),
+        credentials("POST", "/user/verification/verify", "token"),
+        credentials("POST", "/user/password/forget/verify", "body"),
+        credentials("PATCH", "/user/password/reset", "token"),
+        emails("POST", "/user/verification/code", "token"),
+        emails("POST", "/user/password/forget/code", "body"),
+    ]
+
+
+def build_store(settings):
+    if settings.RATE_LIMIT_STORE == "postgres":
+        from app.db.session import engine
+        return PostgresRateLimitStore(engine)
+    return MemoryRateLimitStore(shards=settings.RATE_LIMIT_SHARDS, max_keys=settings.RATE_LIMIT_MAX_KEYS)
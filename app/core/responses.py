@@ -0,0 +1,18 @@
+from typing import Any
+
+from starlette.responses import JSONResponse as StarletteJSONResponse
+
+try:
+    import orjson
+except ImportError:  # optional speed-up, falls back to the stdlib encoder
+    orjson = None
+
+
+class JSONResponse(StarletteJSONResponse):
+    """Project-wide JSONResponse that encodes with orjson when it is installed."""
+
+    def render(self, content: Any) -> bytes:
+        if orjson is None:
+            return super().render(content)
+        return orjson.dumps(content)
+
@@ -1,9 +1,107 @@
+import math
+import time
 from datetime import datetime, timedelta
+from typing import Optional, Tuple
 from jose import jwt
 from passlib.context import CryptContext
+from passlib.hash import bcrypt as bcrypt_handler, pbkdf2_sha256 as pbkdf2_handler
 from app.core.config import settings
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+try:
+    import bcrypt as _bcrypt  # type: ignore
+    _ = _bcrypt.__about__.__version__  # raises if missing on bcrypt>=4.1
+    _BCRYPT_OK = True
+except Exception:
+    _BCRYPT_OK = False
+
+# Never calibrate below these, however slow the host; bcrypt rounds are log2. They are also
+# the rehash floor: only stored hashes weaker than these are upgraded at login, so a node
+# that calibrates a little higher than its neighbours doesn't rewrite every user's hash.
+BCRYPT_MIN_ROUNDS = 10
+BCRYPT_MAX_ROUNDS = 16
+PBKDF2_MIN_ROUNDS = 100_000
+PBKDF2_MAX_ROUNDS = 5_000_000
+# Calibrated pbkdf2 rounds are rounded down to this step so timing noise between restarts
+# and nodes lands on the same value.
+PBKDF2_ROUNDS_STEP = 100_000
+
+_pwd_schemes = ["bcrypt", "pbkdf2_sha256"] if _BCRYPT_OK else ["pbkdf2_sha256"]
+
+
+def build_context(bcrypt_rounds: Optional[int] = None, pbkdf2_rounds: Optional[int] = None) -> CryptContext:
+    """The one hashing policy. New hashes use the given rounds; hashes below the fixed floor,
+    or in a non-default scheme, report needs_update and are rehashed at the next successful login."""
+    options = {}
+    if bcrypt_rounds:
+        options.update(
+            bcrypt__default_rounds=bcrypt_rounds,
+            bcrypt__min_rounds=min(BCRYPT_MIN_ROUNDS, bcrypt_rounds),
+        )
+    if pbkdf2_rounds:
+        options.update(
+            pbkdf2_sha256__default_rounds=pbkdf2_rounds,
+            pbkdf2_sha256__min_rounds=min(PBKDF2_MIN_ROUNDS, pbkdf2_rounds),
+        )
+    return CryptContext(schemes=_pwd_schemes, deprecated="auto", **options)
+
+
+# The password pool's worker processes import only this module and call configure_policy
+# with the parent's calibrated rounds, so every process hashes with the same cost.
+_policy = {
+    "bcrypt_rounds": settings.PASSWORD_BCRYPT_ROUNDS,
+    "pbkdf2_rounds": settings.PASSWORD_PBKDF2_ROUNDS,
+}
+pwd_context = build_context(**_policy)
+
+
+def configure_policy(bcrypt_rounds: Optional[int] = None, pbkdf2_rounds: Optional[int] = None) -> None:
+    global pwd_context
+    _policy.update(bcrypt_rounds=bcrypt_rounds, pbkdf2_rounds=pbkdf2_rounds)
+    pwd_context = build_context(**_policy)
+
+
+def current_policy() -> dict:
+    return dict(_policy)
+
+
+def time_hash(scheme: str, rounds: int, repeat: int = 3) -> float:
+    """Best-of-``repeat`` seconds to hash one password at ``rounds``."""
+    handler = (bcrypt_handler if scheme == "bcrypt" else pbkdf2_handler).using(rounds=rounds)
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        handler.hash("calibration-password")
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def _calibrated_rounds(scheme: str, target_seconds: float) -> int:
+    if scheme == "bcrypt":
+        # Each extra round doubles the cost.
+        probe = BCRYPT_MIN_ROUNDS
+        rounds = probe + round(math.log2(target_seconds / time_hash(scheme, probe)))
+        return max(BCRYPT_MIN_ROUNDS, min(rounds, BCRYPT_MAX_ROUNDS))
+    probe = PBKDF2_MIN_ROUNDS
+    rounds = int(probe * target_seconds / time_hash(scheme, probe) / PBKDF2_ROUNDS_STEP) * PBKDF2_ROUNDS_STEP
+    return max(PBKDF2_MIN_ROUNDS, min(rounds, PBKDF2_MAX_ROUNDS))
+
+
+def calibrate_policy(target_ms: Optional[float] = None) -> dict:
+    """Pick rounds so one hash takes about ``target_ms`` on this host, for every scheme
+    whose rounds are not pinned in settings, and apply them. Returns the policy.
+
+    For several workers or nodes, prefer running benchmarks.bench_password_hash once and
+    pinning its result in PASSWORD_BCRYPT_ROUNDS / PASSWORD_PBKDF2_ROUNDS."""
+    target_ms = settings.PASSWORD_HASH_TARGET_MS if target_ms is None else target_ms
+    policy = current_policy()
+    if target_ms > 0:
+        if _BCRYPT_OK and not settings.PASSWORD_BCRYPT_ROUNDS:
+            policy["bcrypt_rounds"] = _calibrated_rounds("bcrypt", target_ms / 1000)
+        if not settings.PASSWORD_PBKDF2_ROUNDS:
+            policy["pbkdf2_rounds"] = _calibrated_rounds("pbkdf2_sha256", target_ms / 1000)
+    configure_policy(**policy)
+    return policy
+
 
 def hash_password(password: str) -> str:
     return pwd_context.hash(password)
@@ -11,6 +109,10 @@ def hash_password(password: str) -> str:
 def verify_password(password: str, hashed: str) -> bool:
     return pwd_context.verify(password, hashed)
 
+def verify_and_update(password: str, hashed: str) -> Tuple[bool, Optional[str]]:
+    """(valid, new hash or None); a new hash means the stored one is below the current policy."""
+    return pwd_context.verify_and_update(password, hashed)
+
 def create_access_token(subject: str) -> str:
     expire = datetime.utcnow() + timedelta(
         minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES
@@ -1,6 +1,77 @@
+from sqlalchemy import text
+
 from app.db.session import engine
 from app.db.base import Base
+from app.db.partitions import (
+    KEY_POINTS_TO_JSONB_FUNCTION,
+    copy_unpartitioned_updates,
+    ensure_update_partitions,
+    rename_unpartitioned_updates,
+)
 from app.models.user import User
+from app.models.topic import Topic
+from app.models.update import Update
+from app.models.update_batch import UpdateBatch
+from app.models.update_fingerprint import UpdateFingerprint
+from app.models.email_outbox import EmailOutbox
+from app.models.rate_limit_bucket import RateLimitBucket
+
+# create_all() only creates missing tables, so columns/indexes added to existing
+# tables are applied here. Every statement must be idempotent.
+MIGRATIONS = [
+    "ALTER TABLE topics ADD COLUMN IF NOT EXISTS chat_context_summary VARCHAR",
+    "ALTER TABLE topics ADD COLUMN IF NOT EXISTS chat_context_summarized_count INTEGER NOT NULL DEFAULT 0",
+    "CREATE INDEX IF NOT EXISTS ix_updates_topic_created_id ON updates (associated_topic_id, created_at DESC, id DESC)",
+    # Converts legacy VARCHAR key_points, falling back to a JSON string for malformed values.
+    KEY_POINTS_TO_JSONB_FUNCTION,
+    """
+    DO $$
+    BEGIN
+        IF EXISTS (
+            SELECT 1 FROM information_schema.columns
+            WHERE table_name = 'updates' AND column_name = 'key_points' AND data_type <> 'jsonb'
+        ) THEN
+            ALTER TABLE updates ALTER COLUMN key_points TYPE JSONB USING (pg_temp.key_points_to_jsonb(key_points));
+        END IF;
+    END
+    $$
+    """,
+    "CREATE INDEX IF NOT EXISTS ix_updates_key_points ON updates USING gin (key_points jsonb_path_ops)",
+    "ALTER TABLE updates ADD COLUMN IF NOT EXISTS search_vector TSVECTOR GENERATED ALWAYS AS "
+    "(to_tsvector('english', coalesce(title, '') || ' ' || coalesce(summary, ''))) STORED",
+    "CREATE INDEX IF NOT EXISTS ix_updates_search_vector ON updates USING gin (search_vector)",
+    "CREATE INDEX IF NOT EXISTS ix_updates_batch_id ON updates (batch_id)",
+    "CREATE INDEX IF NOT EXISTS ix_topic_chats_topic_created_sender_id "
+    "ON topic_chats (associated_topic_id, created_at, (NOT sent_by_user), id)",
+    "DROP INDEX IF EXISTS ix_topic_chats_topic_created_id",
+    "ALTER TABLE update_batches ADD COLUMN IF NOT EXISTS associated_user_id VARCHAR(255)",
+    "ALTER TABLE update_batches ADD COLUMN IF NOT EXISTS notified_at BIGINT",
+    "CREATE INDEX IF NOT EXISTS ix_update_batches_digest_pending ON update_batches (associated_user_id, created_at) "
+    "WHERE notified_at IS NULL AND associated_user_id IS NOT NULL",
+    "ALTER TABLE users ADD COLUMN IF NOT EXISTS digest_mode VARCHAR(20)",
+    "ALTER TABLE users ADD COLUMN IF NOT EXISTS digest_window_minutes INTEGER",
+    "ALTER TABLE email_outbox ADD COLUMN IF NOT EXISTS not_after BIGINT",
+    # One-time backfill of the batch summaries; skipped once the table has any rows.
+    """
+    INSERT INTO update_batches (id, associated_topic_id, update_count, oldest_created_at, newest_created_at)
+    SELECT batch_id, min(associated_topic_id), count(*), min(created_at), max(created_at)
+    FROM updates
+    WHERE NOT EXISTS (SELECT 1 FROM update_batches)
+    GROUP BY batch_id
+    ON CONFLICT (id) DO NOTHING
+    """,
+]
+
+
+def run_migrations():
+    with engine.begin() as conn:
+        for statement in MIGRATIONS:
+            conn.execute(text(statement))
+
 
 def init_db():
+    rename_unpartitioned_updates(engine)
     Base.metadata.create_all(bind=engine)
+    ensure_update_partitions(engine)
+    copy_unpartitioned_updates(engine)
+    run_migrations()
@@ -0,0 +1,286 @@
+import gzip
+import json
+import os
+import re
+from datetime import datetime, timezone
+from typing import List, Optional, Tuple
+
+from sqlalchemy import inspect, text
+from sqlalchemy.engine import Engine
+
+from app.core.config import settings
+
+# Monthly RANGE partitions of "updates" on created_at (epoch ms), named updates_pYYYYMM.
+# Rows outside every monthly partition land in the DEFAULT partition, so inserts keep
+# working if maintenance falls behind; they are moved out when their month is created.
+PARTITION_PREFIX = "updates_p"
+DEFAULT_PARTITION = "updates_default"
+LEGACY_UPDATES_TABLE = "updates_unpartitioned"
+
+_PARTITION_NAME_RE = re.compile(r"^updates_p(\d{4})(\d{2})$")
+
+_UPDATE_COLUMNS = (
+    "id, associated_topic_id, title, batch_id, author, summary, source_url, date, key_points, image_link, created_at"
+)
+
+# key_points used to be a JSON-encoded VARCHAR; only JSON arrays were ever read back. A
+# malformed legacy value is kept as a JSON string instead of failing the cast (and startup).
+# Session-scoped, so it is created on the connection that uses it.
+KEY_POINTS_TO_JSONB_FUNCTION = """
+CREATE OR REPLACE FUNCTION pg_temp.key_points_to_jsonb(value TEXT) RETURNS JSONB AS $$
+BEGIN
+    IF value !~ '^\\s*\\[' THEN
+        RETURN NULL;
+    END IF;
+    RETURN value::jsonb;
+EXCEPTION WHEN others THEN
+    RETURN to_jsonb(value);
+END
+$$ LANGUAGE plpgsql
+"""
+
+
+def _utc_now_ms() -> int:
+    return int(datetime.now(tz=timezone.utc).timestamp() * 1000)
+
+
+def _month_start(year: int, month: int) -> datetime:
+    return datetime(year, month, 1, tzinfo=timezone.utc)
+
+
+def _add_months(year: int, month: int, months: int) -> Tuple[int, int]:
+    index = year * 12 + (month - 1) + months
+    return index // 12, index % 12 + 1
+
+
+def _to_ms(moment: datetime) -> int:
+    return int(moment.timestamp() * 1000)
+
+
+def partition_bounds(year: int, month: int) -> Tuple[int, int]:
+    next_year, next_month = _add_months(year, month, 1)
+    return _to_ms(_month_start(year, month)), _to_ms(_month_start(next_year, next_month))
+
+
+def _month_of(ms: int) -> Tuple[int, int]:
+    moment = datetime.fromtimestamp(ms / 1000.0, tz=timezone.utc)
+    return moment.year, moment.month
+
+
+def list_update_partitions(engine: Engine) -> List[Tuple[str, int, int]]:
+    """Return (name, lower_ms, upper_ms) for every monthly partition, oldest first."""
+    partitions = []
+    for name in inspect(engine).get_table_names():
+        match = _PARTITION_NAME_RE.match(name)
+        if match:
+            lower_ms, upper_ms = partition_bounds(int(match.group(1)), int(match.group(2)))
+            partitions.append((name, lower_ms, upper_ms))
+    return sorted(partitions, key=lambda partition: partition[1])
+
+
+def _create_partition(conn, name: str, lower_ms: int, upper_ms: int) -> None:
+    create = f"CREATE TABLE {name} PARTITION OF updates FOR VALUES FROM ({lower_ms}) TO ({upper_ms})"
+    bounds = {"lower_ms": lower_ms, "upper_ms": upper_ms}
+    in_range = "created_at >= :lower_ms AND created_at < :upper_ms"
+    stray = conn.execute(text(f"SELECT count(*) FROM {DEFAULT_PARTITION} WHERE {in_range}"), bounds).scalar()
+    if not stray:
+        conn.execute(text(create))
+        return
+
+    # Postgres refuses a new range that overlaps rows in the default partition, so the
+    # default is detached while its rows for this month are moved into the new partition.
+    print(f"Moving {stray} updates from {DEFAULT_PARTITION} into new partition {name}")
+    conn.execute(text(f"ALTER TABLE updates DETACH PARTITION {DEFAULT_PARTITION}"))
+    conn.execute(text(create))
+    conn.execute(text(
+        f"INSERT INTO {name} ({_UPDATE_COLUMNS}) SELECT {_UPDATE_COLUMNS} FROM {DEFAULT_PARTITION} WHERE {in_range}"
+    ), bounds)
+    conn.execute(text(f"DELETE FROM {DEFAULT_PARTITION} WHERE {in_range}"), bounds)
+    conn.execute(text(f"ALTER TABLE updates ATTACH PARTITION {DEFAULT_PARTITION} DEFAULT"))
+
+
+def ensure_update_partitions(engine: Engine, from_ms: Optional[int] = None, to_ms: Optional[int] = None) -> None:
+    """Create monthly partitions covering [from_ms, to_ms]; defaults to this month plus the configured months ahead."""
+    now_ms = _utc_now_ms()
+    year, month = _month_of(from_ms if from_ms is not None else now_ms)
+    if to_ms is None:
+        last_year, last_month = _add_months(*_month_of(now_ms), settings.UPDATE_PARTITION_MONTHS_AHEAD)
+    else:
+        last_year, last_month = _month_of(to_ms)
+
+    with engine.begin() as conn:
+        conn.execute(text(f"CREATE TABLE IF NOT EXISTS {DEFAULT_PARTITION} PARTITION OF updates DEFAULT"))
+        while (year, month) <= (last_year, last_month):
+            name = f"{PARTITION_PREFIX}{year:04d}{month:02d}"
+            if conn.execute(text("SELECT to_regclass(:name)"), {"name": name}).scalar() is None:
+                _create_partition(conn, name, *partition_bounds(year, month))
+            year, month = _add_months(year, month, 1)
+
+
+def rename_unpartitioned_updates(engine: Engine) -> None:
+    """Move a pre-partitioning "updates" table aside so create_all() can create the partitioned one."""
+    with engine.begin() as conn:
+        relkind = conn.execute(text(
+            "SELECT c.relkind FROM pg_class c JOIN pg_namespace n ON n.oid = c.relnamespace "
+            "WHERE c.relname = 'updates' AND n.nspname = current_schema()"
+        )).scalar()
+        if relkind != "r":
+            return
+
+        print("Moving unpartitioned updates table aside for partitioning")
+        conn.execute(text(f"ALTER TABLE updates RENAME TO {LEGACY_UPDATES_TABLE}"))
+        conn.execute(text(f"ALTER TABLE {LEGACY_UPDATES_TABLE} RENAME CONSTRAINT updates_pkey TO {LEGACY_UPDATES_TABLE}_pkey"))
+        # The partitioned table reuses these index names.
+        for index_name in (
+            "ix_updates_id",
+            "ix_updates_batch_id",
+            "ix_updates_topic_created_id",
+            "ix_updates_key_points",
+            "ix_updates_search_vector",
+        ):
+            conn.execute(text(f"DROP INDEX IF EXISTS {index_name}"))
+
+
+def copy_unpartitioned_updates(engine: Engine) -> None:
+    """Copy rows from the renamed legacy table into the partitioned one, then drop it."""
+    if not inspect(engine).has_table(LEGACY_UPDATES_TABLE):
+        return
+
+    with engine.connect() as conn:
+        oldest_ms, newest_ms = conn.execute(
+            text(f"SELECT min(created_at), max(created_at) FROM {LEGACY_UPDATES_TABLE}")
+        ).one()
+
+    if oldest_ms is not None:
+        ensure_update_partitions(engine, int(oldest_ms), int(newest_ms))
+
+    with engine.begin() as conn:
+        # key_points may still be the old JSON-encoded VARCHAR.
+        conn.execute(text(KEY_POINTS_TO_JSONB_FUNCTION))
+        conn.execute(text(
+            f"INSERT INTO updates ({_UPDATE_COLUMNS}) "
+            f"SELECT id, associated_topic_id, title, batch_id, author, summary, source_url, date, "
+            f"pg_temp.key_points_to_jsonb(key_points::text), "
+            f"image_link, created_at FROM {LEGACY_UPDATES_TABLE}"
+        ))
+        conn.execute(text(f"DROP TABLE {LEGACY_UPDATES_TABLE}"))
+    print("Copied legacy updates into the partitioned table")
+
+
+def _archive_and_purge(engine: Engine, query: str, params: dict, archive_name: str, purge) -> int:
+    """Stream rows of ``query`` into a gzip JSON-lines file under UPDATE_ARCHIVE_DIR, then run
+    ``purge(conn)`` in a transaction. Nothing is purged when no rows were archived.
+
+    The archive is written under a temporary name and only renamed into place once the purge
+    has committed, so a run that fails in between leaves no archive behind to be duplicated
+    by the retry.
+    """
+    path = os.path.join(settings.UPDATE_ARCHIVE_DIR, f"{archive_name}.jsonl.gz")
+    partial_path = f"{path}.partial"
+
+    count = 0
+    try:
+        with engine.connect() as conn, gzip.open(partial_path, "wt", encoding="utf-8") as archive:
+            result = conn.execution_options(stream_results=True, yield_per=1000).execute(text(query), params)
+            for row in result.mappings():
+                archive.write(json.dumps(dict(row), ensure_ascii=False) + "\n")
+                count += 1
+        if count:
+            with engine.begin() as conn:
+                purge(conn)
+    except Exception:
+        if os.path.exists(partial_path):
+            os.remove(partial_path)
+        raise
+
+    if count:
+        os.replace(partial_path, path)
+    else:
+        os.remove(partial_path)
+    return count
+
+
+def apply_update_retention(engine: Engine) -> None:
+    """Archive then remove updates older than their topic tier's retention window.
+
+    Whole partitions older than the longest window are archived and dropped. Rows of tiers
+    with shorter windows are archived and deleted individually; the created_at bound keeps
+    that delete on the old partitions only.
+    """
+    retention_days = settings.UPDATE_RETENTION_DAYS
+    if not retention_days:
+        return
+    archive_dir = settings.UPDATE_ARCHIVE_DIR
+    if not archive_dir or not os.path.isabs(archive_dir):
+        print("Update retention skipped: UPDATE_ARCHIVE_DIR must be set to an absolute path on durable storage")
+        return
+    os.makedirs(archive_dir, exist_ok=True)
+
+    now_ms = _utc_now_ms()
+    day_ms = 24 * 60 * 60 * 1000
+    longest_cutoff_ms = now_ms - max(retention_days.values()) * day_ms
+    stamp = datetime.now(tz=timezone.utc).strftime("%Y%m%dT%H%M%S")
+
+    for name, lower_ms, upper_ms in list_update_partitions(engine):
+        if upper_ms > longest_cutoff_ms:
+            break
+
+        def drop_partition(conn, name=name, upper_ms=upper_ms):
+            conn.execute(text(f"ALTER TABLE updates DETACH PARTITION {name}"))
+            conn.execute(text(f"DROP TABLE {name}"))
+            conn.execute(
+                text("DELETE FROM update_batches WHERE newest_created_at < :upper_ms"),
+                {"upper_ms": upper_ms},
+            )
+            conn.execute(
+                text("DELETE FROM update_fingerprints WHERE created_at < :upper_ms"),
+                {"upper_ms": upper_ms},
+            )
+
+        archived = _archive_and_purge(
+            engine, f"SELECT {_UPDATE_COLUMNS} FROM {name}", {}, f"{name}_{stamp}", drop_partition,
+        )
+        if not archived:
+            # Nothing to archive, so the empty partition is dropped directly.
+            with engine.begin() as conn:
+                drop_partition(conn)
+        print(f"Archived {archived} updates and dropped partition {name}")
+
+    for tier, days in retention_days.items():
+        cutoff_ms = now_ms - days * day_ms
+        if cutoff_ms <= longest_cutoff_ms:
+            continue
+
+        params = {"tier": tier, "cutoff_ms": cutoff_ms}
+        tier_filter = (
+            "created_at < :cutoff_ms AND associated_topic_id IN (SELECT id FROM topics WHERE tier = :tier)"
+        )
+
+        def delete_rows(conn, tier_filter=tier_filter, params=params):
+            conn.execute(text(f"DELETE FROM updates WHERE {tier_filter}"), params)
+            conn.execute(text(
+                "DELETE FROM update_batches WHERE newest_created_at < :cutoff_ms "
+                "AND associated_topic_id IN (SELECT id FROM topics WHERE tier = :tier)"
+            ), params)
+            conn.execute(text(
+                "DELETE FROM update_fingerprints WHERE created_at < :cutoff_ms "
+                "AND associated_topic_id IN (SELECT id FROM topics WHERE tier = :tier)"
+            ), params)
+
+        archived = _archive_and_purge(
+            engine,
+            f"SELECT {_UPDATE_COLUMNS} FROM updates WHERE {tier_filter}",
+            params,
+            f"updates_{tier}_{stamp}",
+            delete_rows,
+        )
+        if archived:
+            print(f"Archived and deleted {archived} {tier} updates older than {days} days")
+
+
+def maintain_update_partitions(engine: Engine) -> None:
+    try:
+        ensure_update_partitions(engine)
+        apply_update_retention(engine)
+    except Exception as e:
+        print(f"Update partition maintenance failed: {e}")
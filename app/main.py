@@ -1,19 +1,41 @@
+import asyncio
+
 import uvicorn
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from starlette.middleware.sessions import SessionMiddleware
 
-from app.api.v1.endpoints import auth, health, user_verification, user, google_auth, reset_password, topic, topic_chat, update
+from app.api.v1.endpoints import auth, health, user_verification, user, google_auth, reset_password, topic, topic_chat, update, ws
 from app.api.v1.endpoints.ai import ai_endpoints
+from app.core.compression import CompressionMiddleware
 from app.core.config import settings
+from app.core.google_oauth import start_google_oauth, stop_google_oauth
+from app.core.password_pool import password_pool
+from app.core.rate_limit import RateLimitMiddleware, build_store, default_rules
+from app.core.responses import JSONResponse
 from app.db.init_db import init_db
+from app.services.connection_hub import connection_hub
 from app.api.v1.endpoints.google_auth import router as google_auth_router
-from app.services.task_schedule.schedule_update_collection_service import schedule_updates_from_db
+from app.services.task_schedule.schedule_update_collection_service import (
+    schedule_digests,
+    schedule_email_outbox,
+    schedule_update_maintenance,
+    schedule_updates_from_db,
+)
 
 # from app.services.mistral.conversation_service import continue_conversation, start_conversation, create_agent
 
-app = FastAPI(title="Neuraletter API")
+app = FastAPI(title="Neuraletter API", default_response_class=JSONResponse)
+
 
+# Added before CORS so CORS wraps it and browsers can read the 429s.
+if settings.RATE_LIMIT_ENABLED:
+    app.add_middleware(
+        RateLimitMiddleware,
+        rules=default_rules(settings),
+        store=build_store(settings),
+        trust_forwarded_for=settings.RATE_LIMIT_TRUST_FORWARDED_FOR,
+    )
 
 app.add_middleware(
     CORSMiddleware,
@@ -29,6 +51,14 @@ app.add_middleware(
     same_site="lax",
     https_only=False,
 )
+
+app.add_middleware(
+    CompressionMiddleware,
+    minimum_size=settings.COMPRESSION_MINIMUM_SIZE,
+    gzip_level=settings.COMPRESSION_GZIP_LEVEL,
+    brotli_quality=settings.COMPRESSION_BROTLI_QUALITY,
+    content_types=settings.COMPRESSION_CONTENT_TYPES,
+)
 init_db()
 
 print("CORS", settings.CORS_ALLOWED_ORIGINS)
@@ -45,12 +75,43 @@ app.include_router(topic.router, prefix="/api/v1/topic", tags=["Topic"])
 app.include_router(update.router, prefix="/api/v1/update", tags=["Update"])
 app.include_router(ai_endpoints.router, prefix="/api/v1/ai", tags=["AI"])
 app.include_router(topic_chat.router, prefix="/api/v1/topic/chat", tags=["Chat Topic"])
+app.include_router(ws.router, prefix="/api/v1/ws", tags=["Realtime"])
 
 
 # @app.on_event("startup")
 @app.on_event("startup")
 def _start_schedulers() -> None:
     schedule_updates_from_db()
+    schedule_update_maintenance()
+    schedule_email_outbox()
+    schedule_digests()
+
+
+@app.on_event("startup")
+async def _bind_connection_hub() -> None:
+    # Scheduler and request threads publish onto this loop.
+    connection_hub.bind_loop(asyncio.get_running_loop())
+
+
+@app.on_event("startup")
+def _start_password_pool() -> None:
+    password_pool.start()
+
+
+@app.on_event("shutdown")
+def _stop_password_pool() -> None:
+    password_pool.shutdown()
+
+
+@app.on_event("startup")
+async def _prefetch_google_metadata() -> None:
+    # Keeps discovery and JWKS fetches off the Google login and callback requests.
+    await start_google_oauth()
+
+
+@app.on_event("shutdown")
+async def _stop_google_oauth() -> None:
+    await stop_google_oauth()
 
 
 
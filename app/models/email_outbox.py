@@ -0,0 +1,41 @@
+
+from sqlalchemy import Column, Integer, String, BigInteger, text, Index
+from app.db.base import Base
+
+
+class EmailOutbox(Base):
+    """Outgoing email, written in the same transaction as the data it is about and sent by the outbox worker."""
+
+    __tablename__ = "email_outbox"
+
+    id = Column(String(255), primary_key=True, nullable=False)
+
+    to_email = Column(String(255), nullable=False)
+
+    subject = Column(String, nullable=False)
+
+    text_body = Column(String, nullable=False)
+
+    html_body = Column(String, nullable=True)
+
+    # "pending" until delivered ("sent") or out of attempts ("dead").
+    status = Column(String(20), nullable=False, server_default=text("'pending'"))
+
+    attempts = Column(Integer, nullable=False, server_default=text("0"))
+
+    next_attempt_at = Column(BigInteger, nullable=False, server_default=text("EXTRACT(EPOCH FROM NOW()) * 1000"))
+
+    last_error = Column(String, nullable=True)
+
+    sent_at = Column(BigInteger, nullable=True)
+
+    # Epoch ms after which the email is no longer worth sending (e.g. the code in it has
+    # expired); the worker dead-letters it instead of retrying.
+    not_after = Column(BigInteger, nullable=True)
+
+    created_at = Column(BigInteger, nullable=False, server_default=text("EXTRACT(EPOCH FROM NOW()) * 1000"))
+
+    __table_args__ = (
+        # The worker only ever scans due pending rows.
+        Index("ix_email_outbox_pending_next_attempt", next_attempt_at, postgresql_where=text("status = 'pending'")),
+    )
@@ -0,0 +1,15 @@
+from sqlalchemy import Column, Float, String
+from app.db.base import Base
+
+
+class RateLimitBucket(Base):
+    """Shared token bucket used when RATE_LIMIT_STORE is "postgres"; see app.core.rate_limit."""
+    __tablename__ = "rate_limit_buckets"
+
+    # "<route>|ip|<address>", "<route>|email|<address>" or "<route>|route".
+    key = Column(String(512), primary_key=True, nullable=False)
+
+    tokens = Column(Float, nullable=False)
+
+    # Epoch seconds of the last refill; float so sub-second refills aren't lost.
+    updated_at = Column(Float, nullable=False)
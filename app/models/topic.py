@@ -26,6 +26,10 @@ class Topic(Base):
 
     ai_conversation_id = Column(String(255), nullable=True)
 
+    chat_context_summary = Column(String, nullable=True)
+
+    chat_context_summarized_count = Column(Integer, nullable=False, server_default="0")
+
     created_at = Column(BigInteger, nullable=False, server_default=text("EXTRACT(EPOCH FROM NOW()) * 1000"))
 
     updated_at = Column(BigInteger, nullable=False, server_default=text("EXTRACT(EPOCH FROM NOW()) * 1000"), onupdate=text("EXTRACT(EPOCH FROM NOW()) * 1000"))
@@ -1,5 +1,5 @@
 
-from sqlalchemy import Column, Integer, String, BigInteger, text, Boolean
+from sqlalchemy import Column, Integer, String, BigInteger, text, Boolean, Index
 from app.db.base import Base
 
 
@@ -15,3 +15,9 @@ class TopicChat(Base):
     sent_by_user = Column(Boolean, nullable=False)
 
     created_at = Column(BigInteger, nullable=False, server_default=text("EXTRACT(EPOCH FROM NOW()) * 1000"))
+
+    # Serves keyset pagination within a topic, in either direction. A user message and the
+    # reply written with it share created_at; NOT sent_by_user puts the user message first.
+    __table_args__ = (
+        Index("ix_topic_chats_topic_created_sender_id", associated_topic_id, created_at, text("(NOT sent_by_user)"), id),
+    )
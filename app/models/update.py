@@ -1,5 +1,7 @@
 
-from sqlalchemy import Column, Integer, String, BigInteger, text, Boolean
+from sqlalchemy import Column, Integer, String, BigInteger, text, Boolean, Index, Computed
+from sqlalchemy.dialects.postgresql import JSONB, TSVECTOR
+from sqlalchemy.orm import deferred
 from app.db.base import Base
 
 
@@ -12,7 +14,7 @@ class Update(Base):
 
     title = Column(String(255), nullable=True)
 
-    batch_id=Column(String(255), nullable=False)
+    batch_id=Column(String(255), nullable=False, index=True)
 
     author = Column(String(1000), nullable=True)
 
@@ -22,9 +24,26 @@ class Update(Base):
 
     date = Column(BigInteger, nullable=True)
 
-    key_points = Column(String, nullable=True)
+    key_points = Column(JSONB, nullable=True)
 
     image_link = Column(String(255), nullable=True)
 
-    created_at = Column(BigInteger, nullable=False, server_default=text("EXTRACT(EPOCH FROM NOW()) * 1000"))
-
+    # Partition key, so it is part of the table's primary key as Postgres requires.
+    created_at = Column(BigInteger, primary_key=True, nullable=False, server_default=text("EXTRACT(EPOCH FROM NOW()) * 1000"))
+
+    # Maintained by Postgres on every insert/update; deferred so normal reads never load it.
+    search_vector = deferred(Column(
+        TSVECTOR,
+        Computed("to_tsvector('english', coalesce(title, '') || ' ' || coalesce(summary, ''))", persisted=True),
+    ))
+
+    # Serves keyset pagination on (created_at DESC, id DESC) within a topic.
+    __table_args__ = (
+        Index("ix_updates_topic_created_id", associated_topic_id, created_at.desc(), id.desc()),
+        Index("ix_updates_key_points", key_points, postgresql_using="gin", postgresql_ops={"key_points": "jsonb_path_ops"}),
+        Index("ix_updates_search_vector", "search_vector", postgresql_using="gin"),
+        # Monthly range partitions are created and retired by app/db/partitions.py.
+        {"postgresql_partition_by": "RANGE (created_at)"},
+    )
+
+    __mapper_args__ = {"primary_key": [id]}
@@ -0,0 +1,38 @@
+
+from sqlalchemy import Column, Integer, String, BigInteger, text, Index
+from app.db.base import Base
+
+
+class UpdateBatch(Base):
+    """Per-batch aggregates, written in the same transaction as the batch's updates."""
+
+    __tablename__ = "update_batches"
+
+    # The batch_id shared by the batch's Update rows.
+    id = Column(String(255), primary_key=True, nullable=False)
+
+    associated_topic_id = Column(String(255), nullable=False)
+
+    # Owner of the topic; NULL for batches saved before digests existed, which are never digested.
+    associated_user_id = Column(String(255), nullable=True)
+
+    update_count = Column(Integer, nullable=False)
+
+    oldest_created_at = Column(BigInteger, nullable=False)
+
+    newest_created_at = Column(BigInteger, nullable=False)
+
+    # When the user was emailed about this batch (or it was decided not to); NULL while it waits for a digest.
+    notified_at = Column(BigInteger, nullable=True)
+
+    created_at = Column(BigInteger, nullable=False, server_default=text("EXTRACT(EPOCH FROM NOW()) * 1000"))
+
+    __table_args__ = (
+        Index("ix_update_batches_topic_newest_id", associated_topic_id, newest_created_at.desc(), id.desc()),
+        Index(
+            "ix_update_batches_digest_pending",
+            associated_user_id,
+            created_at,
+            postgresql_where=text("notified_at IS NULL AND associated_user_id IS NOT NULL"),
+        ),
+    )
@@ -0,0 +1,34 @@
+
+from sqlalchemy import Column, Integer, String, BigInteger, text, Index
+from app.db.base import Base
+
+
+class UpdateFingerprint(Base):
+    __tablename__ = "update_fingerprints"
+
+    # Same id as the Update row it was computed from.
+    id = Column(String(255), primary_key=True, nullable=False)
+
+    associated_topic_id = Column(String(255), nullable=False)
+
+    url_hash = Column(String(40), nullable=True)
+
+    simhash = Column(BigInteger, nullable=False)
+
+    band0 = Column(Integer, nullable=False)
+
+    band1 = Column(Integer, nullable=False)
+
+    band2 = Column(Integer, nullable=False)
+
+    band3 = Column(Integer, nullable=False)
+
+    created_at = Column(BigInteger, nullable=False, server_default=text("EXTRACT(EPOCH FROM NOW()) * 1000"))
+
+    __table_args__ = (
+        Index("ix_update_fingerprints_topic_url", associated_topic_id, url_hash),
+        Index("ix_update_fingerprints_topic_band0", associated_topic_id, band0),
+        Index("ix_update_fingerprints_topic_band1", associated_topic_id, band1),
+        Index("ix_update_fingerprints_topic_band2", associated_topic_id, band2),
+        Index("ix_update_fingerprints_topic_band3", associated_topic_id, band3),
+    )
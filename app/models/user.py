@@ -18,6 +18,12 @@ class User(Base):
     first_name = Column(String(100), nullable=False)
     last_name = Column(String(100))
 
+    # Update email delivery: "immediate", "digest" or "off"; NULL means DIGEST_DEFAULT_MODE.
+    digest_mode = Column(String(20), nullable=True)
+
+    # How long the first pending batch waits before the digest goes out; NULL means DIGEST_DEFAULT_WINDOW_MINUTES.
+    digest_window_minutes = Column(Integer, nullable=True)
+
     created_at = Column(BigInteger, nullable=False, server_default=text("EXTRACT(EPOCH FROM NOW()) * 1000"))
 
     updated_at = Column(BigInteger, nullable=False, server_default=text("EXTRACT(EPOCH FROM NOW()) * 1000"), onupdate=text("EXTRACT(EPOCH FROM NOW()) * 1000"))
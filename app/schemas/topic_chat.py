@@ -0,0 +1,20 @@
+from typing import List, Optional
+
+from pydantic import BaseModel, ConfigDict
+
+
+class TopicChatOut(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: str
+    associated_topic_id: str
+    chat_message: Optional[str] = None
+    sent_by_user: bool
+    created_at: int
+
+
+class TopicChatPage(BaseModel):
+    message: str
+    topic_chats: List[TopicChatOut]
+    next_cursor: Optional[str] = None
+    has_more: bool
@@ -0,0 +1,58 @@
+from typing import List, Optional
+
+from pydantic import BaseModel, ConfigDict, field_validator
+
+
+class UpdateOut(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: str
+    associated_topic_id: str
+    title: Optional[str] = None
+    batch_id: str
+    author: Optional[str] = None
+    summary: Optional[str] = None
+    source_url: Optional[str] = None
+    date: Optional[int] = None
+    key_points: List[str] = []
+    image_link: Optional[str] = None
+    created_at: int
+
+    @field_validator("key_points", mode="before")
+    @classmethod
+    def _key_points_list(cls, value):
+        return value if isinstance(value, list) else []
+
+
+class UpdateSearchResult(UpdateOut):
+    rank: float
+
+
+class UpdatePage(BaseModel):
+    message: str
+    updates: List[UpdateOut]
+    next_cursor: Optional[str] = None
+    latest_cursor: Optional[str] = None
+    has_more: bool
+
+
+class UpdateBatchOut(BaseModel):
+    batch_id: str
+    update_count: int
+    newest_created_at: int
+    oldest_created_at: int
+    updates: List[UpdateOut]
+
+
+class UpdateBatchPage(BaseModel):
+    message: str
+    batches: List[UpdateBatchOut]
+    next_cursor: Optional[str] = None
+    has_more: bool
+
+
+class UpdateSearchPage(BaseModel):
+    message: str
+    updates: List[UpdateSearchResult]
+    next_offset: Optional[int] = None
+    has_more: bool
@@ -3,27 +3,19 @@ from urllib.parse import urlencode
 
 from fastapi.params import Depends
 from jose import jwt
-from passlib.context import CryptContext
 from sqlalchemy.orm import Session
-from starlette.responses import JSONResponse
+from starlette.concurrency import run_in_threadpool
+from app.core.responses import JSONResponse
 from app.utils.user_util import create_user_response
 from app.db.session import get_db
 from app.models.user import User
 from app.core.config import settings
 from fastapi import status
 from app.core.auth import create_jwt_token, verify_jwt_token
+from app.core.password_pool import PasswordPoolBusy, busy_response, password_pool
 from app.utils.random_generator import generate_random_string
 from fastapi.responses import RedirectResponse
 
-try:
-    import bcrypt as _bcrypt  # type: ignore
-    _ = _bcrypt.__about__.__version__  # raises if missing on bcrypt>=4.1
-    _BCRYPT_OK = True
-except Exception:
-    _BCRYPT_OK = False
-
-_pwd_schemes = ["bcrypt", "pbkdf2_sha256"] if _BCRYPT_OK else ["pbkdf2_sha256"]
-pwd_context = CryptContext(schemes=_pwd_schemes, deprecated="auto")
 
 
 
@@ -31,18 +23,36 @@ class AuthService:
     def __init__(self):
         pass
 
-    def hash_password(self, password: str) -> str:
-        return pwd_context.hash(password)
+    async def hash_password(self, password: str) -> str:
+        return await password_pool.hash(password)
+
+    async def verify_password(self, plain_password: str, hashed_password: str) -> bool:
+        return await password_pool.verify(plain_password, hashed_password)
+
+    def _save_rehashed_password(self, user: User, new_hash: str, db: Session) -> None:
+        try:
+            user.hashed_password = new_hash
+            db.commit()
+            db.refresh(user)
+        except Exception as e:
+            # The old hash still works; the upgrade is retried at the next login.
+            db.rollback()
+            print(f"Failed to store rehashed password for user {user.id}: {e}")
 
-    def verify_password(self, plain_password: str, hashed_password: str) -> bool:
-        return pwd_context.verify(plain_password, hashed_password)
+    # Database work stays on the threadpool; only the hashing is awaited on the password pool.
+    def _find_user_by_email(self, email: str, db: Session):
+        return db.query(User).filter(User.email == email).first()
 
+    def _insert_user(self, user: User, db: Session) -> None:
+        db.add(user)
+        db.commit()
+        db.refresh(user)
 
-    def create_user(self, user_data, db: Session) -> JSONResponse:
+    async def create_user(self, user_data, db: Session) -> JSONResponse:
 
         try:
 
-            if db.query(User).filter(User.email == user_data.email).first():
+            if await run_in_threadpool(self._find_user_by_email, user_data.email, db):
                 raise Exception("User already exists")
 
             if len(user_data.password) < 8:
@@ -50,7 +60,7 @@ class AuthService:
                     status_code=status.HTTP_400_BAD_REQUEST,
                     content={"message": "Password must be at least 8 characters long."}
                 )
-            hashed_password = self.hash_password(user_data.password)
+            hashed_password = await self.hash_password(user_data.password)
             user = User(
                 id=generate_random_string(),
                 email=user_data.email,
@@ -59,33 +69,39 @@ class AuthService:
                 last_name=user_data.last_name
             )
 
-            db.add(user)
-            db.commit()
-            db.refresh(user)
+            await run_in_threadpool(self._insert_user, user, db)
             token = create_jwt_token(user.id, user.email)
             user_response = create_user_response(user)
 
 
             return JSONResponse(content={"message":"User created successfully", "user_info":user_response, "access_token": token, "token_type": "bearer"}, status_code=status.HTTP_201_CREATED)
+        except PasswordPoolBusy:
+            return busy_response()
         except Exception as e:
             print(e)
-            db.rollback()
+            await run_in_threadpool(db.rollback)
             if str(e) == "User already exists":
                 return JSONResponse(content={"message":"User with this email already exists"}, status_code=status.HTTP_400_BAD_REQUEST)
             return JSONResponse(content={"message":"An unexpected error occurred"}, status_code=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
-    def authenticate_user(self, email: str, password: str, db: Session) -> JSONResponse:
+    async def authenticate_user(self, email: str, password: str, db: Session) -> JSONResponse:
 
         try:
-            user = db.query(User).filter(User.email == email).first()
+            user = await run_in_threadpool(self._find_user_by_email, email, db)
             if not user:
                 return JSONResponse(content={"message":"User does not exist", }, status_code=status.HTTP_404_NOT_FOUND)
-            elif not self.verify_password(password, user.hashed_password):
+            valid, new_hash = await password_pool.verify_and_update(password, user.hashed_password)
+            if not valid:
                 return JSONResponse(content={"message": "Wrong username or password"}, status_code=status.HTTP_401_UNAUTHORIZED)
+            if new_hash:
+                # Stored hash predates the current policy (weaker cost or old scheme).
+                await run_in_threadpool(self._save_rehashed_password, user, new_hash, db)
 
             token = create_jwt_token(user.id, user.email)
             user_response = create_user_response(user)
             return JSONResponse(content={"message":"Successfully logged in","user_info":user_response, "access_token": token, "token_type": "bearer"}, status_code=status.HTTP_200_OK)
+        except PasswordPoolBusy:
+            return busy_response()
         except Exception as e:
             print(e)
             return JSONResponse(content={"message":"An unexpected error occurred"}, status_code=status.HTTP_500_INTERNAL_SERVER_ERROR)
@@ -0,0 +1,84 @@
+import asyncio
+import threading
+from typing import Dict, Optional, Set
+
+# Events a slow client may fall behind by before its oldest ones are dropped.
+DEFAULT_QUEUE_SIZE = 100
+
+
+class Subscription:
+    """One WebSocket connection's inbox of events."""
+
+    def __init__(self, user_id: str, queue_size: int):
+        self.user_id = user_id
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        self.dropped = 0
+
+    def offer(self, event: dict) -> None:
+        if self.queue.full():
+            # Drop the oldest event rather than block the publisher on a slow client.
+            self.queue.get_nowait()
+            self.dropped += 1
+        self.queue.put_nowait(event)
+
+
+class ConnectionHub:
+    """In-process fan-out of events to every open WebSocket of a user.
+
+    Subscriptions are indexed by user id, so publishing costs one dict lookup plus
+    one non-blocking put per connection of that user, however many users are
+    connected. All queue operations run on the event loop; sync code (request
+    threads, APScheduler jobs) goes through ``publish_threadsafe``. Each worker
+    process has its own hub and only reaches clients connected to it.
+    """
+
+    def __init__(self, queue_size: int = DEFAULT_QUEUE_SIZE):
+        self.queue_size = queue_size
+        self._subscriptions: Dict[str, Set[Subscription]] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._lock = threading.Lock()
+
+    def bind_loop(self, loop: asyncio.AbstractEventLoop) -> None:
+        self._loop = loop
+
+    def subscribe(self, user_id: str) -> Subscription:
+        subscription = Subscription(user_id, self.queue_size)
+        with self._lock:
+            self._subscriptions.setdefault(user_id, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        with self._lock:
+            subscriptions = self._subscriptions.get(subscription.user_id)
+            if subscriptions is None:
+                return
+            subscriptions.discard(subscription)
+            if not subscriptions:
+                del self._subscriptions[subscription.user_id]
+
+    def publish(self, user_id: str, event: dict) -> int:
+        """Queue ``event`` for every connection of ``user_id``. Must run on the event loop."""
+        with self._lock:
+            subscriptions = list(self._subscriptions.get(user_id, ()))
+        for subscription in subscriptions:
+            subscription.offer(event)
+        return len(subscriptions)
+
+    def publish_threadsafe(self, user_id: str, event: dict) -> None:
+        loop = self._loop
+        if loop is None or loop.is_closed():
+            return
+        with self._lock:
+            if user_id not in self._subscriptions:
+                return
+        loop.call_soon_threadsafe(self.publish, user_id, event)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "users": len(self._subscriptions),
+                "connections": sum(len(subscriptions) for subscriptions in self._subscriptions.values()),
+            }
+
+
+connection_hub = ConnectionHub()
@@ -0,0 +1,126 @@
+import time
+from collections import defaultdict
+from typing import List, Optional
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.session import SessionLocal
+from app.models.topic import Topic
+from app.models.update import Update
+from app.models.update_batch import UpdateBatch
+from app.models.user import User
+from app.services.email_outbox_service import enqueue_email
+from app.services.email_service import render_digest_email
+
+DELIVERY_IMMEDIATE = "immediate"
+DELIVERY_DIGEST = "digest"
+DELIVERY_OFF = "off"
+DELIVERY_MODES = (DELIVERY_IMMEDIATE, DELIVERY_DIGEST, DELIVERY_OFF)
+
+
+def _now_ms() -> int:
+    return int(time.time() * 1000)
+
+
+def delivery_mode(user: Optional[User]) -> str:
+    mode = getattr(user, "digest_mode", None) or settings.DIGEST_DEFAULT_MODE
+    return mode if mode in DELIVERY_MODES else DELIVERY_DIGEST
+
+
+def digest_window_minutes(user: Optional[User]) -> int:
+    minutes = getattr(user, "digest_window_minutes", None) or settings.DIGEST_DEFAULT_WINDOW_MINUTES
+    return max(settings.DIGEST_MIN_WINDOW_MINUTES, min(int(minutes), settings.DIGEST_MAX_WINDOW_MINUTES))
+
+
+def _send_user_digest(user: User, db: Session) -> int:
+    """Consolidate the user's pending batches into one outbox email. Returns the number of batches covered."""
+    # SKIP LOCKED so a second worker never emails the same batches.
+    batches: List[UpdateBatch] = (
+        db.query(UpdateBatch)
+        .filter(UpdateBatch.associated_user_id == user.id, UpdateBatch.notified_at.is_(None))
+        .order_by(UpdateBatch.created_at.asc())
+        .with_for_update(skip_locked=True)
+        .all()
+    )
+    if not batches:
+        return 0
+
+    now_ms = _now_ms()
+    for batch in batches:
+        batch.notified_at = now_ms
+
+    if delivery_mode(user) == DELIVERY_OFF or not user.email:
+        return len(batches)
+
+    updates = (
+        db.query(Update)
+        .filter(
+            Update.batch_id.in_([batch.id for batch in batches]),
+            # Keeps the lookup on the partitions the batches live in.
+            Update.created_at >= min(batch.oldest_created_at for batch in batches),
+            Update.created_at <= max(batch.newest_created_at for batch in batches),
+        )
+        .order_by(Update.created_at.desc(), Update.id.desc())
+        .all()
+    )
+    updates_by_topic = defaultdict(list)
+    for update in updates:
+        updates_by_topic[update.associated_topic_id].append(update)
+
+    topics = db.query(Topic).filter(Topic.id.in_(list(updates_by_topic))).all() if updates_by_topic else []
+    # Topics with the freshest news first.
+    topics.sort(key=lambda topic: updates_by_topic[topic.id][0].created_at, reverse=True)
+    sections = [
+        (topic.title or topic.description or "your topic", updates_by_topic[topic.id])
+        for topic in topics
+    ]
+    if sections:
+        enqueue_email(db, user.email, *render_digest_email(sections))
+    return len(batches)
+
+
+def send_due_digests() -> None:
+    """Email every user whose oldest pending batch has waited out their digest window."""
+    db = SessionLocal()
+    try:
+        pending = (
+            db.query(UpdateBatch.associated_user_id, func.min(UpdateBatch.created_at))
+            .filter(UpdateBatch.associated_user_id.isnot(None), UpdateBatch.notified_at.is_(None))
+            .group_by(UpdateBatch.associated_user_id)
+            .all()
+        )
+        if not pending:
+            return
+
+        users = {user.id: user for user in db.query(User).filter(User.id.in_([user_id for user_id, _ in pending])).all()}
+        now_ms = _now_ms()
+        digests = 0
+        batches = 0
+        for user_id, oldest_pending_ms in pending:
+            user = users.get(user_id)
+            if user is not None and delivery_mode(user) == DELIVERY_DIGEST:
+                if oldest_pending_ms + digest_window_minutes(user) * 60 * 1000 > now_ms:
+                    continue
+            try:
+                if user is None:
+                    # The account is gone; nothing to send.
+                    db.query(UpdateBatch).filter(
+                        UpdateBatch.associated_user_id == user_id, UpdateBatch.notified_at.is_(None)
+                    ).update({UpdateBatch.notified_at: now_ms}, synchronize_session=False)
+                else:
+                    batches += _send_user_digest(user, db)
+                    digests += 1
+                db.commit()
+            except Exception as e:
+                db.rollback()
+                print(f"Failed to send digest for user {user_id}: {e}")
+
+        if digests:
+            print(f"Processed digests for {digests} users covering {batches} update batches")
+    except Exception as e:
+        db.rollback()
+        print(f"Digest run failed: {e}")
+    finally:
+        db.close()
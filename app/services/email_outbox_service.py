@@ -0,0 +1,207 @@
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional, Tuple
+
+from sqlalchemy import update
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.session import SessionLocal, engine
+from app.models.email_outbox import EmailOutbox
+from app.services.email_service import build_email, smtp_pool
+from app.utils.random_generator import generate_random_string
+
+STATUS_PENDING = "pending"
+STATUS_SENT = "sent"
+STATUS_DEAD = "dead"
+
+
+def _now_ms() -> int:
+    return int(time.time() * 1000)
+
+
+def enqueue_email(
+    db: Session,
+    to_email: str,
+    subject: str,
+    text_body: str,
+    html_body: Optional[str] = None,
+    not_after: Optional[int] = None,
+) -> EmailOutbox:
+    """Add an email to the outbox. It is only sent once the caller commits ``db``.
+
+    ``not_after`` (epoch ms) is when the email stops being useful, e.g. the expiry of the
+    code it carries; it is dead-lettered rather than sent or retried after that.
+    """
+    row = EmailOutbox(
+        id=generate_random_string(32),
+        to_email=to_email,
+        subject=subject,
+        text_body=text_body,
+        html_body=html_body,
+        status=STATUS_PENDING,
+        attempts=0,
+        next_attempt_at=_now_ms(),
+        not_after=not_after,
+    )
+    db.add(row)
+    return row
+
+
+def backoff_ms(attempts: int) -> int:
+    """Exponential delay before attempt ``attempts + 1``, capped and jittered by +/-20%."""
+    delay = min(
+        settings.EMAIL_OUTBOX_BACKOFF_BASE_SECONDS * (2 ** max(0, attempts - 1)),
+        settings.EMAIL_OUTBOX_BACKOFF_MAX_SECONDS,
+    )
+    return int(delay * random.uniform(0.8, 1.2) * 1000)
+
+
+class _ClaimLost(Exception):
+    """The row's lease ran out and another worker claimed it; this worker must not send it."""
+
+
+def _claim_lease_ms() -> int:
+    return settings.EMAIL_OUTBOX_CLAIM_SECONDS * 1000
+
+
+def _renew_claim(row: EmailOutbox) -> bool:
+    """Extend this worker's lease on ``row`` right before sending it. Runs on the sender
+    threads, so it uses its own connection and leaves the ORM row untouched.
+
+    Matching on the next_attempt_at this worker wrote means a row whose lease already
+    lapsed and was claimed again elsewhere is left to that worker, however long this
+    batch has been running.
+    """
+    renewed_until = _now_ms() + _claim_lease_ms()
+    with engine.begin() as conn:
+        result = conn.execute(
+            update(EmailOutbox)
+            .where(
+                EmailOutbox.id == row.id,
+                EmailOutbox.status == STATUS_PENDING,
+                EmailOutbox.next_attempt_at == row.next_attempt_at,
+            )
+            .values(next_attempt_at=renewed_until)
+        )
+    return result.rowcount == 1
+
+
+def _send(row: EmailOutbox) -> Optional[Exception]:
+    try:
+        if not _renew_claim(row):
+            return _ClaimLost()
+        smtp_pool.send_message(build_email(row.to_email, row.subject, row.text_body, row.html_body))
+        return None
+    except Exception as e:
+        return e
+
+
+def _dead_letter(row: EmailOutbox, reason: str) -> None:
+    row.status = STATUS_DEAD
+    row.last_error = reason[:1000]
+    print(f"Email {row.id} to {row.to_email} dead-lettered after {row.attempts} attempts: {reason}")
+
+
+def _claim_batch(db: Session, batch_size: int) -> Tuple[List[EmailOutbox], int]:
+    """Claim due rows in a short transaction. Returns the rows to send and how many were due.
+
+    SKIP LOCKED lets several workers (or processes) claim without overlap; the claim is
+    committed before any SMTP I/O by pushing next_attempt_at out by EMAIL_OUTBOX_CLAIM_SECONDS,
+    so no row locks are held during sends and a worker that dies mid-send only delays the row.
+    Each row's lease is renewed just before it is sent (see _renew_claim).
+    """
+    now_ms = _now_ms()
+    rows = (
+        db.query(EmailOutbox)
+        .filter(EmailOutbox.status == STATUS_PENDING, EmailOutbox.next_attempt_at <= now_ms)
+        .order_by(EmailOutbox.next_attempt_at.asc())
+        .limit(batch_size)
+        .with_for_update(skip_locked=True)
+        .all()
+    )
+    claimed = []
+    for row in rows:
+        if row.not_after is not None and row.not_after <= now_ms:
+            _dead_letter(row, row.last_error or "Expired before it could be sent")
+            continue
+        row.attempts = (row.attempts or 0) + 1
+        row.next_attempt_at = now_ms + _claim_lease_ms()
+        claimed.append(row)
+    db.commit()
+    return claimed, len(rows)
+
+
+def _drain_batch(db: Session, executor: ThreadPoolExecutor, batch_size: int) -> int:
+    rows, due = _claim_batch(db, batch_size)
+    if not rows:
+        return due
+
+    errors = list(executor.map(_send, rows))
+
+    now_ms = _now_ms()
+    for row, error in zip(rows, errors):
+        if isinstance(error, _ClaimLost):
+            # No longer ours; the worker that claimed it records the outcome.
+            print(f"Email {row.id} was claimed by another worker before it was sent, skipping")
+            continue
+        if error is None:
+            row.status = STATUS_SENT
+            row.sent_at = now_ms
+            row.last_error = None
+            continue
+
+        next_attempt_at = now_ms + backoff_ms(row.attempts)
+        if row.attempts >= settings.EMAIL_OUTBOX_MAX_ATTEMPTS:
+            _dead_letter(row, str(error))
+        elif row.not_after is not None and next_attempt_at > row.not_after:
+            _dead_letter(row, f"Expires before the next attempt: {error}")
+        else:
+            row.next_attempt_at = next_attempt_at
+            row.last_error = str(error)[:1000]
+            print(f"Email {row.id} attempt {row.attempts} failed, retrying later: {error}")
+    db.commit()
+    return due
+
+
+def drain_email_outbox(batch_size: Optional[int] = None) -> int:
+    """Send due outbox emails batch by batch until none are due. Returns how many due rows were handled."""
+    batch_size = batch_size or settings.EMAIL_OUTBOX_BATCH_SIZE
+    attempted = 0
+    # Claimed rows are read by the sender threads after the claim commits; they must not
+    # expire and lazy-load on this session from several threads.
+    db = SessionLocal(expire_on_commit=False)
+    try:
+        with ThreadPoolExecutor(max_workers=settings.SMTP_POOL_SIZE) as executor:
+            while True:
+                count = _drain_batch(db, executor, batch_size)
+                attempted += count
+                if count < batch_size:
+                    return attempted
+    except Exception as e:
+        db.rollback()
+        print(f"Email outbox drain failed: {e}")
+        return attempted
+    finally:
+        db.close()
+
+
+def purge_sent_emails() -> None:
+    """Delete delivered outbox rows past EMAIL_OUTBOX_SENT_RETENTION_DAYS; dead rows are kept for inspection."""
+    cutoff_ms = _now_ms() - settings.EMAIL_OUTBOX_SENT_RETENTION_DAYS * 24 * 60 * 60 * 1000
+    db = SessionLocal()
+    try:
+        deleted = (
+            db.query(EmailOutbox)
+            .filter(EmailOutbox.status == STATUS_SENT, EmailOutbox.sent_at < cutoff_ms)
+            .delete(synchronize_session=False)
+        )
+        db.commit()
+        if deleted:
+            print(f"Purged {deleted} sent outbox emails")
+    except Exception as e:
+        db.rollback()
+        print(f"Email outbox purge failed: {e}")
+    finally:
+        db.close()
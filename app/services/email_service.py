@@ -1,107 +1,102 @@
-import smtplib
 from email.message import EmailMessage
-from typing import List
+from typing import List, Optional, Tuple
 
 from app.core.config import settings
+from app.services.email_templates import (
+    render_email_html,
+    render_topic_section_html,
+    render_update_items_html,
+    render_update_text_lines,
+)
+from app.services.smtp_pool import SMTPConnectionPool
+
+smtp_pool = SMTPConnectionPool(
+    settings.SMTP_SERVER,
+    settings.SMTP_PORT,
+    username=settings.SMTP_EMAIL,
+    password=settings.SMTP_PASSWORD,
+    use_tls=settings.SMTP_USE_TLS,
+    size=settings.SMTP_POOL_SIZE,
+    timeout=settings.SMTP_TIMEOUT_SECONDS,
+    health_check_after=settings.SMTP_POOL_HEALTH_CHECK_SECONDS,
+    max_idle=settings.SMTP_POOL_MAX_IDLE_SECONDS,
+)
+
+
+def _deliver(msg: EmailMessage) -> None:
+    try:
+        smtp_pool.send_message(msg)
+    except Exception as e:
+        raise RuntimeError(f"Email send failed: {e}")
 
 
-def send_email(to_email: str, subject: str, body: str):
+def build_email(to_email: str, subject: str, text_body: str, html_body: Optional[str] = None) -> EmailMessage:
     msg = EmailMessage()
 
     msg["From"] = f"{settings.SMTP_SENDER_NAME} <{settings.SMTP_EMAIL}>"
     msg["To"] = to_email
     msg["Subject"] = subject
-    msg.set_content(body)
+    msg.set_content(text_body)
+    if html_body:
+        msg.add_alternative(html_body, subtype="html")
 
-    try:
-        server = smtplib.SMTP(settings.SMTP_SERVER, settings.SMTP_PORT)
-        server.starttls()
-        server.login(settings.SMTP_EMAIL, settings.SMTP_PASSWORD)
-        server.send_message(msg)
-        server.quit()
-    except Exception as e:
-        raise RuntimeError(f"Email send failed: {e}")
+    return msg
 
 
-def send_updates_email(to_email: str, topic_title: str, updates: List[object]):
+def send_email(to_email: str, subject: str, body: str):
+    _deliver(build_email(to_email, subject, body))
+
+
+def render_updates_email(topic_title: str, updates: List[object]) -> Tuple[str, str, Optional[str]]:
+    """Return (subject, text body, html body) of the updates email for one topic."""
 
     safe_topic_title = topic_title or "your topic"
 
     if not updates:
         body = f"There are currently no new updates for '{safe_topic_title}'."
-        send_email(to_email, f"No new updates for {safe_topic_title}", body)
-        return
+        return f"No new updates for {safe_topic_title}", body, None
 
     lines = [
         f"Here is a quick snapshot of your latest updates for '{safe_topic_title}':",
         "",
     ]
+    lines.extend(render_update_text_lines(updates))
+    text_body = "\n".join(lines).strip()
 
-    for idx, u in enumerate(updates, start=1):
-        title = getattr(u, "title", None) or "Update"
-        summary = getattr(u, "summary", None) or ""
-        source_url = getattr(u, "source_url", None) or ""
-
-        lines.append(f"{idx}. {title}")
-        if summary:
-            lines.append(f"   {summary}")
-        if source_url:
-            lines.append(f"   Source: {source_url}")
-        lines.append("")
-
+    html_body = render_email_html(
+        f"Your updates on {safe_topic_title}",
+        "A concise snapshot of what changed around this topic.",
+        render_update_items_html(updates),
+        "You're receiving this email because you asked Neuraletter to follow this topic.",
+    )
+
+    return f"New updates for {safe_topic_title}", text_body, html_body
+
+
+def render_digest_email(sections: List[Tuple[str, List[object]]]) -> Tuple[str, str, Optional[str]]:
+    """Return (subject, text body, html body) of one email covering several topics' new updates."""
+    if len(sections) == 1:
+        return render_updates_email(*sections[0])
+
+    total = sum(len(updates) for _, updates in sections)
+    lines = [f"Here is your digest: {total} new updates across {len(sections)} topics.", ""]
+    sections_html_parts = []
+    for topic_title, updates in sections:
+        safe_topic_title = topic_title or "your topic"
+        lines.append(f"== {safe_topic_title} ==")
+        lines.extend(render_update_text_lines(updates))
+        sections_html_parts.append(render_topic_section_html(safe_topic_title, updates))
     text_body = "\n".join(lines).strip()
 
-    items_html_parts = []
-    for u in updates:
-        title = getattr(u, "title", None) or "Update"
-        summary = getattr(u, "summary", None) or "No description available."
-        source_url = getattr(u, "source_url", None) or ""
-
-        link_html = ""
-        if source_url:
-            link_html = f"""
-              <a href=\"{source_url}\" style=\"color:#2563eb;text-decoration:none;font-size:13px;\">View source</a>
-            """
-
-        items_html_parts.append(
-              f"""
-              <div style=\"width:100%;box-sizing:border-box;padding:12px 14px;border-radius:10px;border:1px solid #e5e7eb;background-color:#f9fafb;margin-bottom:12px;\">
-                <div style=\"font-size:14px;font-weight:600;color:#111827;margin-bottom:4px;\">{title}</div>
-                <div style=\"font-size:13px;color:#4b5563;line-height:1.5;margin-bottom:6px;\">{summary}</div>
-                {link_html}
-              </div>
-              """
-        )
-
-    items_html = "".join(items_html_parts)
-
-    html_body = f"""\
-<html>
-  <body style=\"margin:0;padding:24px;background-color:#f4f4f5;font-family:-apple-system,BlinkMacSystemFont,'Segoe UI',sans-serif;\">
-    <div style=\"max-width:640px;margin:0 auto;background-color:#ffffff;border:1px solid #e5e7eb;border-radius:12px;padding:24px;\">
-      <h1 style=\"font-size:20px;margin:0 0 8px 0;color:#111827;font-weight:600;\">Your updates on {safe_topic_title}</h1>
-      <p style=\"margin:0 0 18px 0;color:#4b5563;font-size:14px;\">A concise snapshot of what changed around this topic.</p>
-        <div>
-        {items_html}
-      </div>
-      <p style=\"margin-top:22px;font-size:12px;color:#9ca3af;\">You're receiving this email because you asked Neuraletter to follow this topic.</p>
-    </div>
-  </body>
-</html>
-"""
+    html_body = render_email_html(
+        "Your Neuraletter digest",
+        f"{total} new updates across {len(sections)} of your topics.",
+        "".join(sections_html_parts),
+        "You're receiving this digest because you asked Neuraletter to follow these topics.",
+    )
 
-    msg = EmailMessage()
-    msg["From"] = f"{settings.SMTP_SENDER_NAME} <{settings.SMTP_EMAIL}>"
-    msg["To"] = to_email
-    msg["Subject"] = f"New updates for {safe_topic_title}"
-    msg.set_content(text_body)
-    msg.add_alternative(html_body, subtype="html")
+    return f"Your digest: {total} new updates across {len(sections)} topics", text_body, html_body
 
-    try:
-        server = smtplib.SMTP(settings.SMTP_SERVER, settings.SMTP_PORT)
-        server.starttls()
-        server.login(settings.SMTP_EMAIL, settings.SMTP_PASSWORD)
-        server.send_message(msg)
-        server.quit()
-    except Exception as e:
-        raise RuntimeError(f"Email send failed: {e}")
+
+def send_updates_email(to_email: str, topic_title: str, updates: List[object]):
+    _deliver(build_email(to_email, *render_updates_email(topic_title, updates)))
@@ -0,0 +1,152 @@
+import html
+from functools import lru_cache
+from string import Template
+from typing import List, Optional
+from urllib.parse import urlsplit
+
+from app.core.config import settings
+
+
+class CompiledTemplate:
+    """A ``$name`` template split into literal chunks and field names once, at import time.
+
+    Rendering is a single join over the pre-split parts, so nothing is re-parsed per email.
+    Values are inserted verbatim; escaping is the caller's job (see ``escape``).
+    """
+
+    def __init__(self, source: str):
+        self.source = source
+        self._literals: List[str] = []
+        self._fields: List[str] = []
+
+        position = 0
+        literal = []
+        for match in Template.pattern.finditer(source):
+            literal.append(source[position:match.start()])
+            position = match.end()
+            if match.group("escaped") is not None:
+                literal.append("$")
+                continue
+            name = match.group("named") or match.group("braced")
+            if name is None:
+                raise ValueError(f"Invalid placeholder in email template at offset {match.start()}")
+            self._literals.append("".join(literal))
+            self._fields.append(name)
+            literal = []
+        literal.append(source[position:])
+        self._literals.append("".join(literal))
+
+    @property
+    def fields(self) -> List[str]:
+        return list(self._fields)
+
+    def render(self, **values: str) -> str:
+        parts = [self._literals[0]]
+        for name, literal in zip(self._fields, self._literals[1:]):
+            parts.append(values[name])
+            parts.append(literal)
+        return "".join(parts)
+
+
+def escape(value: Optional[str]) -> str:
+    return html.escape(value or "", quote=True)
+
+
+def safe_url(value: Optional[str]) -> str:
+    """Escaped http(s) URL, or "" for anything else (javascript:, data:, relative paths)."""
+    url = (value or "").strip()
+    if urlsplit(url).scheme.lower() not in ("http", "https"):
+        return ""
+    return escape(url)
+
+
+UPDATE_ITEM_HTML = CompiledTemplate("""
+              <div style="width:100%;box-sizing:border-box;padding:12px 14px;border-radius:10px;border:1px solid #e5e7eb;background-color:#f9fafb;margin-bottom:12px;">
+                <div style="font-size:14px;font-weight:600;color:#111827;margin-bottom:4px;">$title</div>
+                <div style="font-size:13px;color:#4b5563;line-height:1.5;margin-bottom:6px;">$summary</div>
+                $link
+              </div>
+              """)
+
+UPDATE_LINK_HTML = CompiledTemplate("""
+              <a href="$url" style="color:#2563eb;text-decoration:none;font-size:13px;">View source</a>
+            """)
+
+TOPIC_SECTION_HTML = CompiledTemplate("""
+        <h2 style="font-size:16px;margin:18px 0 10px 0;color:#111827;font-weight:600;">$topic_title</h2>
+        $items
+        """)
+
+EMAIL_LAYOUT_HTML = CompiledTemplate("""\
+<html>
+  <body style="margin:0;padding:24px;background-color:#f4f4f5;font-family:-apple-system,BlinkMacSystemFont,'Segoe UI',sans-serif;">
+    <div style="max-width:640px;margin:0 auto;background-color:#ffffff;border:1px solid #e5e7eb;border-radius:12px;padding:24px;">
+      <h1 style="font-size:20px;margin:0 0 8px 0;color:#111827;font-weight:600;">$heading</h1>
+      <p style="margin:0 0 18px 0;color:#4b5563;font-size:14px;">$intro</p>
+        <div>
+        $content
+      </div>
+      <p style="margin-top:22px;font-size:12px;color:#9ca3af;">$footer</p>
+    </div>
+  </body>
+</html>
+""")
+
+
+# Keyed by the update's id and content, so a story shared by several digests renders once
+# and an edited story renders again.
+@lru_cache(maxsize=settings.EMAIL_FRAGMENT_CACHE_SIZE)
+def _update_fragments(update_id: Optional[str], title: Optional[str], summary: Optional[str], source_url: Optional[str]):
+    url = safe_url(source_url)
+    item_html = UPDATE_ITEM_HTML.render(
+        title=escape(title or "Update"),
+        summary=escape(summary or "No description available."),
+        link=UPDATE_LINK_HTML.render(url=url) if url else "",
+    )
+
+    text_lines = [title or "Update"]
+    if summary:
+        text_lines.append(f"   {summary}")
+    if source_url:
+        text_lines.append(f"   Source: {source_url}")
+    return item_html, "\n".join(text_lines)
+
+
+def update_fragments(update: object):
+    """(html item, text lines without the leading number) for one update, cached."""
+    return _update_fragments(
+        getattr(update, "id", None),
+        getattr(update, "title", None),
+        getattr(update, "summary", None),
+        getattr(update, "source_url", None),
+    )
+
+
+def render_update_items_html(updates: List[object]) -> str:
+    return "".join(update_fragments(update)[0] for update in updates)
+
+
+def render_update_text_lines(updates: List[object]) -> List[str]:
+    lines = []
+    for idx, update in enumerate(updates, start=1):
+        lines.append(f"{idx}. {update_fragments(update)[1]}")
+        lines.append("")
+    return lines
+
+
+def render_topic_section_html(topic_title: str, updates: List[object]) -> str:
+    return TOPIC_SECTION_HTML.render(topic_title=escape(topic_title), items=render_update_items_html(updates))
+
+
+def render_email_html(heading: str, intro: str, content_html: str, footer: str) -> str:
+    """Wrap already-rendered ``content_html`` in the common layout; the other parts are escaped here."""
+    return EMAIL_LAYOUT_HTML.render(
+        heading=escape(heading),
+        intro=escape(intro),
+        content=content_html,
+        footer=escape(footer),
+    )
+
+
+def fragment_cache_info():
+    return _update_fragments.cache_info()
@@ -0,0 +1,151 @@
+import time
+from typing import List
+
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.topic import Topic
+from app.models.topic_chat import TopicChat
+from app.services.mistral.model_router import (
+    model_router,
+    TASK_CLARIFYING_QUESTION,
+    TASK_CHUNK_SUMMARIZATION,
+)
+
+
+CHAT_SUMMARIZER_INSTRUCTIONS = (
+    "You are a chat summarizer agent. Your task is to take the 1st user message, then ask questions to clarify the users need and based"
+    " on conversation generate a summary of the "
+    "discussion so far. "
+    "Instructions to be strictly followed: "
+    "1. CRITICAL: Ask ONLY ONE question per response. Never ask multiple questions at once. "
+    "2. When asking a question, return ONLY a single JSON object like {'question': 'your question here'}. "
+    "When providing the final summary, return ONLY a single JSON object like {'summary': 'your summary here'}. "
+    "Return ONLY valid JSON. No prose. No markdown. No multiple JSON objects."
+    "3. The user will ask for updates on some topic. Ask relevant questions ONE AT A TIME to get more context about the user's topic. "
+    "4. Do NOT ask questions about the method or delivery format the user would want to receive updates."
+    "5. Build the conversation naturally by asking follow-up questions based on the user's previous responses. "
+    "6. Ask at least 3-5 questions total before providing the final summary. Take your time to gather comprehensive information."
+    "7. Questions should ONLY gather more context about the topic user wants updates on. Nothing else."
+    "8. Once you have enough information (after at least 3-5 exchanges), provide a concise summary that captures all key points discussed. The summary  should only include the topics description, dont start like The user want update on or some other starting, give the summary directly"
+    "9. REMEMBER: ONE question at a time. Never generate multiple question objects in a single response."
+)
+
+CHAT_COMPLETION_ARGS = {
+    "temperature": 0.8,
+    "top_p": 0.98,
+}
+
+COMPACTION_PROMPT = (
+    "You maintain the running memory of a conversation between a user and an assistant that is clarifying "
+    "which topic the user wants to receive updates about.\n"
+    "Current memory (may be empty):\n{SUMMARY}\n\n"
+    "Older messages to fold into the memory:\n{MESSAGES}\n\n"
+    "Rewrite the memory so it keeps every fact, preference and constraint the user stated and every question "
+    "the assistant already asked. Return ONLY the updated memory as plain text."
+)
+
+
+def estimate_tokens(text: str | None) -> int:
+    """Cheap token estimate (~4 characters per token), good enough for a compaction threshold."""
+    if not text:
+        return 0
+    return len(text) // 4 + 1
+
+
+class ChatContextService:
+    """Builds topic chat prompts from our own topic_chats rows.
+
+    The oldest turns are folded into ``Topic.chat_context_summary`` once the
+    un-summarized history crosses CHAT_CONTEXT_MAX_TOKENS, so the prompt sent per
+    turn stays bounded no matter how long the conversation gets.
+    """
+
+    def _load_unsummarized_history(self, topic: Topic, db: Session) -> List[TopicChat]:
+        # Rows written in the same transaction share created_at, the user message goes first.
+        return (
+            db.query(TopicChat)
+            .filter(TopicChat.associated_topic_id == topic.id)
+            .order_by(TopicChat.created_at.asc(), TopicChat.sent_by_user.desc(), TopicChat.id.asc())
+            .offset(topic.chat_context_summarized_count or 0)
+            .all()
+        )
+
+    def _history_tokens(self, topic: Topic, history: List[TopicChat]) -> int:
+        tokens = estimate_tokens(topic.chat_context_summary)
+        for chat in history:
+            tokens += estimate_tokens(chat.chat_message)
+        return tokens
+
+    def _compact(self, topic: Topic, history: List[TopicChat]) -> List[TopicChat]:
+        keep = max(0, settings.CHAT_CONTEXT_KEEP_RECENT_MESSAGES)
+        to_fold = history[:-keep] if keep else history
+        if not to_fold:
+            return history
+
+        transcript = "\n".join(
+            f"{'User' if chat.sent_by_user else 'Assistant'}: {chat.chat_message or ''}" for chat in to_fold
+        )
+        prompt = (
+            COMPACTION_PROMPT
+            .replace("{SUMMARY}", topic.chat_context_summary or "")
+            .replace("{MESSAGES}", transcript)
+        )
+
+        response = model_router.complete(
+            topic.tier,
+            TASK_CHUNK_SUMMARIZATION,
+            [{"role": "user", "content": prompt}],
+            temperature=0.2,
+        )
+        summary = response.choices[0].message.content if response and response.choices else None
+        if not summary:
+            raise Exception("Failed to compact chat context")
+
+        topic.chat_context_summary = str(summary).strip()
+        topic.chat_context_summarized_count = (topic.chat_context_summarized_count or 0) + len(to_fold)
+        return history[len(to_fold):]
+
+    def _build_messages(self, topic: Topic, history: List[TopicChat], message: str) -> List[dict]:
+        messages = [{"role": "system", "content": CHAT_SUMMARIZER_INSTRUCTIONS}]
+        if topic.chat_context_summary:
+            messages.append({
+                "role": "system",
+                "content": f"Summary of the earlier conversation: {topic.chat_context_summary}",
+            })
+
+        for chat in history:
+            messages.append({
+                "role": "user" if chat.sent_by_user else "assistant",
+                "content": chat.chat_message or "",
+            })
+
+        messages.append({"role": "user", "content": message})
+        return messages
+
+    def complete_turn(self, topic: Topic, message: str, db: Session) -> str:
+        """Answer one chat turn. Changes to the topic's summary are left for the caller to commit."""
+        history = self._load_unsummarized_history(topic, db)
+
+        if self._history_tokens(topic, history) + estimate_tokens(message) > settings.CHAT_CONTEXT_MAX_TOKENS:
+            history = self._compact(topic, history)
+
+        messages = self._build_messages(topic, history, message)
+
+        started = time.perf_counter()
+        response = model_router.complete(
+            topic.tier,
+            TASK_CLARIFYING_QUESTION,
+            messages,
+            preferred_model=topic.model,
+            **CHAT_COMPLETION_ARGS,
+        )
+        latency_ms = int((time.perf_counter() - started) * 1000)
+
+        if not response or not response.choices:
+            raise Exception("Failed to get response from AI")
+
+        prompt_tokens = getattr(response.usage, "prompt_tokens", None)
+        print(f"Local chat turn for topic {topic.id}: prompt_tokens={prompt_tokens} latency_ms={latency_ms}")
+
+        return response.choices[0].message.content
@@ -1,9 +1,10 @@
 import json
+import time
 from datetime import datetime, timedelta
 
 from sqlalchemy.orm import Session
 from starlette import status
-from starlette.responses import JSONResponse
+from app.core.responses import JSONResponse
 from app.core.config import settings
 from mistralai import Mistral, SDKError
 
@@ -11,10 +12,24 @@ from app.db.session import SessionLocal
 from app.models.agent import Agent
 from app.models.topic import Topic
 from app.models.topic_chat import TopicChat
-from app.models.update import Update
 from app.models.user import User
 from app.utils.random_generator import generate_random_string
-from app.services.email_service import send_updates_email
+from app.services.connection_hub import connection_hub
+from app.services.digest_service import DELIVERY_DIGEST, DELIVERY_IMMEDIATE, delivery_mode
+from app.services.email_outbox_service import enqueue_email
+from app.services.email_service import render_updates_email
+from app.services.mistral.chat_context_service import (
+    ChatContextService,
+    CHAT_SUMMARIZER_INSTRUCTIONS,
+    CHAT_COMPLETION_ARGS,
+)
+from app.services.mistral.model_router import (
+    model_router,
+    DEFAULT_TIER,
+    TASK_CHUNK_SUMMARIZATION,
+    TASK_SERP_EXTRACTION,
+)
+from app.services.update_service import UpdateService
 from app.services.serpapi.search_serp import search_serp_with_topic_description
 from app.services.task_schedule.schedule_update_collection_service import (
     scheduler,
@@ -22,27 +37,53 @@ from app.services.task_schedule.schedule_update_collection_service import (
     schedule_topic_update_at,
 )
 
+chat_context_service = ChatContextService()
+update_service = UpdateService()
+
+SERP_AGENT_INSTRUCTIONS = (
+    "You are an assistant that receives two inputs: (1) a short textual description of a topic, "
+    "and (2) web search results about that topic (for example, raw JSON returned by SerpAPI's "
+    "Google Search API). Your job is to carefully read the search results and extract detailed, "
+    "relevant points about the topic.\n"
+    "Return ONLY a single JSON object with EXACTLY this structure: {"
+    "'topic': '<short topic title>', "
+    "'description': '<short restatement of the topic in your own words>', "
+    "'detailed_points': ["
+    "  { 'title': '<point title>', 'summary': '<2-4 sentence explanation>', 'source_url': '<url or null>', "
+    "'key_points': ['<short fact>', ...] },"
+    "  ..."
+    "]} .\n"
+    "Rules:\n"
+    "1. 'detailed_points' MUST be a JSON array where each element is an object with keys: 'title', 'summary', 'source_url', 'key_points'. "
+    "'key_points' is an array of 1-4 short strings.\n"
+    "2. Use ONLY information supported by the search results. Do NOT invent facts or sources.\n"
+    "3. Ignore results that are clearly off-topic or low quality.\n"
+    "4. All output MUST be valid JSON. No markdown, no comments, no multiple JSON objects, and no prose outside the JSON object."
+)
 
-class MistralConversationService:
-    def request_ai(self, prompt: str):
-        model = "mistral-large-2512"
+SERP_COMPLETION_ARGS = {
+    "temperature": 0.4,
+    "top_p": 0.95,
+}
 
-        client = Mistral(api_key=settings.MISTRAL_API_KEY)
 
-        chat_response = client.chat.complete(
-            model=model,
-            messages=[
+class MistralConversationService:
+    def request_ai(self, prompt: str, tier: str = DEFAULT_TIER, task: str = TASK_CHUNK_SUMMARIZATION):
+        chat_response = model_router.complete(
+            tier,
+            task,
+            [
                 {"role": "user", "content": f"{prompt}"}
             ]
         )
 
         return chat_response.choices[0].message.content
 
-    def request_ai_with_chunking(self, base_prompt: str, data: str, max_chars: int = 15000):
+    def request_ai_with_chunking(self, base_prompt: str, data: str, max_chars: int = 15000, tier: str = DEFAULT_TIER):
   
         if len(data) <= max_chars:
             full_prompt = base_prompt.replace("{DATA}", data)
-            return self.request_ai(full_prompt)
+            return self.request_ai(full_prompt, tier)
         
         chunks = []
         current_chunk = ""
@@ -65,7 +106,7 @@ class MistralConversationService:
             if len(chunks) > 1:
                 chunk_prompt += f"\n(Processing chunk {i+1} of {len(chunks)})"
             
-            result = self.request_ai(chunk_prompt)
+            result = self.request_ai(chunk_prompt, tier)
             results.append(result)
         
         return self._merge_chunked_results(results)
@@ -104,26 +145,8 @@ class MistralConversationService:
             model=model,
             description="A simple Agent to make summaries of chat.",
             name="Chat Summarizer Agent",
-            instructions="You are a chat summarizer agent. Your task is to take the 1st user message, then ask questions to clarify the users need and based"\
-                         " on conversation generate a summary of the "\
-                         "discussion so far. "\
-                         "Instructions to be strictly followed: "\
-                         "1. CRITICAL: Ask ONLY ONE question per response. Never ask multiple questions at once. "\
-                         "2. When asking a question, return ONLY a single JSON object like {'question': 'your question here'}. "\
-                         "When providing the final summary, return ONLY a single JSON object like {'summary': 'your summary here'}. "\
-                         "Return ONLY valid JSON. No prose. No markdown. No multiple JSON objects."\
-                         "3. The user will ask for updates on some topic. Ask relevant questions ONE AT A TIME to get more context about the user's topic. "\
-                         "4. Do NOT ask questions about the method or delivery format the user would want to receive updates."\
-                         "5. Build the conversation naturally by asking follow-up questions based on the user's previous responses. "\
-                         "6. Ask at least 3-5 questions total before providing the final summary. Take your time to gather comprehensive information."\
-                         "7. Questions should ONLY gather more context about the topic user wants updates on. Nothing else."\
-                         "8. Once you have enough information (after at least 3-5 exchanges), provide a concise summary that captures all key points discussed. The summary  should only include the topics description, dont start like The user want update on or some other starting, give the summary directly"\
-                         "9. REMEMBER: ONE question at a time. Never generate multiple question objects in a single response.",
-
-            completion_args={
-                "temperature": 0.8,
-                "top_p": 0.98,
-            }
+            instructions=CHAT_SUMMARIZER_INSTRUCTIONS,
+            completion_args=CHAT_COMPLETION_ARGS,
         )
 
         return description_creator_agent
@@ -154,18 +177,6 @@ class MistralConversationService:
                 result["errors"].append(msg)
                 return result
 
-            fixed_id = "ePscUwZlIHIdsfsgerseg235vdaYTVMM"
-            serp_agent_row = db.query(Agent).filter(Agent.id == fixed_id).first()
-            if not serp_agent_row:
-                msg = "SERP topic agent not found in DB; run /gen-agent/ first"
-                print(msg)
-                result["status"] = "missing_agent"
-                result["errors"].append(msg)
-                return result
-
-            api_key = settings.MISTRAL_API_KEY
-            client = Mistral(api_key)
-
             agent_input = json.dumps(
                 {
                     "topic_description": topic.description,
@@ -174,19 +185,24 @@ class MistralConversationService:
                 ensure_ascii=False,
             )
 
-            response = client.beta.conversations.start(
-                agent_id=serp_agent_row.agent_id,
-                inputs=agent_input,
+            response = model_router.complete(
+                topic.tier,
+                TASK_SERP_EXTRACTION,
+                [
+                    {"role": "system", "content": SERP_AGENT_INSTRUCTIONS},
+                    {"role": "user", "content": agent_input},
+                ],
+                **SERP_COMPLETION_ARGS,
             )
 
-            if not response or not getattr(response, "outputs", None):
+            if not response or not getattr(response, "choices", None):
                 msg = "SERP topic agent returned empty response"
                 print(msg)
                 result["status"] = "empty_agent_response"
                 result["errors"].append(msg)
                 return result
 
-            ai_result = response.outputs[0].content
+            ai_result = response.choices[0].message.content
             print("SERP topic agent result:")
             print(ai_result)
 
@@ -208,34 +224,43 @@ class MistralConversationService:
                 result["errors"].append(msg)
                 return result
 
-            batch_id = generate_random_string(32)
-
-            created_updates = []
-
-            for point in detailed_points:
-                if not isinstance(point, dict):
-                    continue
-
-                title = point.get("title")
-                summary = point.get("summary")
-                source_url = point.get("source_url")
-
-                update = Update(
-                    id=generate_random_string(32),
-                    associated_topic_id=topic.id,
-                    title=title if title is not None else None,
-                    batch_id=batch_id,
-                    author=None,
-                    summary=summary if summary is not None else None,
-                    source_url=source_url if source_url is not None else None,
-                    date=None,
-                    key_points=None,
-                    image_link=None,
+            points = [point for point in detailed_points if isinstance(point, dict)]
+            user = db.query(User).filter(User.id == topic.associated_user_id).first()
+            mode = delivery_mode(user)
+            try:
+                # Digest users hear about the batch from the digest job; everyone else is handled below.
+                created_updates, duplicate_count = update_service.persist_update_batch(
+                    topic.id,
+                    points,
+                    db,
+                    user_id=topic.associated_user_id,
+                    notified_at=None if mode == DELIVERY_DIGEST else int(time.time() * 1000),
                 )
-                db.add(update)
-                created_updates.append(update)
+            except Exception as insert_err:
+                db.rollback()
+                msg = f"Failed to insert SERP updates: {insert_err}"
+                print(msg)
+                result["status"] = "db_error"
+                result["errors"].append(msg)
+                return result
+
+            if duplicate_count:
+                print(f"Dropped {duplicate_count} near-duplicate updates for topic {topic.id}")
 
             if created_updates:
+                # Queued in the same transaction as the batch, so the email exists iff the updates do.
+                if mode == DELIVERY_IMMEDIATE:
+                    try:
+                        if user and user.email:
+                            topic_title = topic.title or topic.description or "your topic"
+                            enqueue_email(db, user.email, *render_updates_email(topic_title, created_updates))
+                        else:
+                            print("No user/email found for topic; skipping update email")
+                    except Exception as email_err:
+                        msg = f"Failed to queue updates email: {email_err}"
+                        print(msg)
+                        result["errors"].append(msg)
+
                 try:
                     db.commit()
                 except Exception as commit_err:
@@ -246,17 +271,12 @@ class MistralConversationService:
                     result["errors"].append(msg)
                     return result
 
-                try:
-                    user = db.query(User).filter(User.id == topic.associated_user_id).first()
-                    if user and user.email:
-                        topic_title = topic.title or topic.description or "your topic"
-                        send_updates_email(user.email, topic_title, created_updates)
-                    else:
-                        print("No user/email found for topic; skipping update email")
-                except Exception as email_err:
-                    msg = f"Failed to send updates email: {email_err}"
-                    print(msg)
-                    result["errors"].append(msg)
+                connection_hub.publish_threadsafe(topic.associated_user_id, {
+                    "type": "updates_available",
+                    "topic_id": topic.id,
+                    "batch_id": created_updates[0].batch_id,
+                    "count": len(created_updates),
+                })
 
                 result["status"] = "completed"
                 result["updates_created"] = created_updates
@@ -319,28 +339,8 @@ class MistralConversationService:
             model=model,
             description="Agent that reads web search results for a topic and extracts detailed, structured points.",
             name="Topic SERP Results Agent",
-            instructions=(
-                "You are an assistant that receives two inputs: (1) a short textual description of a topic, "
-                "and (2) web search results about that topic (for example, raw JSON returned by SerpAPI's "
-                "Google Search API). Your job is to carefully read the search results and extract detailed, "
-                "relevant points about the topic.\n"
-                "Return ONLY a single JSON object with EXACTLY this structure: {"
-                "'topic': '<short topic title>', "
-                "'description': '<short restatement of the topic in your own words>', "
-                "'detailed_points': ["
-                "  { 'title': '<point title>', 'summary': '<2-4 sentence explanation>', 'source_url': '<url or null>' },"
-                "  ..."
-                "]} .\n"
-                "Rules:\n"
-                "1. 'detailed_points' MUST be a JSON array where each element is an object with keys: 'title', 'summary', 'source_url'.\n"
-                "2. Use ONLY information supported by the search results. Do NOT invent facts or sources.\n"
-                "3. Ignore results that are clearly off-topic or low quality.\n"
-                "4. All output MUST be valid JSON. No markdown, no comments, no multiple JSON objects, and no prose outside the JSON object."
-            ),
-            completion_args={
-                "temperature": 0.4,
-                "top_p": 0.95,
-            }
+            instructions=SERP_AGENT_INSTRUCTIONS,
+            completion_args=SERP_COMPLETION_ARGS,
         )
 
         
@@ -406,7 +406,8 @@ class MistralConversationService:
                 id = generate_random_string(32),
                 associated_topic_id=topic_id,
                 chat_message=message,
-                sent_by_user=True
+                sent_by_user=True,
+                created_at=int(time.time() * 1000),
             )
             db.add(topic_chat_user)
 
@@ -414,7 +415,13 @@ class MistralConversationService:
             
             conversation_id= topic.ai_conversation_id
             ai_message = ""
-            if not conversation_id:
+            if settings.CHAT_CONTEXT_MODE == "local":
+                ai_message = chat_context_service.complete_turn(topic, message, db)
+
+                if not ai_message:
+                    raise Exception("Failed to get message from AI")
+
+            elif not conversation_id:
                
                 try:
                     agent= db.query(Agent).filter(Agent.model == topic.model).first()
@@ -537,7 +544,8 @@ class MistralConversationService:
                 id = generate_random_string(32),
                 associated_topic_id=topic_id,
                 chat_message=ai_message,
-                sent_by_user=False
+                sent_by_user=False,
+                created_at=int(time.time() * 1000),
             )
             db.add(topic_chat)
 
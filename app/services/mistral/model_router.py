@@ -0,0 +1,138 @@
+import threading
+import time
+from typing import List, Optional
+
+from mistralai import Mistral, SDKError
+
+from app.core.config import settings
+
+
+TASK_CLARIFYING_QUESTION = "clarifying_question"
+TASK_SERP_EXTRACTION = "serp_extraction"
+TASK_CHUNK_SUMMARIZATION = "chunk_summarization"
+
+DEFAULT_TIER = "free"
+
+# Models a user may pick for a topic, per tier. The picked model drives the clarifying chat.
+TIER_MODELS = {
+    "free": ["mistral-large-2512"],
+    "premium": ["mistral-large-2512"],
+    "pay_as_you_go": ["mistral-large-2512"],
+}
+
+# (tier, task) -> ordered model pool. The first model is preferred, the rest are
+# fallbacks used when the previous one is throttled or unavailable.
+MODEL_ROUTES = {
+    "free": {
+        TASK_CLARIFYING_QUESTION: ["mistral-large-2512", "mistral-small-latest"],
+        TASK_SERP_EXTRACTION: ["mistral-small-latest", "mistral-medium-latest"],
+        TASK_CHUNK_SUMMARIZATION: ["ministral-8b-latest", "mistral-small-latest"],
+    },
+    "premium": {
+        TASK_CLARIFYING_QUESTION: ["mistral-large-2512", "mistral-medium-latest"],
+        TASK_SERP_EXTRACTION: ["mistral-medium-latest", "mistral-large-2512"],
+        TASK_CHUNK_SUMMARIZATION: ["mistral-small-latest", "ministral-8b-latest"],
+    },
+    "pay_as_you_go": {
+        TASK_CLARIFYING_QUESTION: ["mistral-large-2512", "mistral-medium-latest"],
+        TASK_SERP_EXTRACTION: ["mistral-medium-latest", "mistral-large-2512"],
+        TASK_CHUNK_SUMMARIZATION: ["mistral-small-latest", "ministral-8b-latest"],
+    },
+}
+
+# USD per 1M (input, output) tokens, used for the per-route cost estimate.
+MODEL_PRICES = {
+    "mistral-large-2512": (0.5, 1.5),
+    "mistral-medium-latest": (0.4, 2.0),
+    "mistral-small-latest": (0.1, 0.3),
+    "ministral-8b-latest": (0.1, 0.1),
+}
+
+# Status codes after which the next model in the pool is tried.
+FALLBACK_STATUS_CODES = {429, 500, 502, 503, 504}
+
+
+def is_model_allowed(tier: str, model: str) -> bool:
+    return model in TIER_MODELS.get(tier, [])
+
+
+class ModelRouter:
+    """Routes a (tier, task) pair to a model pool and records latency and cost per route."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stats = {}
+
+    def models_for(self, tier: str, task: str, preferred_model: Optional[str] = None) -> List[str]:
+        routes = MODEL_ROUTES.get(tier) or MODEL_ROUTES[DEFAULT_TIER]
+        pool = list(routes[task])
+        if preferred_model and is_model_allowed(tier, preferred_model):
+            pool = [preferred_model] + [model for model in pool if model != preferred_model]
+        return pool
+
+    def complete(self, tier: str, task: str, messages: List[dict], preferred_model: Optional[str] = None, **completion_args):
+        client = Mistral(api_key=settings.MISTRAL_API_KEY)
+        models = self.models_for(tier, task, preferred_model)
+
+        last_error = None
+        for position, model in enumerate(models):
+            started = time.perf_counter()
+            try:
+                response = client.chat.complete(model=model, messages=messages, **completion_args)
+            except SDKError as e:
+                latency_ms = (time.perf_counter() - started) * 1000
+                self._record(tier, task, model, latency_ms, None, failed=True, fallback=position > 0)
+                if e.status_code not in FALLBACK_STATUS_CODES:
+                    raise e
+                print(f"Model {model} unavailable for {tier}/{task} ({e.status_code}); trying next in pool")
+                last_error = e
+                continue
+
+            latency_ms = (time.perf_counter() - started) * 1000
+            self._record(tier, task, model, latency_ms, getattr(response, "usage", None), failed=False, fallback=position > 0)
+            return response
+
+        raise Exception(f"All models failed for route {tier}/{task}: {last_error}")
+
+    def _record(self, tier: str, task: str, model: str, latency_ms: float, usage, failed: bool, fallback: bool) -> None:
+        prompt_tokens = getattr(usage, "prompt_tokens", None) or 0
+        completion_tokens = getattr(usage, "completion_tokens", None) or 0
+        input_price, output_price = MODEL_PRICES.get(model, (0.0, 0.0))
+        cost_usd = (prompt_tokens * input_price + completion_tokens * output_price) / 1_000_000
+
+        key = f"{tier}:{task}:{model}"
+        with self._lock:
+            stats = self._stats.setdefault(key, {
+                "tier": tier,
+                "task": task,
+                "model": model,
+                "calls": 0,
+                "failures": 0,
+                "fallback_calls": 0,
+                "total_latency_ms": 0.0,
+                "prompt_tokens": 0,
+                "completion_tokens": 0,
+                "cost_usd": 0.0,
+            })
+            stats["calls"] += 1
+            stats["failures"] += 1 if failed else 0
+            stats["fallback_calls"] += 1 if fallback else 0
+            stats["total_latency_ms"] += latency_ms
+            stats["prompt_tokens"] += prompt_tokens
+            stats["completion_tokens"] += completion_tokens
+            stats["cost_usd"] += cost_usd
+
+        print(
+            f"Model route {key}: latency_ms={int(latency_ms)} prompt_tokens={prompt_tokens} "
+            f"completion_tokens={completion_tokens} cost_usd={cost_usd:.6f} failed={failed}"
+        )
+
+    def snapshot(self) -> List[dict]:
+        with self._lock:
+            rows = [dict(stats) for stats in self._stats.values()]
+        for row in rows:
+            row["avg_latency_ms"] = round(row["total_latency_ms"] / row["calls"], 1) if row["calls"] else 0.0
+        return rows
+
+
+model_router = ModelRouter()
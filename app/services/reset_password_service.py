@@ -3,12 +3,12 @@ import random
 import time
 
 from fastapi import APIRouter, Depends, HTTPException
-from passlib.context import CryptContext
 from pydantic import BaseModel
 from sqlalchemy.orm import Session
 from starlette import status
+from starlette.concurrency import run_in_threadpool
 from app.utils.encryption import encrypt_data , decrypt_data
-from starlette.responses import JSONResponse
+from app.core.responses import JSONResponse
 from cryptography.fernet import Fernet
 import base64
 from Crypto.Cipher import AES
@@ -17,27 +17,17 @@ import hashlib
 
 from app.core.auth import get_current_user, create_jwt_token
 from app.core.config import settings
+from app.core.password_pool import PasswordPoolBusy, busy_response, password_pool
 from app.db.session import get_db
 from app.models.user import User
 from app.models.user_verification import UserVerification
-from app.services.email_service import send_email
+from app.services.email_outbox_service import enqueue_email
+from app.services.task_schedule.schedule_update_collection_service import wake_email_outbox
 from app.utils.random_generator import generate_random_string
 from app.utils.user_util import create_user_response
 
-try:
-    import bcrypt as _bcrypt  
-    _ = _bcrypt.__about__.__version__  
-    _BCRYPT_OK = True
-except Exception:
-    _BCRYPT_OK = False
-
-
-_pwd_schemes = ["bcrypt", "pbkdf2_sha256"] if _BCRYPT_OK else ["pbkdf2_sha256"]
-pwd_context = CryptContext(schemes=_pwd_schemes, deprecated="auto")
-
-
-def hash_password( password: str) -> str:
-    return pwd_context.hash(password)
+async def hash_password( password: str) -> str:
+    return await password_pool.hash(password)
 
 # def reset_password_with_access_token(new_password: str, old_password: str, current_user: dict, db: Session) -> JSONResponse:
 #     try:
@@ -81,7 +71,38 @@ def hash_password( password: str) -> str:
 #             status_code=500
 #         )
 
-def reset_password_with_reset_code(new_password: str, reset_password_code:str, current_user:dict, db: Session) ->JSONResponse:
+def _check_reset_code(reset_password_code: str, current_user: dict, db: Session):
+    """(user, user_verification) if the code is valid, otherwise the error response."""
+    user = db.query(User).filter(User.id == current_user["user_id"]).first()
+    if not user:
+        return JSONResponse(
+            status_code=404,
+            content={"message": "User not found."}
+        )
+
+    user_verification = db.query(UserVerification).filter(UserVerification.associated_user_id == user.id).first()
+    if user_verification is None:
+        return JSONResponse(content={"message":"Verification data not found, try again"}, status_code=404)
+
+    if str(user_verification.verification_code) != str(reset_password_code):
+        return JSONResponse(content={"message":"Invalid reset password code"}, status_code=400)
+
+    if user_verification.expire_at < int(time.time() * 1000):
+        return JSONResponse(content={"message":"Reset password code has expired, please request a new one"}, status_code=400)
+
+    return user, user_verification
+
+
+def _save_new_password(user: User, user_verification: UserVerification, hashed_password: str, db: Session) -> None:
+    user_verification.expire_at = int(time.time() * 1000)
+    user.hashed_password = hashed_password
+    db.add(user)
+    db.add(user_verification)
+    db.commit()
+    db.refresh(user)
+
+
+async def reset_password_with_reset_code(new_password: str, reset_password_code:str, current_user:dict, db: Session) ->JSONResponse:
     try:
 
         if len(new_password) < 8:
@@ -90,35 +111,20 @@ def reset_password_with_reset_code(new_password: str, reset_password_code:str, c
                 content={"success":"false", "message": "Password must be at least 8 characters long."}
             )
 
-        user = db.query(User).filter(User.id == current_user["user_id"]).first()
-        if not user:
-            return JSONResponse(
-                status_code=404,
-                content={"message": "User not found."}
-            )
+        checked = await run_in_threadpool(_check_reset_code, reset_password_code, current_user, db)
+        if isinstance(checked, JSONResponse):
+            return checked
+        user, user_verification = checked
 
-        user_verification = db.query(UserVerification).filter(UserVerification.associated_user_id == user.id).first()
-        if user_verification is None:
-            return JSONResponse(content={"message":"Verification data not found, try again"}, status_code=404)
-
-        if str(user_verification.verification_code) != str(reset_password_code):
-            return JSONResponse(content={"message":"Invalid reset password code"}, status_code=400)
-
-        if user_verification.expire_at < int(time.time() * 1000):
-            return JSONResponse(content={"message":"Reset password code has expired, please request a new one"}, status_code=400)
-
-        user_verification.expire_at = int(time.time() * 1000)
-        user.hashed_password = hash_password(new_password)
-        db.add(user)
-        db.add(user_verification)
-        db.commit()
-        db.refresh(user)
+        hashed_password = await hash_password(new_password)
+        await run_in_threadpool(_save_new_password, user, user_verification, hashed_password, db)
 
         return JSONResponse(content={"message" : "Password reset successfully"}, status_code=200)
 
-
+    except PasswordPoolBusy:
+        return busy_response()
     except Exception as e:
-        db.rollback()
+        await run_in_threadpool(db.rollback)
         return JSONResponse(content={"message" : e.__str__()}, status_code=500)
 
 
@@ -152,10 +158,12 @@ def send_password_reset_email(user_email:str, db:Session) ->JSONResponse:
 
         subject = "Password reset request"
         body = f"Your password reset code is: {code}. It will expire in 5 minutes."
-        send_email(user_email, subject, body)
         db.add(user_verification)
+        # Not worth delivering once the code in it has expired.
+        enqueue_email(db, user_email, subject, body, not_after=user_verification.expire_at)
         db.commit()
         db.refresh(user_verification)
+        wake_email_outbox()
         return JSONResponse(content={"message": "Password reset email sent successfully"}, status_code=200)
     except Exception as e:
         db.rollback()
@@ -0,0 +1,175 @@
+import queue
+import smtplib
+import threading
+import time
+from contextlib import contextmanager
+from email.message import EmailMessage
+from typing import Iterator, Optional
+
+
+def is_connection_error(error: BaseException) -> bool:
+    """True when the session itself is gone, as opposed to the server rejecting one message."""
+    if isinstance(error, (smtplib.SMTPServerDisconnected, smtplib.SMTPConnectError)):
+        return True
+    if isinstance(error, smtplib.SMTPResponseException):
+        # 421: service not available, closing transmission channel.
+        return error.smtp_code == 421
+    return isinstance(error, OSError) and not isinstance(error, smtplib.SMTPException)
+
+
+class _PooledConnection:
+    def __init__(self, server: smtplib.SMTP):
+        self.server = server
+        self.last_used = time.monotonic()
+        self.messages_sent = 0
+
+
+class SMTPConnectionPool:
+    """Keeps up to ``size`` logged-in SMTP sessions open and reuses them across messages.
+
+    Idle sessions are checked with NOOP before reuse once they have been idle for
+    ``health_check_after`` seconds, and dropped after ``max_idle`` seconds since most
+    servers time them out anyway. A send that fails because the session died is
+    retried once on a fresh connection.
+    """
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        username: Optional[str] = None,
+        password: Optional[str] = None,
+        use_tls: bool = True,
+        size: int = 4,
+        timeout: float = 30.0,
+        health_check_after: float = 30.0,
+        max_idle: float = 300.0,
+        max_messages_per_connection: int = 100,
+    ):
+        self.host = host
+        self.port = port
+        self.username = username
+        self.password = password
+        self.use_tls = use_tls
+        self.size = size
+        self.timeout = timeout
+        self.health_check_after = health_check_after
+        self.max_idle = max_idle
+        self.max_messages_per_connection = max_messages_per_connection
+
+        # LIFO keeps the most recently used (least likely to be timed out) session hot.
+        self._idle: "queue.LifoQueue[_PooledConnection]" = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(size)
+        self._lock = threading.Lock()
+        self.connections_opened = 0
+        self.reconnects = 0
+
+    def _open(self) -> _PooledConnection:
+        server = smtplib.SMTP(self.host, self.port, timeout=self.timeout)
+        try:
+            if self.use_tls:
+                server.starttls()
+            if self.username:
+                server.login(self.username, self.password or "")
+        except Exception:
+            self._close(server)
+            raise
+        with self._lock:
+            self.connections_opened += 1
+        return _PooledConnection(server)
+
+    @staticmethod
+    def _close(server: smtplib.SMTP) -> None:
+        try:
+            server.quit()
+        except Exception:
+            try:
+                server.close()
+            except Exception:
+                pass
+
+    def _is_healthy(self, connection: _PooledConnection) -> bool:
+        idle_for = time.monotonic() - connection.last_used
+        if idle_for > self.max_idle or connection.messages_sent >= self.max_messages_per_connection:
+            return False
+        if idle_for < self.health_check_after:
+            return True
+        try:
+            return connection.server.noop()[0] == 250
+        except Exception:
+            return False
+
+    def _checkout(self) -> _PooledConnection:
+        while True:
+            try:
+                connection = self._idle.get_nowait()
+            except queue.Empty:
+                return self._open()
+            if self._is_healthy(connection):
+                return connection
+            self._close(connection.server)
+
+    @contextmanager
+    def connection(self, fresh: bool = False) -> Iterator[_PooledConnection]:
+        """Borrow a session; it goes back to the pool unless the body raised a connection error.
+
+        ``fresh`` skips the idle sessions and opens a new one.
+        """
+        self._slots.acquire()
+        connection = None
+        try:
+            connection = self._open() if fresh else self._checkout()
+            yield connection
+        except Exception as e:
+            if connection is not None:
+                if is_connection_error(e) or not self._reset(connection):
+                    self._close(connection.server)
+                    connection = None
+            raise
+        finally:
+            if connection is not None:
+                connection.last_used = time.monotonic()
+                self._idle.put(connection)
+            self._slots.release()
+
+    @staticmethod
+    def _reset(connection: _PooledConnection) -> bool:
+        # A rejected message can leave a half-open transaction on the session.
+        try:
+            return connection.server.rset()[0] == 250
+        except Exception:
+            return False
+
+    def send_message(self, msg: EmailMessage) -> None:
+        try:
+            with self.connection() as connection:
+                connection.server.send_message(msg)
+                connection.messages_sent += 1
+            return
+        except Exception as e:
+            if not is_connection_error(e):
+                raise
+            with self._lock:
+                self.reconnects += 1
+
+        # The session died between the health check and the send. Sessions idle alongside it
+        # are likely gone too, so the retry goes to a new connection.
+        with self.connection(fresh=True) as connection:
+            connection.server.send_message(msg)
+            connection.messages_sent += 1
+
+    def close_all(self) -> None:
+        while True:
+            try:
+                connection = self._idle.get_nowait()
+            except queue.Empty:
+                return
+            self._close(connection.server)
+
+    def stats(self) -> dict:
+        return {
+            "size": self.size,
+            "idle": self._idle.qsize(),
+            "connections_opened": self.connections_opened,
+            "reconnects": self.reconnects,
+        }
@@ -4,8 +4,12 @@ from datetime import datetime, timedelta, timezone
 
 from apscheduler.schedulers.background import BackgroundScheduler
 
-from app.db.session import SessionLocal
+from app.core.config import settings
+from app.db.partitions import maintain_update_partitions
+from app.db.session import SessionLocal, engine
 from app.models.topic import Topic
+from app.services.digest_service import send_due_digests
+from app.services.email_outbox_service import drain_email_outbox, purge_sent_emails
 
 
 
@@ -18,6 +22,9 @@ if not scheduler.running:
 	scheduler.start()
 
 
+EMAIL_OUTBOX_JOB_ID = "email_outbox_drain"
+
+
 def get_session_for_job():
 
 	return SessionLocal()
@@ -65,6 +72,69 @@ def schedule_topic_update_at(topic_id: str, run_at_ms: int) -> None:
 		print(f"Failed to schedule topic update for {topic_id}: {e}")
 
 
+def schedule_update_maintenance() -> None:
+	"""Create upcoming update partitions and apply tier retention once a day, starting now."""
+	try:
+		scheduler.add_job(
+			maintain_update_partitions,
+			"interval",
+			hours=24,
+			args=[engine],
+			id="update_partition_maintenance",
+			next_run_time=datetime.now(tz=timezone.utc),
+			replace_existing=True,
+		)
+	except Exception as e:
+		print(f"Failed to schedule update partition maintenance: {e}")
+
+
+def schedule_email_outbox() -> None:
+	"""Drain the email outbox every few seconds and purge delivered rows once a day."""
+	try:
+		scheduler.add_job(
+			drain_email_outbox,
+			"interval",
+			seconds=settings.EMAIL_OUTBOX_POLL_SECONDS,
+			id=EMAIL_OUTBOX_JOB_ID,
+			max_instances=1,
+			coalesce=True,
+			replace_existing=True,
+		)
+		scheduler.add_job(
+			purge_sent_emails,
+			"interval",
+			hours=24,
+			id="email_outbox_purge",
+			replace_existing=True,
+		)
+	except Exception as e:
+		print(f"Failed to schedule email outbox worker: {e}")
+
+
+def schedule_digests() -> None:
+	"""Consolidate pending update batches into per-user digest emails every few minutes."""
+	try:
+		scheduler.add_job(
+			send_due_digests,
+			"interval",
+			minutes=settings.DIGEST_POLL_MINUTES,
+			id="update_digests",
+			max_instances=1,
+			coalesce=True,
+			replace_existing=True,
+		)
+	except Exception as e:
+		print(f"Failed to schedule update digests: {e}")
+
+
+def wake_email_outbox() -> None:
+	"""Run the outbox drain now instead of at the next poll, e.g. right after a verification email is queued."""
+	try:
+		scheduler.modify_job(EMAIL_OUTBOX_JOB_ID, next_run_time=datetime.now(tz=timezone.utc))
+	except Exception as e:
+		print(f"Failed to wake email outbox worker: {e}")
+
+
 def schedule_updates_from_db() -> None:
 	"""Schedule update cycles for all topics based on persisted next_update_time."""
 	db = SessionLocal()
@@ -1,25 +1,87 @@
+from typing import Optional
+
+from sqlalchemy import func, literal, tuple_
 from sqlalchemy.orm import Session
-from starlette.responses import JSONResponse
+from app.core.responses import JSONResponse
 
 from app.models.topic import Topic
 from app.models.topic_chat import TopicChat
+from app.utils.etag import etag_headers, etag_matches, make_etag, not_modified_response
+from app.utils.pagination import clamp_page_size, decode_cursor, encode_cursor
+
+
+CHAT_ORDERS = ("asc", "desc")
 
 
 class TopicChatService:
-    def get_topic_chat(self, topic_id:str, current_user: dict, db: Session):
-       try:
-           topic = db.query(Topic).filter(Topic.id == topic_id,
-                                          Topic.associated_user_id == current_user["user_id"]).first()
+    def get_topic_chat(
+        self,
+        topic_id: str,
+        current_user: dict,
+        db: Session,
+        if_none_match: Optional[str] = None,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
+        order: str = "asc",
+    ):
+        """Fetch one page of a topic's chat in (created_at, user message first, id) order,
+        the same order ChatContextService builds the model's context in.
+
+        ``order`` is "asc" (oldest first) or "desc" (newest first); ``cursor`` continues
+        from a previous ``next_cursor`` in the same order.
+        """
+        try:
+            if order not in CHAT_ORDERS:
+                return JSONResponse(content={"message": "order must be 'asc' or 'desc'"}, status_code=400)
+
+            page_size = clamp_page_size(limit)
+            try:
+                cursor_key = decode_cursor(cursor, tiebreaks=1) if cursor else None
+            except ValueError as e:
+                return JSONResponse(content={"message": str(e)}, status_code=400)
+
+            topic = db.query(Topic).filter(Topic.id == topic_id,
+                                           Topic.associated_user_id == current_user["user_id"]).first()
 
-           if not topic:
+            if not topic:
 
-               raise Exception("Topics not found")
+                raise Exception("Topics not found")
 
-           topic_chats = db.query(TopicChat).filter(TopicChat.associated_topic_id == topic_id).all()
+            chat_count, newest_created_at = (
+                db.query(func.count(TopicChat.id), func.max(TopicChat.created_at))
+                .filter(TopicChat.associated_topic_id == topic_id)
+                .one()
+            )
+            etag = make_etag(topic_id, chat_count, newest_created_at, page_size, cursor, order)
+            if etag_matches(if_none_match, etag):
+                return not_modified_response(etag)
 
-           topic_chat_jsons = []
+            query = db.query(TopicChat).filter(TopicChat.associated_topic_id == topic_id)
+            # Pairs written in one transaction share created_at and have random ids.
+            reply_after_user = ~TopicChat.sent_by_user
+            row_key = tuple_(TopicChat.created_at, reply_after_user, TopicChat.id)
+            if cursor_key:
+                created_at, is_reply, row_id = cursor_key
+                cursor_row = tuple_(literal(created_at), literal(bool(is_reply)), literal(row_id))
 
-           for topic_chat in topic_chats:
+            if order == "desc":
+                if cursor_key:
+                    query = query.filter(row_key < cursor_row)
+                query = query.order_by(TopicChat.created_at.desc(), reply_after_user.desc(), TopicChat.id.desc())
+            else:
+                if cursor_key:
+                    query = query.filter(row_key > cursor_row)
+                query = query.order_by(TopicChat.created_at.asc(), reply_after_user.asc(), TopicChat.id.asc())
+
+            topic_chats = query.limit(page_size + 1).all()
+            has_more = len(topic_chats) > page_size
+            topic_chats = topic_chats[:page_size]
+            last = topic_chats[-1] if topic_chats else None
+            next_cursor = encode_cursor(last.created_at, last.id, int(not last.sent_by_user)) if has_more else None
+
+            topic_chat_jsons = []
+
+            for topic_chat in topic_chats:
                 topic_chat_jsons.append({
                     "id": topic_chat.id,
                     "associated_topic_id": topic_chat.associated_topic_id,
@@ -28,12 +90,20 @@ class TopicChatService:
                     "created_at": topic_chat.created_at
                 })
 
+            return JSONResponse(
+                {
+                    "message": "Topic chats fetched successfully",
+                    "topic_chats": topic_chat_jsons,
+                    "next_cursor": next_cursor,
+                    "has_more": has_more,
+                },
+                status_code=200,
+                headers=etag_headers(etag),
+            )
 
-           return JSONResponse({"message": "Topic chats fetched successfully", "topic_chats": topic_chat_jsons}, status_code=200)
-
-       except Exception as e:
+        except Exception as e:
             print(f"Failed to fetch topic chats: {e}")
             return JSONResponse(
-            content={"message": e},
-            status_code=500
-            )
\ No newline at end of file
+                content={"message": str(e)},
+                status_code=500
+            )
@@ -1,9 +1,18 @@
+from typing import Optional
+
+from sqlalchemy import func
 from sqlalchemy.orm import Session
-from starlette.responses import JSONResponse
+from app.core.responses import JSONResponse
 
 from datetime import datetime
 
 from app.models.topic import Topic
+from app.models.topic_chat import TopicChat
+from app.models.update import Update
+from app.models.update_batch import UpdateBatch
+from app.models.update_fingerprint import UpdateFingerprint
+from app.services.mistral.model_router import TIER_MODELS, is_model_allowed
+from app.utils.etag import etag_headers, etag_matches, make_etag, not_modified_response
 from app.utils.random_generator import generate_random_string
 
 
@@ -17,32 +26,17 @@ class TopicService:
                     status_code=400,
                 )
 
-            if tier == "free":
-                if model != "mistral-large-2512":
-                    return JSONResponse(
-                        content={"message": "Invalid model for free tier"},
-                        status_code=400
-                    )
-            elif tier == "premium":
-                if model != "mistral-large-2512":
-                    return JSONResponse(
-                        content={"message": "Invalid model for free tier"},
-                        status_code=400
-                    )
-            elif tier== "pay_as_you_go":
-                if model != "mistral-large-2512":
-                    return JSONResponse(
-                        content={"message": "Invalid model for free tier"},
-                        status_code=400
-                    )
-            else:
+            if tier not in TIER_MODELS:
                 return JSONResponse(
                     content={"message": "Invalid tier specified"},
                     status_code=400
                 )
 
-# there is reason behind structuring the code like this, that is to allow easy expansion in future when more models are added for different tiers
-
+            if not is_model_allowed(tier, model):
+                return JSONResponse(
+                    content={"message": f"Invalid model for {tier} tier"},
+                    status_code=400
+                )
 
             new_topic = Topic(
                 id=generate_random_string(32),
@@ -84,8 +78,17 @@ class TopicService:
                 status_code=500
             )
 
-    def get_topics_for_user(self, authenticated_user_id:str, db: Session) -> JSONResponse:
+    def get_topics_for_user(self, authenticated_user_id:str, db: Session, if_none_match: Optional[str] = None) -> JSONResponse:
         try:
+            topic_count, newest_updated_at = (
+                db.query(func.count(Topic.id), func.max(Topic.updated_at))
+                .filter(Topic.associated_user_id == authenticated_user_id)
+                .one()
+            )
+            etag = make_etag(authenticated_user_id, topic_count, newest_updated_at)
+            if etag_matches(if_none_match, etag):
+                return not_modified_response(etag)
+
             topics = db.query(Topic).filter(Topic.associated_user_id == authenticated_user_id).all()
             topics_list = []
             for topic in topics:
@@ -103,7 +106,8 @@ class TopicService:
                     "message": "Topics fetched successfully",
                     "topics": topics_list
                 },
-                status_code=200
+                status_code=200,
+                headers=etag_headers(etag),
             )
         except Exception as e:
             print(f"Failed to fetch topics: {e}")
@@ -157,6 +161,9 @@ class TopicService:
                     status_code=404
                 )
 
+            for model in (Update, UpdateBatch, UpdateFingerprint, TopicChat):
+                db.query(model).filter(model.associated_topic_id == topic.id).delete(synchronize_session=False)
+
             db.delete(topic)
             db.commit()
 
@@ -186,46 +193,27 @@ class TopicService:
                 topic.title = topic_update["title"]
 
             if topic_update.get("tier") is not None and topic_update.get("tier") !="":
-                if topic_update.get("tier")=="free":
-                    topic.tier = "free"
-
-                elif topic_update.get("tier")=="premium":
-                    topic.tier = "premium"
-
-                elif topic_update.get("tier")=="pay_as_you_go":
-                    topic.tier = "pay_as_you_go"
-
-                else:
+                if topic_update.get("tier") not in TIER_MODELS:
                     return JSONResponse(
                         content={"message": "Invalid tier specified"},
                         status_code=400
                     )
 
+                topic.tier = topic_update["tier"]
+
             if topic_update.get("model") is not None and topic_update.get("model") !="":
-                if topic.tier == "free":
-                    if topic_update.get("model") == "ai-large-2512":
-                        topic.model = "ai-large-2512"
-                    else:
-                        return JSONResponse(
-                            content={"message": "Invalid model for free tier"},
-                            status_code=400
-                        )
-                elif topic.tier == "premium":
-                    if topic_update.get("model") == "ai-large-2512":
-                        topic.model = "ai-large-2512"
-                    else:
-                        return JSONResponse(
-                            content={"message": "Invalid model for premium tier"},
-                            status_code=400
-                        )
-                elif topic.tier == "pay-as-you-go":
-                    if topic_update.get("model") == "ai-large-2512":
-                        topic.model = "ai-large-2512"
-                    else:
-                        return JSONResponse(
-                            content={"message": "Invalid model for Pay As You Go tier"},
-                            status_code=400
-                        )
+                if not is_model_allowed(topic.tier, topic_update.get("model")):
+                    return JSONResponse(
+                        content={"message": f"Invalid model for {topic.tier} tier"},
+                        status_code=400
+                    )
+
+                topic.model = topic_update["model"]
+
+            elif topic_update.get("tier") and not is_model_allowed(topic.tier, topic.model):
+                # Tier changed without picking a model: move to the new tier's default
+                # rather than rejecting. Untouched topics keep whatever model they have.
+                topic.model = TIER_MODELS[topic.tier][0]
 
             if topic_update.get("update_frequency_hours") is not None and str(topic_update.get("update_frequency_hours")) != "":
                 try:
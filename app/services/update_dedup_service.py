@@ -0,0 +1,94 @@
+from typing import List, Tuple
+
+from sqlalchemy import or_
+from sqlalchemy.orm import Session
+
+from app.models.update_fingerprint import UpdateFingerprint
+from app.utils.fingerprint import (
+    from_signed64,
+    hamming_distance,
+    simhash64,
+    simhash_bands,
+    to_signed64,
+    url_hash,
+)
+
+# Max differing SimHash bits for two stories to count as the same one. Must stay
+# below the number of bands so the band lookup cannot miss a match.
+NEAR_DUPLICATE_DISTANCE = 3
+
+
+class UpdateDedupService:
+    """Drops points that repeat a story already stored for the topic, or earlier in the same batch."""
+
+    def fingerprint(self, point: dict) -> dict:
+        text = f"{point.get('title') or ''} {point.get('summary') or ''}"
+        value = simhash64(text)
+        bands = simhash_bands(value)
+        return {
+            "url_hash": url_hash(point.get("source_url")),
+            "simhash": value,
+            "bands": bands,
+        }
+
+    def _is_duplicate(self, fingerprint: dict, seen: List[Tuple[str, int]]) -> bool:
+        for seen_url_hash, seen_simhash in seen:
+            if fingerprint["url_hash"] and fingerprint["url_hash"] == seen_url_hash:
+                return True
+            if fingerprint["simhash"] and hamming_distance(fingerprint["simhash"], seen_simhash) <= NEAR_DUPLICATE_DISTANCE:
+                return True
+        return False
+
+    def _load_candidates(self, topic_id: str, fingerprints: List[dict], db: Session) -> List[Tuple[str, int]]:
+        url_hashes = {fp["url_hash"] for fp in fingerprints if fp["url_hash"]}
+        conditions = []
+        if url_hashes:
+            conditions.append(UpdateFingerprint.url_hash.in_(url_hashes))
+        for band, column in enumerate((
+            UpdateFingerprint.band0,
+            UpdateFingerprint.band1,
+            UpdateFingerprint.band2,
+            UpdateFingerprint.band3,
+        )):
+            values = {fp["bands"][band] for fp in fingerprints if fp["simhash"]}
+            if values:
+                conditions.append(column.in_(values))
+
+        if not conditions:
+            return []
+
+        rows = (
+            db.query(UpdateFingerprint.url_hash, UpdateFingerprint.simhash)
+            .filter(UpdateFingerprint.associated_topic_id == topic_id, or_(*conditions))
+            .all()
+        )
+        return [(row_url_hash, from_signed64(row_simhash)) for row_url_hash, row_simhash in rows]
+
+    def filter_new_points(self, topic_id: str, points: List[dict], db: Session) -> Tuple[List[Tuple[dict, dict]], int]:
+        """Return (point, fingerprint) pairs worth inserting and the number of dropped duplicates."""
+        fingerprints = [self.fingerprint(point) for point in points]
+        seen = self._load_candidates(topic_id, fingerprints, db)
+
+        kept = []
+        dropped = 0
+        for point, fingerprint in zip(points, fingerprints):
+            if self._is_duplicate(fingerprint, seen):
+                dropped += 1
+                continue
+            kept.append((point, fingerprint))
+            seen.append((fingerprint["url_hash"], fingerprint["simhash"]))
+
+        return kept, dropped
+
+    def fingerprint_values(self, update_id: str, topic_id: str, fingerprint: dict) -> dict:
+        band0, band1, band2, band3 = fingerprint["bands"]
+        return {
+            "id": update_id,
+            "associated_topic_id": topic_id,
+            "url_hash": fingerprint["url_hash"],
+            "simhash": to_signed64(fingerprint["simhash"]),
+            "band0": band0,
+            "band1": band1,
+            "band2": band2,
+            "band3": band3,
+        }
@@ -1,17 +1,152 @@
-from typing import List
+from typing import List, Optional, Tuple
 
+from sqlalchemy import func, insert, tuple_
 from sqlalchemy.orm import Session
-from starlette.responses import JSONResponse
+from app.core.responses import JSONResponse
 
 from app.models.topic import Topic
 from app.models.update import Update
+from app.models.update_batch import UpdateBatch
+from app.models.update_fingerprint import UpdateFingerprint
+from app.services.update_dedup_service import UpdateDedupService
+from app.utils.etag import etag_headers, etag_matches, make_etag, not_modified_response
+from app.utils.pagination import (
+	DEFAULT_BATCH_PAGE_SIZE,
+	MAX_BATCH_PAGE_SIZE,
+	MAX_OFFSET,
+	clamp_offset,
+	clamp_page_size,
+	decode_cursor,
+	encode_cursor,
+)
+from app.utils.random_generator import generate_random_string
+
+
+def _update_to_dict(update: Update) -> dict:
+	return {
+		"id": update.id,
+		"associated_topic_id": update.associated_topic_id,
+		"title": update.title,
+		"batch_id": update.batch_id,
+		"author": update.author,
+		"summary": update.summary,
+		"source_url": update.source_url,
+		"date": update.date,
+		"key_points": update.key_points if isinstance(update.key_points, list) else [],
+		"image_link": update.image_link,
+		"created_at": update.created_at,
+	}
+
+
+def _clean_key_points(value) -> Optional[List[str]]:
+	if not isinstance(value, list):
+		return None
+	return [str(key_point) for key_point in value if key_point] or None
 
 
 class UpdateService:
 
-	def get_updates_for_topic(self, topic_id: str, authenticated_user_id: str, db: Session) -> JSONResponse:
-		"""Fetch all updates for a topic, ensuring the topic belongs to the user."""
+	def __init__(self):
+		self.dedup_service = UpdateDedupService()
+
+	def bulk_insert_updates(self, rows: List[dict], db: Session) -> List[Update]:
+		"""Insert Update rows with multi-row INSERT ... RETURNING instead of one unit-of-work entry each.
+
+		Each row dict must already carry its id and batch_id. The returned objects are in the same
+		order as ``rows`` and are detached, so the caller's commit does not expire them.
+		"""
+		if not rows:
+			return []
+
+		updates = list(db.scalars(insert(Update).returning(Update, sort_by_parameter_order=True), rows))
+		for update in updates:
+			db.expunge(update)
+		return updates
+
+	def persist_update_batch(
+		self,
+		topic_id: str,
+		points: List[dict],
+		db: Session,
+		user_id: Optional[str] = None,
+		notified_at: Optional[int] = None,
+	) -> Tuple[List[Update], int]:
+		"""Dedupe and bulk insert one enrichment batch. Returns (created updates, dropped duplicates).
+
+		Used by both manual and scheduled collection; the caller owns the commit. A batch saved
+		with ``user_id`` and no ``notified_at`` waits for that user's next digest.
+		"""
+		new_points, duplicate_count = self.dedup_service.filter_new_points(topic_id, points, db)
+		if not new_points:
+			return [], duplicate_count
+
+		batch_id = generate_random_string(32)
+		update_rows = []
+		fingerprint_rows = []
+		for point, fingerprint in new_points:
+			update_id = generate_random_string(32)
+			update_rows.append(
+				{
+					"id": update_id,
+					"associated_topic_id": topic_id,
+					"title": point.get("title"),
+					"batch_id": batch_id,
+					"author": None,
+					"summary": point.get("summary"),
+					"source_url": point.get("source_url"),
+					"date": None,
+					"key_points": _clean_key_points(point.get("key_points")),
+					"image_link": None,
+				}
+			)
+			fingerprint_rows.append(self.dedup_service.fingerprint_values(update_id, topic_id, fingerprint))
+
+		updates = self.bulk_insert_updates(update_rows, db)
+		db.execute(insert(UpdateFingerprint), fingerprint_rows)
+
+		created_at_values = [update.created_at for update in updates]
+		db.add(
+			UpdateBatch(
+				id=batch_id,
+				associated_topic_id=topic_id,
+				associated_user_id=user_id,
+				update_count=len(updates),
+				oldest_created_at=min(created_at_values),
+				newest_created_at=max(created_at_values),
+				notified_at=notified_at,
+			)
+		)
+		return updates, duplicate_count
+
+	def get_updates_for_topic(
+		self,
+		topic_id: str,
+		authenticated_user_id: str,
+		db: Session,
+		limit: Optional[int] = None,
+		cursor: Optional[str] = None,
+		since: Optional[str] = None,
+		key_point: Optional[str] = None,
+		if_none_match: Optional[str] = None,
+	) -> JSONResponse:
+		"""Fetch one page of a topic's updates, newest first, ensuring the topic belongs to the user.
+
+		``cursor`` continues to older rows from a previous ``next_cursor``. ``since`` returns
+		only rows newer than a previous ``latest_cursor``, for clients that poll. ``key_point``
+		keeps rows whose key_points array contains that exact entry. A matching
+		``if_none_match`` gets a 304 before any update row is loaded.
+		"""
 		try:
+			page_size = clamp_page_size(limit)
+			try:
+				cursor_key = decode_cursor(cursor) if cursor else None
+				since_key = decode_cursor(since) if since else None
+			except ValueError as e:
+				return JSONResponse(
+					content={"message": str(e)},
+					status_code=400,
+				)
+
 			topic = (
 				db.query(Topic)
 				.filter(
@@ -27,48 +162,65 @@ class UpdateService:
 					status_code=404,
 				)
 
-			updates: List[Update] = (
-				db.query(Update)
-				.filter(Update.associated_topic_id == topic_id)
-				.order_by(Update.created_at.desc())
-				.all()
+			# Versioned from the small batch summary table so polling never scans update partitions.
+			batch_count, update_count, newest_created_at = (
+				db.query(
+					func.count(UpdateBatch.id),
+					func.coalesce(func.sum(UpdateBatch.update_count), 0),
+					func.max(UpdateBatch.newest_created_at),
+				)
+				.filter(UpdateBatch.associated_topic_id == topic_id)
+				.one()
 			)
+			etag = make_etag(topic_id, batch_count, update_count, newest_created_at, page_size, cursor, since, key_point)
+			if etag_matches(if_none_match, etag):
+				return not_modified_response(etag)
+
+			query = db.query(Update).filter(Update.associated_topic_id == topic_id)
+			if key_point:
+				query = query.filter(Update.key_points.contains([key_point]))
+
+			row_key = tuple_(Update.created_at, Update.id)
 
-			updates_list = []
-			for update in updates:
-				key_points_value = []
-				if update.key_points:
-					try:
-						import json
-
-						parsed = json.loads(update.key_points)
-						if isinstance(parsed, list):
-							key_points_value = parsed
-					except Exception:
-						key_points_value = []
-
-				updates_list.append(
-					{
-						"id": update.id,
-						"associated_topic_id": update.associated_topic_id,
-						"title": update.title,
-						"batch_id": update.batch_id,
-						"author": update.author,
-						"summary": update.summary,
-						"source_url": update.source_url,
-						"date": update.date,
-						"key_points": key_points_value,
-						"image_link": update.image_link,
-						"created_at": update.created_at,
-					}
+			if since_key:
+				# Oldest-first so repeated polling never skips rows when more than a page arrived.
+				updates: List[Update] = (
+					query.filter(Update.created_at >= since_key[0], row_key > tuple_(*since_key))
+					.order_by(Update.created_at.asc(), Update.id.asc())
+					.limit(page_size + 1)
+					.all()
 				)
+				has_more = len(updates) > page_size
+				updates = updates[:page_size]
+				latest = updates[-1] if updates else None
+				updates.reverse()
+				next_cursor = None
+				latest_cursor = encode_cursor(latest.created_at, latest.id) if latest else since
+			else:
+				if cursor_key:
+					# The plain created_at bound lets Postgres prune partitions; the row comparison can't.
+					query = query.filter(Update.created_at <= cursor_key[0], row_key < tuple_(*cursor_key))
+
+				updates = (
+					query.order_by(Update.created_at.desc(), Update.id.desc())
+					.limit(page_size + 1)
+					.all()
+				)
+				has_more = len(updates) > page_size
+				updates = updates[:page_size]
+				next_cursor = encode_cursor(updates[-1].created_at, updates[-1].id) if has_more else None
+				latest_cursor = encode_cursor(updates[0].created_at, updates[0].id) if updates and not cursor_key else None
 
 			return JSONResponse(
 				content={
 					"message": "Updates fetched successfully",
-					"updates": updates_list,
+					"updates": [_update_to_dict(update) for update in updates],
+					"next_cursor": next_cursor,
+					"latest_cursor": latest_cursor,
+					"has_more": has_more,
 				},
 				status_code=200,
+				headers=etag_headers(etag),
 			)
 		except Exception as e:
 			print(f"Failed to fetch updates: {e}")
@@ -77,3 +229,183 @@ class UpdateService:
 				status_code=500,
 			)
 
+	def get_update_batches_for_topic(
+		self,
+		topic_id: str,
+		authenticated_user_id: str,
+		db: Session,
+		limit: Optional[int] = None,
+		cursor: Optional[str] = None,
+		if_none_match: Optional[str] = None,
+	) -> JSONResponse:
+		"""Fetch the topic's latest batches with their updates grouped under each one.
+
+		Batches are listed from the update_batches summary table, so only the updates of the
+		returned batches are read.
+		"""
+		try:
+			page_size = clamp_page_size(limit, DEFAULT_BATCH_PAGE_SIZE, MAX_BATCH_PAGE_SIZE)
+			try:
+				cursor_key = decode_cursor(cursor) if cursor else None
+			except ValueError as e:
+				return JSONResponse(
+					content={"message": str(e)},
+					status_code=400,
+				)
+
+			topic = (
+				db.query(Topic)
+				.filter(
+					Topic.id == topic_id,
+					Topic.associated_user_id == authenticated_user_id,
+				)
+				.first()
+			)
+
+			if not topic:
+				return JSONResponse(
+					content={"message": "Topic not found"},
+					status_code=404,
+				)
+
+			batch_count, newest_created_at = (
+				db.query(func.count(UpdateBatch.id), func.max(UpdateBatch.newest_created_at))
+				.filter(UpdateBatch.associated_topic_id == topic_id)
+				.one()
+			)
+			etag = make_etag(topic_id, batch_count, newest_created_at, page_size, cursor)
+			if etag_matches(if_none_match, etag):
+				return not_modified_response(etag)
+
+			query = db.query(UpdateBatch).filter(UpdateBatch.associated_topic_id == topic_id)
+			if cursor_key:
+				query = query.filter(tuple_(UpdateBatch.newest_created_at, UpdateBatch.id) < tuple_(*cursor_key))
+
+			batches: List[UpdateBatch] = (
+				query.order_by(UpdateBatch.newest_created_at.desc(), UpdateBatch.id.desc())
+				.limit(page_size + 1)
+				.all()
+			)
+			has_more = len(batches) > page_size
+			batches = batches[:page_size]
+
+			updates_by_batch = {batch.id: [] for batch in batches}
+			if batches:
+				updates = (
+					db.query(Update)
+					.filter(
+						Update.associated_topic_id == topic_id,
+						Update.batch_id.in_(list(updates_by_batch)),
+						Update.created_at >= min(batch.oldest_created_at for batch in batches),
+						Update.created_at <= max(batch.newest_created_at for batch in batches),
+					)
+					.order_by(Update.created_at.desc(), Update.id.desc())
+					.all()
+				)
+				for update in updates:
+					updates_by_batch[update.batch_id].append(_update_to_dict(update))
+
+			batches_list = [
+				{
+					"batch_id": batch.id,
+					"update_count": batch.update_count,
+					"newest_created_at": batch.newest_created_at,
+					"oldest_created_at": batch.oldest_created_at,
+					"updates": updates_by_batch[batch.id],
+				}
+				for batch in batches
+			]
+			next_cursor = encode_cursor(batches[-1].newest_created_at, batches[-1].id) if has_more else None
+
+			return JSONResponse(
+				content={
+					"message": "Update batches fetched successfully",
+					"batches": batches_list,
+					"next_cursor": next_cursor,
+					"has_more": has_more,
+				},
+				status_code=200,
+				headers=etag_headers(etag),
+			)
+		except Exception as e:
+			print(f"Failed to fetch update batches: {e}")
+			return JSONResponse(
+				content={"message": "Failed to fetch update batches"},
+				status_code=500,
+			)
+
+	def search_updates(
+		self,
+		authenticated_user_id: str,
+		query_text: str,
+		db: Session,
+		limit: Optional[int] = None,
+		offset: Optional[int] = None,
+		topic_id: Optional[str] = None,
+	) -> JSONResponse:
+		"""Ranked full-text search over title and summary across all of the user's topics."""
+		try:
+			if not query_text or not query_text.strip():
+				return JSONResponse(
+					content={"message": "Search query is required"},
+					status_code=400,
+				)
+
+			page_size = clamp_page_size(limit)
+			try:
+				page_offset = clamp_offset(offset)
+			except ValueError as e:
+				return JSONResponse(
+					content={"message": str(e)},
+					status_code=400,
+				)
+
+			ts_query = func.websearch_to_tsquery("english", query_text.strip())
+			rank = func.ts_rank_cd(Update.search_vector, ts_query).label("rank")
+
+			query = (
+				db.query(Update, rank)
+				.join(Topic, Topic.id == Update.associated_topic_id)
+				.filter(
+					Topic.associated_user_id == authenticated_user_id,
+					Update.search_vector.op("@@")(ts_query),
+				)
+			)
+			if topic_id:
+				query = query.filter(Update.associated_topic_id == topic_id)
+
+			rows = (
+				query.order_by(rank.desc(), Update.created_at.desc(), Update.id.desc())
+				.offset(page_offset)
+				.limit(page_size + 1)
+				.all()
+			)
+			has_more = len(rows) > page_size
+			rows = rows[:page_size]
+
+			results = []
+			for update, update_rank in rows:
+				result = _update_to_dict(update)
+				result["rank"] = float(update_rank)
+				results.append(result)
+
+			# Offsets stop at MAX_OFFSET; past it the client is asked to narrow the query instead.
+			if page_offset + page_size > MAX_OFFSET:
+				has_more = False
+			next_offset = page_offset + page_size if has_more else None
+
+			return JSONResponse(
+				content={
+					"message": "Updates searched successfully",
+					"updates": results,
+					"next_offset": next_offset,
+					"has_more": has_more,
+				},
+				status_code=200,
+			)
+		except Exception as e:
+			print(f"Failed to search updates: {e}")
+			return JSONResponse(
+				content={"message": "Failed to search updates"},
+				status_code=500,
+			)
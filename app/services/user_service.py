@@ -1,9 +1,14 @@
+from typing import Optional
+
 from sqlalchemy.orm import Session
-from starlette.responses import JSONResponse
+from app.core.auth import invalidate_verified_user
+from app.core.responses import JSONResponse
 
 from app.utils.user_util import create_user_response
 from app.db.session import get_db
+from app.core.config import settings
 from app.models.user import User
+from app.services.digest_service import DELIVERY_MODES, delivery_mode, digest_window_minutes
 
 
 def get_user_by_id(user_id: str, db: Session) -> JSONResponse:
@@ -87,6 +92,7 @@ def delete_user_account(current_user: dict, db: Session) -> JSONResponse:
 
         db.delete(user)
         db.commit()
+        invalidate_verified_user(user.id)
 
         return JSONResponse(
             content={"message": "User account deleted successfully"},
@@ -99,4 +105,89 @@ def delete_user_account(current_user: dict, db: Session) -> JSONResponse:
         return JSONResponse(
             content={"message": "Failed to delete user account"},
             status_code=500
-        )
\ No newline at end of file
+        )
+
+def _digest_preferences(user: User) -> dict:
+    return {
+        "digest_mode": delivery_mode(user),
+        "digest_window_minutes": digest_window_minutes(user),
+    }
+
+
+def get_digest_preferences(current_user: dict, db: Session) -> JSONResponse:
+    try:
+        user = db.query(User).filter(User.id == current_user["user_id"]).first()
+
+        if not user:
+            return JSONResponse(
+                content={"message": "User not found"},
+                status_code=404
+            )
+
+        return JSONResponse(
+            content={
+                "message": "Digest preferences fetched successfully",
+                "preferences": _digest_preferences(user)
+            },
+            status_code=200
+        )
+
+    except Exception as e:
+        print(e)
+        return JSONResponse(
+            content={"message": "Failed to fetch digest preferences"},
+            status_code=500
+        )
+
+
+def update_digest_preferences(digest_mode: Optional[str], window_minutes: Optional[int], current_user: dict, db: Session) -> JSONResponse:
+    try:
+        if digest_mode is not None and digest_mode not in DELIVERY_MODES:
+            return JSONResponse(
+                content={"message": f"digest_mode must be one of: {', '.join(DELIVERY_MODES)}"},
+                status_code=400
+            )
+
+        if window_minutes is not None and not (
+            settings.DIGEST_MIN_WINDOW_MINUTES <= window_minutes <= settings.DIGEST_MAX_WINDOW_MINUTES
+        ):
+            return JSONResponse(
+                content={
+                    "message": f"digest_window_minutes must be between {settings.DIGEST_MIN_WINDOW_MINUTES} "
+                               f"and {settings.DIGEST_MAX_WINDOW_MINUTES}"
+                },
+                status_code=400
+            )
+
+        user = db.query(User).filter(User.id == current_user["user_id"]).first()
+
+        if not user:
+            return JSONResponse(
+                content={"message": "User not found"},
+                status_code=404
+            )
+
+        if digest_mode is not None:
+            user.digest_mode = digest_mode
+        if window_minutes is not None:
+            user.digest_window_minutes = window_minutes
+
+        db.add(user)
+        db.commit()
+        db.refresh(user)
+
+        return JSONResponse(
+            content={
+                "message": "Digest preferences updated successfully",
+                "preferences": _digest_preferences(user)
+            },
+            status_code=200
+        )
+
+    except Exception as e:
+        db.rollback()
+        print(e)
+        return JSONResponse(
+            content={"message": "Failed to update digest preferences"},
+            status_code=500
+        )
@@ -1,6 +1,8 @@
 from fastapi import Depends
-from starlette.responses import JSONResponse
-from app.services.email_service import send_email
+from app.core.auth import invalidate_verified_user
+from app.core.responses import JSONResponse
+from app.services.email_outbox_service import enqueue_email
+from app.services.task_schedule.schedule_update_collection_service import wake_email_outbox
 import random
 from app.models.user_verification import UserVerification
 from app.models.user import User
@@ -33,10 +35,12 @@ def send_verification_email(to_email: str, user_id_in_context: str, db: Session
 
         subject = "Verify Your Neuraletter Account"
         body = f"Your verification code is: {code}. It will expire in 5 minutes."
-        send_email(to_email, subject, body)
         db.add(user_verification)
+        # Not worth delivering once the code in it has expired.
+        enqueue_email(db, to_email, subject, body, not_after=user_verification.expire_at)
         db.commit()
         db.refresh(user_verification)
+        wake_email_outbox()
         return JSONResponse(content={"message":"Verification email sent successfully"}, status_code=200)
     except Exception as e:
         db.rollback()
@@ -65,6 +69,7 @@ def verify_code(user_id_in_context: str, code: int, db: Session ) -> JSONRespons
         user.is_verified = True
         user_verification.expire_at = int(time.time() * 1000)  
         db.commit()
+        invalidate_verified_user(user.id)
         db.refresh(user)
         db.refresh(user_verification)
 
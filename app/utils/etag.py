@@ -0,0 +1,31 @@
+import hashlib
+from typing import Optional
+
+from starlette.responses import Response
+
+
+def make_etag(*parts) -> str:
+    """Weak ETag over cheap version parts such as row counts and max timestamps."""
+    raw = "|".join("" if part is None else str(part) for part in parts)
+    return f'W/"{hashlib.sha1(raw.encode()).hexdigest()}"'
+
+
+def _opaque_tag(tag: str) -> str:
+    tag = tag.strip()
+    return tag[2:] if tag.startswith("W/") else tag
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    candidates = {_opaque_tag(tag) for tag in if_none_match.split(",")}
+    return "*" in candidates or _opaque_tag(etag) in candidates
+
+
+def etag_headers(etag: str) -> dict:
+    # Clients may keep the body but must revalidate it on every poll.
+    return {"ETag": etag, "Cache-Control": "private, no-cache"}
+
+
+def not_modified_response(etag: str) -> Response:
+    return Response(status_code=304, headers=etag_headers(etag))
@@ -0,0 +1,90 @@
+import hashlib
+import re
+from typing import List, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+SIMHASH_BITS = 64
+SIMHASH_BANDS = 4
+_BAND_BITS = SIMHASH_BITS // SIMHASH_BANDS
+_BAND_MASK = (1 << _BAND_BITS) - 1
+
+_TRACKING_PARAMS = {"fbclid", "gclid", "igshid", "mc_cid", "mc_eid", "ref", "ref_src", "cmpid", "ocid"}
+_WORD_RE = re.compile(r"[a-z0-9]+")
+_STOPWORDS = {
+    "a", "an", "and", "are", "as", "at", "be", "by", "for", "from", "has", "have", "in", "is", "it",
+    "its", "of", "on", "or", "that", "the", "this", "to", "was", "were", "will", "with",
+}
+
+
+def canonicalize_url(url: Optional[str]) -> Optional[str]:
+    """Normalise a source URL so the same article from different links compares equal."""
+    if not url or not str(url).strip():
+        return None
+    try:
+        parts = urlsplit(str(url).strip())
+    except ValueError:
+        return None
+
+    host = (parts.hostname or "").lower()
+    if host.startswith("www."):
+        host = host[4:]
+    if parts.port and parts.port not in (80, 443):
+        host = f"{host}:{parts.port}"
+
+    query = sorted(
+        (key, value)
+        for key, value in parse_qsl(parts.query, keep_blank_values=False)
+        if not key.lower().startswith("utm_") and key.lower() not in _TRACKING_PARAMS
+    )
+    path = parts.path.rstrip("/") or "/"
+
+    # Scheme and fragment are dropped: http/https and #anchors point at the same story.
+    return urlunsplit(("", host, path, urlencode(query), ""))
+
+
+def url_hash(url: Optional[str]) -> Optional[str]:
+    canonical = canonicalize_url(url)
+    if canonical is None:
+        return None
+    return hashlib.sha1(canonical.encode()).hexdigest()
+
+
+def _feature_hash(feature: str) -> int:
+    return int.from_bytes(hashlib.blake2b(feature.encode(), digest_size=8).digest(), "big")
+
+
+def simhash64(text: Optional[str]) -> int:
+    """64-bit SimHash over content words. Lightly reworded copies land a few bits apart."""
+    features = [word for word in _WORD_RE.findall((text or "").lower()) if word not in _STOPWORDS]
+    if not features:
+        return 0
+
+    weights = [0] * SIMHASH_BITS
+    for feature in features:
+        hashed = _feature_hash(feature)
+        for bit in range(SIMHASH_BITS):
+            weights[bit] += 1 if hashed >> bit & 1 else -1
+
+    value = 0
+    for bit, weight in enumerate(weights):
+        if weight > 0:
+            value |= 1 << bit
+    return value
+
+
+def hamming_distance(a: int, b: int) -> int:
+    return ((a ^ b) & ((1 << SIMHASH_BITS) - 1)).bit_count()
+
+
+def simhash_bands(value: int) -> List[int]:
+    """Split a SimHash into bands; two hashes within SIMHASH_BANDS - 1 bits share at least one band."""
+    return [(value >> (band * _BAND_BITS)) & _BAND_MASK for band in range(SIMHASH_BANDS)]
+
+
+def to_signed64(value: int) -> int:
+    """Fit an unsigned 64-bit hash into a Postgres BIGINT."""
+    return value - (1 << 64) if value >= 1 << 63 else value
+
+
+def from_signed64(value: int) -> int:
+    return value + (1 << 64) if value < 0 else value
@@ -0,0 +1,43 @@
+import base64
+import json
+from typing import Optional, Tuple
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+MAX_OFFSET = 1000
+DEFAULT_BATCH_PAGE_SIZE = 10
+MAX_BATCH_PAGE_SIZE = 50
+
+
+def clamp_page_size(limit: Optional[int], default: int = DEFAULT_PAGE_SIZE, maximum: int = MAX_PAGE_SIZE) -> int:
+    if limit is None:
+        return default
+    return max(1, min(int(limit), maximum))
+
+
+def clamp_offset(offset: Optional[int]) -> int:
+    """Raises ValueError for an offset past MAX_OFFSET instead of quietly serving a different page."""
+    if offset is None:
+        return 0
+    if int(offset) > MAX_OFFSET:
+        raise ValueError(f"offset must not exceed {MAX_OFFSET}")
+    return max(0, int(offset))
+
+
+def encode_cursor(created_at: int, row_id: str, *tiebreak: int) -> str:
+    """``tiebreak`` values sit between created_at and the id in the keyset order."""
+    raw = json.dumps([int(created_at), *[int(value) for value in tiebreak], row_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, tiebreaks: int = 0) -> Tuple:
+    """Decode a cursor produced by encode_cursor with ``tiebreaks`` tiebreak values into
+    (created_at, *tiebreak, row_id). Raises ValueError if it is malformed."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()).decode())
+        if len(values) != 2 + tiebreaks:
+            raise ValueError
+        return (int(values[0]), *[int(value) for value in values[1:-1]], str(values[-1]))
+    except Exception:
+        raise ValueError("Invalid cursor")
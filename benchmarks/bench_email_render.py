@@ -0,0 +1,121 @@
+"""CPU spent rendering digest emails of 1 to 500 updates.
+
+Compares the old f-string renderer (copied below, unescaped) with
+app.services.email_templates: once with a cold fragment cache, the cost of the
+first digest that mentions each story, and once warm, the cost for every later
+digest that shares those stories. The last section renders the same stories
+into many users' digests and reports how many fragments were actually built.
+
+    python -m benchmarks.bench_email_render --items 1 10 50 100 500 --topics 5
+"""
+import argparse
+from types import SimpleNamespace
+
+from app.services.email_service import render_digest_email
+from app.services.email_templates import _update_fragments, fragment_cache_info
+from benchmarks.bench_response_serialization import _best_of
+
+
+def _make_sections(items: int, topics: int):
+    updates = [
+        SimpleNamespace(
+            id=f"update-{i:08d}",
+            title=f"Story number {i} — \"quoted\" & <tagged>",
+            summary="A multi-sentence summary of the story, with R&D figures < expectations. " * 3,
+            source_url=f"https://example.com/news/{i}?ref=digest&utm_source=email",
+        )
+        for i in range(items)
+    ]
+    topics = max(1, min(topics, items))
+    return [(f"Topic {t}", updates[t::topics]) for t in range(topics)]
+
+
+def _legacy_items_html(updates) -> str:
+    parts = []
+    for u in updates:
+        link_html = ""
+        if u.source_url:
+            link_html = f"""
+              <a href=\"{u.source_url}\" style=\"color:#2563eb;text-decoration:none;font-size:13px;\">View source</a>
+            """
+        parts.append(
+              f"""
+              <div style=\"width:100%;box-sizing:border-box;padding:12px 14px;border-radius:10px;border:1px solid #e5e7eb;background-color:#f9fafb;margin-bottom:12px;\">
+                <div style=\"font-size:14px;font-weight:600;color:#111827;margin-bottom:4px;\">{u.title or "Update"}</div>
+                <div style=\"font-size:13px;color:#4b5563;line-height:1.5;margin-bottom:6px;\">{u.summary or "No description available."}</div>
+                {link_html}
+              </div>
+              """
+        )
+    return "".join(parts)
+
+
+def _legacy_digest(sections):
+    total = sum(len(updates) for _, updates in sections)
+    lines = [f"Here is your digest: {total} new updates across {len(sections)} topics.", ""]
+    sections_html = []
+    for topic_title, updates in sections:
+        lines.append(f"== {topic_title} ==")
+        for idx, u in enumerate(updates, start=1):
+            lines.append(f"{idx}. {u.title}")
+            lines.append(f"   {u.summary}")
+            lines.append(f"   Source: {u.source_url}")
+            lines.append("")
+        sections_html.append(f"""
+        <h2 style=\"font-size:16px;margin:18px 0 10px 0;color:#111827;font-weight:600;\">{topic_title}</h2>
+        {_legacy_items_html(updates)}
+        """)
+    html_body = f"""\
+<html>
+  <body style=\"margin:0;padding:24px;background-color:#f4f4f5;font-family:-apple-system,BlinkMacSystemFont,'Segoe UI',sans-serif;\">
+    <div style=\"max-width:640px;margin:0 auto;background-color:#ffffff;border:1px solid #e5e7eb;border-radius:12px;padding:24px;\">
+      <h1 style=\"font-size:20px;margin:0 0 8px 0;color:#111827;font-weight:600;\">Your Neuraletter digest</h1>
+      <p style=\"margin:0 0 18px 0;color:#4b5563;font-size:14px;\">{total} new updates across {len(sections)} of your topics.</p>
+        <div>
+        {"".join(sections_html)}
+      </div>
+    </div>
+  </body>
+</html>
+"""
+    return "Your digest", "\n".join(lines).strip(), html_body
+
+
+def _cold(sections):
+    _update_fragments.cache_clear()
+    return render_digest_email(sections)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--items", type=int, nargs="+", default=[1, 10, 50, 100, 250, 500])
+    parser.add_argument("--topics", type=int, default=5)
+    parser.add_argument("--users", type=int, default=200, help="digests sharing the same stories in the fan-out run")
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    print(f"{'items':>6} {'f-string ms':>12} {'template cold ms':>17} {'template warm ms':>17} {'html bytes':>11}")
+    for items in args.items:
+        sections = _make_sections(items, args.topics)
+        legacy_ms = _best_of(args.repeat, lambda: _legacy_digest(sections))
+        cold_ms = _best_of(args.repeat, lambda: _cold(sections))
+        render_digest_email(sections)
+        warm_ms = _best_of(args.repeat, lambda: render_digest_email(sections))
+        size = len(render_digest_email(sections)[2])
+        print(f"{items:>6} {legacy_ms:>12.3f} {cold_ms:>17.3f} {warm_ms:>17.3f} {size:>11}")
+
+    # Every user follows some of the same 50 stories: each fragment should be built once.
+    stories = _make_sections(50, 1)[0][1]
+    _update_fragments.cache_clear()
+    for user in range(args.users):
+        picked = stories[user % 10:][:20]
+        render_digest_email([(f"Topic {user % 3}", picked[:10]), (f"Topic {user % 3 + 3}", picked[10:])])
+    info = fragment_cache_info()
+    print(
+        f"fan-out: {args.users} digests x 20 stories, fragments rendered={info.misses} "
+        f"cache hits={info.hits}"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,235 @@
+"""End-to-end email throughput of the app's senders against the local SMTP sink.
+
+Starts benchmarks.smtp_sink, points the app's SMTP settings at it (before
+app.core.config is imported, so email_service's pool connects to the sink) and
+drives every sender in SENDERS at each concurrency level. Reports messages per
+second, p50/p99 per-message latency, SMTP connections opened and the peak
+number of sessions the sink saw at once.
+
+A sender is a factory returning either a plain callable or a coroutine function
+taking the message index; coroutine senders are driven on an event loop with
+the same concurrency, so a future async sender only needs an entry in SENDERS.
+
+"outbox" is the path the app actually uses: it enqueues --messages rows in
+email_outbox and times drain_email_outbox, which sends them on SMTP_POOL_SIZE
+threads (so it runs once, not per --concurrency level). Latency is enqueue to
+sent_at. It needs DATABASE_URL pointing at a scratch database, and it refuses
+to run if that database already has pending outbox rows, since it would send them.
+
+    python -m benchmarks.bench_email_throughput --messages 300 --concurrency 1 4 16 --handshake-delay-ms 40
+    python -m benchmarks.bench_email_throughput --senders send_updates_email --min-msgs-per-second 100 --max-p99-ms 250
+    python -m benchmarks.bench_email_throughput --senders outbox --messages 1000 --pool-size 8
+
+With --min-msgs-per-second or --max-p99-ms the script exits non-zero when any
+run misses the threshold, so it can gate a deploy.
+"""
+import argparse
+import asyncio
+import os
+import smtplib
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+from typing import Callable, Dict, List, Tuple
+
+from benchmarks.smtp_sink import SMTPSink
+
+
+def _updates(count: int):
+    return [
+        SimpleNamespace(
+            id=f"update-{i:08d}",
+            title=f"Story number {i}",
+            summary="A multi-sentence summary of the story. " * 3,
+            source_url=f"https://example.com/news/{i}",
+        )
+        for i in range(count)
+    ]
+
+
+def _per_message_sender(sink: SMTPSink, args) -> Callable[[int], None]:
+    # Baseline without the pool: connect, log in, send, quit for every message.
+    from app.services.email_service import build_email
+
+    def send(index: int) -> None:
+        server = smtplib.SMTP(sink.host, sink.port, timeout=30)
+        server.login("bench", "bench")
+        server.send_message(build_email(f"reader{index}@example.com", "Your code", "Your verification code is 123456"))
+        server.quit()
+
+    return send
+
+
+def _send_email_sender(sink: SMTPSink, args) -> Callable[[int], None]:
+    from app.services.email_service import send_email
+
+    return lambda index: send_email(f"reader{index}@example.com", "Your code", "Your verification code is 123456")
+
+
+def _send_updates_email_sender(sink: SMTPSink, args) -> Callable[[int], None]:
+    from app.services.email_service import send_updates_email
+
+    updates = _updates(args.updates_per_email)
+    return lambda index: send_updates_email(f"reader{index}@example.com", f"Topic {index % 5}", updates)
+
+
+BENCH_DOMAIN = "outbox-bench.invalid"
+
+
+def _outbox_drain(sink: SMTPSink, args) -> Callable[[int], Tuple[float, List[float]]]:
+    from app.db.session import SessionLocal, engine
+    from app.models.email_outbox import EmailOutbox
+    from app.services.email_outbox_service import STATUS_PENDING, drain_email_outbox, enqueue_email
+
+    EmailOutbox.__table__.create(engine, checkfirst=True)
+
+    def run(messages: int) -> Tuple[float, List[float]]:
+        db = SessionLocal()
+        try:
+            pending = db.query(EmailOutbox).filter(EmailOutbox.status == STATUS_PENDING).count()
+            if pending:
+                raise SystemExit(f"email_outbox has {pending} pending rows; point DATABASE_URL at a scratch database")
+            for index in range(messages):
+                enqueue_email(db, f"reader{index}@{BENCH_DOMAIN}", "Your code", "Your verification code is 123456")
+            db.commit()
+            enqueued_ms = int(time.time() * 1000)
+
+            started = time.perf_counter()
+            drain_email_outbox()
+            elapsed = time.perf_counter() - started
+
+            bench_rows = db.query(EmailOutbox).filter(EmailOutbox.to_email.like(f"%@{BENCH_DOMAIN}"))
+            latencies = [(row.sent_at - enqueued_ms) / 1000 for row in bench_rows if row.sent_at is not None]
+            bench_rows.delete(synchronize_session=False)
+            db.commit()
+            return elapsed, latencies
+        finally:
+            db.close()
+
+    return run
+
+
+SENDERS: Dict[str, Callable[[SMTPSink, argparse.Namespace], Callable]] = {
+    "per_message": _per_message_sender,
+    "send_email": _send_email_sender,
+    "send_updates_email": _send_updates_email_sender,
+}
+
+# Senders that take the whole batch at once and report (elapsed, per-message latencies) themselves.
+BATCH_SENDERS: Dict[str, Callable[[SMTPSink, argparse.Namespace], Callable[[int], Tuple[float, List[float]]]]] = {
+    "outbox": _outbox_drain,
+}
+
+
+def _percentile(samples: List[float], pct: float) -> float:
+    ordered = sorted(samples)
+    rank = max(0, min(len(ordered) - 1, int(round(pct / 100 * len(ordered))) - 1))
+    return ordered[rank]
+
+
+def _timed(send: Callable[[int], None], latencies: List[float]) -> Callable[[int], None]:
+    def run(index: int) -> None:
+        started = time.perf_counter()
+        send(index)
+        latencies.append(time.perf_counter() - started)
+
+    return run
+
+
+async def _drive_async(send, messages: int, concurrency: int, latencies: List[float]) -> None:
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def run(index: int) -> None:
+        async with semaphore:
+            started = time.perf_counter()
+            await send(index)
+            latencies.append(time.perf_counter() - started)
+
+    await asyncio.gather(*(run(i) for i in range(messages)))
+
+
+def _run(send, messages: int, concurrency: int):
+    latencies: List[float] = []
+    started = time.perf_counter()
+    if asyncio.iscoroutinefunction(send):
+        asyncio.run(_drive_async(send, messages, concurrency, latencies))
+    else:
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            list(executor.map(_timed(send, latencies), range(messages)))
+    return time.perf_counter() - started, latencies
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--senders", nargs="+", choices=sorted({**SENDERS, **BATCH_SENDERS}), default=list(SENDERS))
+    parser.add_argument("--messages", type=int, default=300)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 16])
+    parser.add_argument("--pool-size", type=int, default=4)
+    parser.add_argument("--updates-per-email", type=int, default=10)
+    parser.add_argument("--handshake-delay-ms", type=float, default=40.0)
+    parser.add_argument("--message-delay-ms", type=float, default=2.0)
+    parser.add_argument("--min-msgs-per-second", type=float, default=None)
+    parser.add_argument("--max-p99-ms", type=float, default=None)
+    args = parser.parse_args()
+
+    sink = SMTPSink(handshake_delay_ms=args.handshake_delay_ms, message_delay_ms=args.message_delay_ms).start()
+    os.environ.update({
+        "SMTP_SERVER": sink.host,
+        "SMTP_PORT": str(sink.port),
+        "SMTP_EMAIL": "bench@example.com",
+        "SMTP_PASSWORD": "bench",
+        "SMTP_USE_TLS": "false",
+        "SMTP_POOL_SIZE": str(args.pool_size),
+    })
+    from app.services.email_service import smtp_pool
+
+    failures = []
+    print(
+        f"{'sender':<20} {'threads':>7} {'msgs/s':>9} {'p50 ms':>8} {'p99 ms':>8} "
+        f"{'connections':>12} {'peak open':>10}"
+    )
+    try:
+        for name in args.senders:
+            if name in BATCH_SENDERS:
+                send, levels = BATCH_SENDERS[name](sink, args), [args.pool_size]
+            else:
+                send, levels = SENDERS[name](sink, args), args.concurrency
+            for concurrency in levels:
+                # Every run starts from a cold pool so connection counts are comparable.
+                smtp_pool.close_all()
+                time.sleep(0.05)
+                opened_before = sink.connections_opened
+                received_before = sink.messages_received
+                sink.peak_connections = sink.open_connections
+
+                if name in BATCH_SENDERS:
+                    elapsed, latencies = send(args.messages)
+                else:
+                    elapsed, latencies = _run(send, args.messages, concurrency)
+                rate = args.messages / elapsed
+                p50 = _percentile(latencies, 50) * 1000
+                p99 = _percentile(latencies, 99) * 1000
+                print(
+                    f"{name:<20} {concurrency:>7} {rate:>9.1f} {p50:>8.2f} {p99:>8.2f} "
+                    f"{sink.connections_opened - opened_before:>12} {sink.peak_connections:>10}"
+                )
+
+                delivered = sink.messages_received - received_before
+                if delivered != args.messages:
+                    failures.append(f"{name} x{concurrency}: sink received {delivered}/{args.messages}")
+                if args.min_msgs_per_second is not None and rate < args.min_msgs_per_second:
+                    failures.append(f"{name} x{concurrency}: {rate:.1f} msgs/s < {args.min_msgs_per_second}")
+                if args.max_p99_ms is not None and p99 > args.max_p99_ms:
+                    failures.append(f"{name} x{concurrency}: p99 {p99:.1f} ms > {args.max_p99_ms}")
+    finally:
+        smtp_pool.close_all()
+        sink.stop()
+
+    if failures:
+        print("\n".join(failures))
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
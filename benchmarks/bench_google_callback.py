@@ -0,0 +1,111 @@
+"""Google callback latency with lazy vs prefetched discovery/JWKS, against the local OIDC stand-in.
+
+Starts benchmarks.oidc_stub (with ``--metadata-delay-ms`` on discovery and JWKS
+to stand in for the trip to Google), points GOOGLE_DISCOVERY_URL at it before
+app.core.google_oauth is imported, and runs ``--logins`` full authorization-code
+flows through the same authlib calls the /auth/google endpoints make (the user
+lookup and JWT issuing that follow are left out). Reports the first login, the
+first/p50/p99 callback latency and how many discovery/JWKS fetches the logins caused.
+
+    python -m benchmarks.bench_google_callback --logins 50 --metadata-delay-ms 80
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import time
+
+import httpx
+from starlette.applications import Starlette
+from starlette.middleware import Middleware
+from starlette.middleware.sessions import SessionMiddleware
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+
+from benchmarks.oidc_stub import OIDCStub
+
+
+def _app(oauth) -> Starlette:
+    async def login(request: Request):
+        return await oauth.google.authorize_redirect(request, "http://testserver/callback")
+
+    async def callback(request: Request):
+        token = await oauth.google.authorize_access_token(request)
+        return JSONResponse({"email": token["userinfo"]["email"]})
+
+    return Starlette(
+        routes=[Route("/login", login), Route("/callback", callback)],
+        middleware=[Middleware(SessionMiddleware, secret_key="bench")],
+    )
+
+
+async def _flows(app: Starlette, stub: OIDCStub, logins: int):
+    """Returns login and callback latencies in ms, and how many discovery/JWKS fetches the run caused."""
+    login_ms, callback_ms = [], []
+    fetches_before = stub.discovery_requests + stub.jwks_requests
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://testserver") as client, \
+            httpx.AsyncClient() as provider:
+        for _ in range(logins):
+            client.cookies.clear()
+            started = time.perf_counter()
+            to_provider = await client.get("/login")
+            login_ms.append((time.perf_counter() - started) * 1000)
+            back = await provider.get(to_provider.headers["location"])
+            callback_url = httpx.URL(back.headers["location"])
+
+            started = time.perf_counter()
+            response = await client.get(callback_url.path, params=callback_url.params)
+            callback_ms.append((time.perf_counter() - started) * 1000)
+            response.raise_for_status()
+    return login_ms, callback_ms, stub.discovery_requests + stub.jwks_requests - fetches_before
+
+
+def _report(label: str, login_ms, callback_ms, fetches: int) -> None:
+    callback_ms_sorted = sorted(callback_ms)
+    p99 = callback_ms_sorted[min(len(callback_ms_sorted) - 1, int(len(callback_ms_sorted) * 0.99))]
+    print(
+        f"{label:<11} {login_ms[0]:>15.1f} {callback_ms[0]:>18.1f} {statistics.median(callback_ms):>16.1f} "
+        f"{p99:>16.1f} {fetches:>9}"
+    )
+
+
+async def run(args) -> None:
+    stub = OIDCStub(metadata_delay_ms=args.metadata_delay_ms).start()
+    os.environ["GOOGLE_DISCOVERY_URL"] = stub.discovery_url
+    from app.core.google_oauth import google_metadata, oauth, start_google_oauth, stop_google_oauth
+
+    app = _app(oauth)
+    print(
+        f"{'metadata':<11} {'first login ms':>15} {'first callback ms':>18} {'p50 callback ms':>16} "
+        f"{'p99 callback ms':>16} {'fetches':>9}"
+    )
+    try:
+        oauth.google.server_metadata = {}
+        _report("lazy", *await _flows(app, stub, args.logins))
+
+        oauth.google.server_metadata = {}
+        await start_google_oauth()
+        _report("prefetched", *await _flows(app, stub, args.logins))
+
+        # Refresh-ahead swapping in a new copy while logins are in flight; the refresh's
+        # own two fetches are not counted against the logins.
+        flows = asyncio.create_task(_flows(app, stub, args.logins))
+        await google_metadata.refresh()
+        login_ms, callback_ms, fetches = await flows
+        _report("refreshing", login_ms, callback_ms, fetches - 2)
+    finally:
+        await stop_google_oauth()
+        stub.stop()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--logins", type=int, default=50)
+    parser.add_argument("--metadata-delay-ms", type=float, default=80.0)
+    args = parser.parse_args()
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
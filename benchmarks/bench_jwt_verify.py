@@ -0,0 +1,80 @@
+"""Per-request CPU spent verifying access tokens under a steady polling load.
+
+Every logged-in client polls with the same token until it expires, so the
+load is ``--requests`` verifications spread over ``--clients`` distinct tokens.
+Compares a full jwt.decode per request (the old verify_jwt_token) with the
+cached verify_jwt_token, and checks that a cached token stops verifying at the
+second its exp passes.
+
+    python -m benchmarks.bench_jwt_verify --clients 10 100 1000 --requests 20000
+"""
+import argparse
+import time
+from datetime import datetime, timezone
+from unittest import mock
+
+from fastapi import HTTPException
+from jose import jwt
+
+from app.core.auth import create_jwt_token, token_cache, verify_jwt_token
+from app.core.config import settings
+
+
+def _full_decode(token: str) -> dict:
+    return jwt.decode(
+        token,
+        settings.JWT_SECRET_KEY,
+        algorithms=[settings.JWT_ALGORITHM],
+        audience="neuraletter-frontend",
+        issuer="neuraletter-backend",
+    )
+
+
+def _poll(verify, tokens, requests: int) -> float:
+    started = time.perf_counter()
+    for i in range(requests):
+        verify(tokens[i % len(tokens)])
+    return (time.perf_counter() - started) / requests * 1_000_000
+
+
+def _check_expiry() -> str:
+    # Freeze both clocks (ours and the one jwt.decode reads) half a second into exp and exp+1.
+    token = create_jwt_token("expiry-user", "expiry@example.com")
+    exp = verify_jwt_token(token)["exp"]
+    results = []
+    for at in (exp, exp + 1):
+        with mock.patch("time.time", return_value=at + 0.5), mock.patch("jose.jwt.datetime") as fake_datetime:
+            fake_datetime.now.return_value = datetime.fromtimestamp(at + 0.5, timezone.utc)
+            try:
+                verify_jwt_token(token)
+                results.append(f"exp+{at - exp}.5s accepted")
+            except HTTPException as e:
+                results.append(f"exp+{at - exp}.5s rejected ({e.status_code})")
+    return ", ".join(results)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--clients", type=int, nargs="+", default=[10, 100, 1000])
+    parser.add_argument("--requests", type=int, default=20000)
+    args = parser.parse_args()
+
+    print(f"{'clients':>8} {'decode us/req':>14} {'cached us/req':>14} {'saved':>7} {'hit rate':>9}")
+    for clients in args.clients:
+        tokens = [create_jwt_token(f"user-{i}", f"user{i}@example.com") for i in range(clients)]
+        decode_us = _poll(_full_decode, tokens, args.requests)
+
+        token_cache.clear()
+        token_cache.hits = token_cache.misses = 0
+        cached_us = _poll(verify_jwt_token, tokens, args.requests)
+        hit_rate = token_cache.hits / max(1, token_cache.hits + token_cache.misses)
+        print(
+            f"{clients:>8} {decode_us:>14.1f} {cached_us:>14.1f} "
+            f"{1 - cached_us / decode_us:>6.0%} {hit_rate:>9.1%}"
+        )
+
+    print(f"expiry: {_check_expiry()}")
+
+
+if __name__ == "__main__":
+    main()
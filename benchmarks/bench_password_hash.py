@@ -0,0 +1,53 @@
+"""Password hashes per second per core at each cost setting, and what calibration picks.
+
+Each setting is timed on one process (hashing is single-threaded), so the rate
+is per core; multiply by PASSWORD_POOL_WORKERS for a host's login capacity.
+The last lines show the rounds calibrate_policy chooses for ``--target-ms``,
+the settings that pin them, and which stored costs get rehashed on login
+(only those below the fixed floor).
+
+    python -m benchmarks.bench_password_hash --target-ms 250
+"""
+import argparse
+
+from passlib.hash import pbkdf2_sha256
+
+from app.core import security
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--bcrypt-rounds", type=int, nargs="+", default=[10, 11, 12, 13, 14])
+    parser.add_argument("--pbkdf2-rounds", type=int, nargs="+", default=[100_000, 300_000, 600_000, 1_200_000])
+    parser.add_argument("--target-ms", type=float, default=250.0)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    settings = [("pbkdf2_sha256", rounds) for rounds in args.pbkdf2_rounds]
+    if security._BCRYPT_OK:
+        settings = [("bcrypt", rounds) for rounds in args.bcrypt_rounds] + settings
+    else:
+        print("bcrypt backend unavailable; only pbkdf2_sha256 is measured")
+
+    print(f"{'scheme':<14} {'rounds':>10} {'ms/hash':>9} {'hashes/s/core':>14}")
+    for scheme, rounds in settings:
+        seconds = security.time_hash(scheme, rounds, repeat=args.repeat)
+        print(f"{scheme:<14} {rounds:>10} {seconds * 1000:>9.1f} {1 / seconds:>14.1f}")
+
+    policy = security.calibrate_policy(args.target_ms)
+    print(f"calibrated for {args.target_ms:.0f} ms: {policy}")
+    print("pin it for every worker and node with:")
+    for name, rounds in policy.items():
+        if rounds:
+            print(f"  PASSWORD_{name.upper()}={rounds}")
+
+    for rounds in (29_000, security.PBKDF2_MIN_ROUNDS, policy["pbkdf2_rounds"] - security.PBKDF2_ROUNDS_STEP):
+        if rounds < 1000:
+            continue
+        stored = pbkdf2_sha256.using(rounds=rounds).hash("correct horse")
+        valid, upgraded = security.verify_and_update("correct horse", stored)
+        print(f"{rounds}-round pbkdf2 hash on login: valid={valid} rehashed={upgraded is not None}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+"""Bandwidth and latency effect of CompressionMiddleware on update payloads.
+
+Serves a realistic get_updates_for_topic page through the middleware for each
+encoding and reports bytes on the wire, server time, and the estimated
+end-to-end time at a given link speed. A streamed response and a 304 are also
+fetched to check that both paths still behave.
+
+    python -m benchmarks.bench_response_compression --rows 20 50 200 --mbps 10
+"""
+import argparse
+import gzip
+import random
+import time
+
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+from starlette.responses import StreamingResponse
+
+from app.core.compression import CompressionMiddleware, brotli
+from app.core.responses import JSONResponse
+from app.utils.etag import etag_headers, etag_matches, make_etag, not_modified_response
+from benchmarks.bench_response_serialization import UPDATE_FIELDS, _make_updates
+
+
+WORDS = (
+    "market regulators announced new framework energy storage battery grid capacity researchers "
+    "published results study model training compute budget startup raised funding round investors "
+    "quarterly earnings revenue growth shipping delays semiconductor export policy climate agreement "
+    "vaccine trial phase results hospital network outage security vulnerability patch release"
+).split()
+
+
+def _realistic_updates(rows: int) -> list:
+    # Distinct summaries and URLs per row so the ratio is not flattered by repetition.
+    rng = random.Random(rows)
+    updates = []
+    for row in _make_updates(rows):
+        update = {field: getattr(row, field) for field in UPDATE_FIELDS}
+        update["summary"] = ". ".join(
+            " ".join(rng.choice(WORDS) for _ in range(rng.randint(12, 24))).capitalize() for _ in range(3)
+        ) + "."
+        update["source_url"] = f"https://news.example.com/{rng.getrandbits(48):x}/{'-'.join(rng.sample(WORDS, 5))}"
+        update["key_points"] = [" ".join(rng.sample(WORDS, 8)) for _ in range(3)]
+        updates.append(update)
+    return updates
+
+
+def _build_app(rows: int, gzip_level: int, brotli_quality: int) -> FastAPI:
+    payload = {
+        "message": "Updates fetched successfully",
+        "updates": _realistic_updates(rows),
+        "next_cursor": None,
+        "latest_cursor": None,
+        "has_more": False,
+    }
+    etag = make_etag("topic-0001", rows)
+
+    app = FastAPI(default_response_class=JSONResponse)
+    app.add_middleware(
+        CompressionMiddleware,
+        minimum_size=1024,
+        gzip_level=gzip_level,
+        brotli_quality=brotli_quality,
+    )
+
+    @app.get("/updates")
+    def updates(request: Request):
+        if etag_matches(request.headers.get("if-none-match"), etag):
+            return not_modified_response(etag)
+        return JSONResponse(payload, headers=etag_headers(etag))
+
+    @app.get("/stream")
+    def stream():
+        def lines():
+            for update in payload["updates"]:
+                yield JSONResponse(update).body + b"\n"
+        return StreamingResponse(lines(), media_type="text/plain")
+
+    return app
+
+
+def _measure(client: TestClient, accept_encoding: str, repeat: int):
+    best = float("inf")
+    response = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        response = client.get("/updates", headers={"Accept-Encoding": accept_encoding})
+        best = min(best, time.perf_counter() - started)
+    wire_bytes = int(response.headers.get("content-length", len(response.content)))
+    return response, wire_bytes, best * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, nargs="+", default=[20, 50, 200])
+    parser.add_argument("--mbps", type=float, default=10.0, help="client link speed used for the transfer estimate")
+    parser.add_argument("--gzip-level", type=int, default=6)
+    parser.add_argument("--brotli-quality", type=int, default=4)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    encodings = ["identity", "gzip"] + (["br"] if brotli is not None else [])
+    if brotli is None:
+        print("brotli is not installed; only gzip is measured")
+
+    print(f"{'rows':>5} {'encoding':>9} {'bytes':>9} {'ratio':>6} {'server ms':>10} {'est. total ms':>14}")
+    for rows in args.rows:
+        client = TestClient(_build_app(rows, args.gzip_level, args.brotli_quality))
+        identity_bytes = None
+        for encoding in encodings:
+            response, wire_bytes, server_ms = _measure(client, encoding, args.repeat)
+            assert response.status_code == 200 and response.json()["updates"]
+            identity_bytes = identity_bytes or wire_bytes
+            transfer_ms = wire_bytes * 8 / (args.mbps * 1_000_000) * 1000
+            print(
+                f"{rows:>5} {encoding:>9} {wire_bytes:>9} {wire_bytes / identity_bytes:>6.2f} "
+                f"{server_ms:>10.2f} {server_ms + transfer_ms:>14.2f}"
+            )
+
+    client = TestClient(_build_app(args.rows[-1], args.gzip_level, args.brotli_quality))
+    first = client.get("/updates", headers={"Accept-Encoding": "gzip"})
+    revalidated = client.get("/updates", headers={"Accept-Encoding": "gzip", "If-None-Match": first.headers["etag"]})
+    print(f"conditional GET: {revalidated.status_code}, vary={revalidated.headers.get('vary')}, body={len(revalidated.content)} bytes")
+
+    with client.stream("GET", "/stream", headers={"Accept-Encoding": "gzip"}) as streamed:
+        raw = b"".join(streamed.iter_raw())
+        lines = gzip.decompress(raw).count(b"\n")
+        print(
+            f"streamed: encoding={streamed.headers.get('content-encoding')}, wire={len(raw)} bytes, "
+            f"lines={lines}"
+        )
+
+
+if __name__ == "__main__":
+    main()
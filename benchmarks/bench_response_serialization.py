@@ -0,0 +1,151 @@
+"""Per-request CPU spent building and encoding the update and topic chat payloads.
+
+Compares three ways of turning ORM rows into a response body: hand-built dicts
+rendered by Starlette's stdlib JSONResponse (the old path), the same dicts
+rendered by app.core.responses.JSONResponse (orjson), and the response schemas
+validated from the rows and encoded by their precompiled pydantic-core
+serializer. The schemas pay for from_attributes validation on every row, which
+is why the services keep hand-built dicts and the schemas only describe the
+endpoints.
+
+    python -m benchmarks.bench_response_serialization --rows 50 200 1000
+"""
+import argparse
+import time
+from types import SimpleNamespace
+
+from starlette.responses import JSONResponse as StdlibJSONResponse
+from starlette.responses import Response
+
+from app.core.responses import JSONResponse, orjson
+from app.schemas.topic_chat import TopicChatPage
+from app.schemas.update import UpdatePage
+
+UPDATE_FIELDS = (
+    "id", "associated_topic_id", "title", "batch_id", "author", "summary",
+    "source_url", "date", "key_points", "image_link", "created_at",
+)
+CHAT_FIELDS = ("id", "associated_topic_id", "chat_message", "sent_by_user", "created_at")
+
+
+def _make_updates(count: int):
+    return [
+        SimpleNamespace(
+            id=f"update-{i:08d}",
+            associated_topic_id="topic-0001",
+            title=f"Story number {i} — with a non-ASCII dash",
+            batch_id=f"batch-{i // 10:06d}",
+            author="Newsroom",
+            summary="A multi-sentence summary of the story. " * 4,
+            source_url=f"https://example.com/news/{i}",
+            date=1_700_000_000_000 + i,
+            key_points=["First short fact about the story", "Second short fact", "Third short fact"],
+            image_link=None,
+            created_at=1_700_000_000_000 + i,
+        )
+        for i in range(count)
+    ]
+
+
+def _make_chats(count: int):
+    return [
+        SimpleNamespace(
+            id=f"chat-{i:08d}",
+            associated_topic_id="topic-0001",
+            chat_message="{'question': 'Which region should the updates focus on?'}" if i % 2 else "Europe, mostly.",
+            sent_by_user=i % 2 == 0,
+            created_at=1_700_000_000_000 + i,
+        )
+        for i in range(count)
+    ]
+
+
+def _legacy_updates(rows) -> StdlibJSONResponse:
+    return StdlibJSONResponse(content={
+        "message": "Updates fetched successfully",
+        "updates": [{field: getattr(row, field) for field in UPDATE_FIELDS} for row in rows],
+        "next_cursor": None,
+        "latest_cursor": None,
+        "has_more": False,
+    })
+
+
+def _orjson_updates(rows) -> JSONResponse:
+    return JSONResponse(content={
+        "message": "Updates fetched successfully",
+        "updates": [{field: getattr(row, field) for field in UPDATE_FIELDS} for row in rows],
+        "next_cursor": None,
+        "latest_cursor": None,
+        "has_more": False,
+    })
+
+
+def _schema_updates(rows):
+    page = UpdatePage.model_validate(
+        {"message": "Updates fetched successfully", "updates": rows, "has_more": False},
+        from_attributes=True,
+    )
+    return _model_response(page)
+
+
+def _legacy_chats(rows) -> StdlibJSONResponse:
+    return StdlibJSONResponse(content={
+        "message": "Topic chats fetched successfully",
+        "topic_chats": [{field: getattr(row, field) for field in CHAT_FIELDS} for row in rows],
+    })
+
+
+def _orjson_chats(rows) -> JSONResponse:
+    return JSONResponse(content={
+        "message": "Topic chats fetched successfully",
+        "topic_chats": [{field: getattr(row, field) for field in CHAT_FIELDS} for row in rows],
+    })
+
+
+def _schema_chats(rows):
+    page = TopicChatPage.model_validate(
+        {"message": "Topic chats fetched successfully", "topic_chats": rows},
+        from_attributes=True,
+    )
+    return _model_response(page)
+
+
+def _model_response(page) -> Response:
+    return Response(type(page).__pydantic_serializer__.to_json(page), media_type="application/json")
+
+
+def _best_of(repeat: int, fn) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - started)
+    return best * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, nargs="+", default=[50, 200, 1000])
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    if orjson is None:
+        print("orjson is not installed; the orjson column measures the stdlib fallback")
+
+    cases = (
+        ("get_updates_for_topic", _make_updates, _legacy_updates, _orjson_updates, _schema_updates),
+        ("get_topic_chat", _make_chats, _legacy_chats, _orjson_chats, _schema_chats),
+    )
+    print(f"{'payload':<22} {'rows':>6} {'dict+stdlib ms':>15} {'dict+orjson ms':>15} {'schema ms':>10} {'bytes':>9}")
+    for name, make_rows, legacy, fast_dict, schema in cases:
+        for count in args.rows:
+            rows = make_rows(count)
+            legacy_ms = _best_of(args.repeat, lambda: legacy(rows))
+            orjson_ms = _best_of(args.repeat, lambda: fast_dict(rows))
+            schema_ms = _best_of(args.repeat, lambda: schema(rows))
+            size = len(schema(rows).body)
+            print(f"{name:<22} {count:>6} {legacy_ms:>15.2f} {orjson_ms:>15.2f} {schema_ms:>10.2f} {size:>9}")
+
+
+if __name__ == "__main__":
+    main()
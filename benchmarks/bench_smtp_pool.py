@@ -0,0 +1,85 @@
+"""Pooled SMTP sessions vs one connection per message, against the local sink.
+
+The sink adds ``--handshake-delay-ms`` to the greeting and to AUTH, which is where
+a real provider spends its STARTTLS and login round trips. The last section drops
+every session server-side mid-run to check that the pool notices and reconnects.
+
+    python -m benchmarks.bench_smtp_pool --messages 200 --concurrency 1 4 --handshake-delay-ms 40
+"""
+import argparse
+import smtplib
+import time
+from concurrent.futures import ThreadPoolExecutor
+from email.message import EmailMessage
+
+from app.services.smtp_pool import SMTPConnectionPool
+from benchmarks.smtp_sink import SMTPSink
+
+
+def _message(index: int) -> EmailMessage:
+    msg = EmailMessage()
+    msg["From"] = "Neuraletter <noreply@example.com>"
+    msg["To"] = f"reader{index}@example.com"
+    msg["Subject"] = f"New updates for topic {index}"
+    msg.set_content("A concise snapshot of what changed around this topic.\n" * 20)
+    return msg
+
+
+def _send_per_message(sink: SMTPSink, msg: EmailMessage) -> None:
+    # What email_service did before the pool: connect, log in, send, quit.
+    server = smtplib.SMTP(sink.host, sink.port, timeout=30)
+    server.login("bench", "bench")
+    server.send_message(msg)
+    server.quit()
+
+
+def _run(send, messages: int, concurrency: int) -> float:
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        list(executor.map(send, (_message(i) for i in range(messages))))
+    return time.perf_counter() - started
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--messages", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4])
+    parser.add_argument("--pool-size", type=int, default=4)
+    parser.add_argument("--handshake-delay-ms", type=float, default=40.0)
+    args = parser.parse_args()
+
+    print(f"{'mode':<12} {'threads':>7} {'msgs/s':>9} {'connections':>12}")
+    for concurrency in args.concurrency:
+        sink = SMTPSink(handshake_delay_ms=args.handshake_delay_ms).start()
+        elapsed = _run(lambda msg: _send_per_message(sink, msg), args.messages, concurrency)
+        print(f"{'per-message':<12} {concurrency:>7} {args.messages / elapsed:>9.1f} {sink.connections_opened:>12}")
+        sink.stop()
+
+        sink = SMTPSink(handshake_delay_ms=args.handshake_delay_ms).start()
+        pool = SMTPConnectionPool(sink.host, sink.port, "bench", "bench", use_tls=False, size=args.pool_size)
+        elapsed = _run(pool.send_message, args.messages, concurrency)
+        print(f"{'pooled':<12} {concurrency:>7} {args.messages / elapsed:>9.1f} {pool.connections_opened:>12}")
+        pool.close_all()
+        sink.stop()
+
+    # NOOP before every reuse catches the dropped sessions; without it the failed send is retried.
+    for label, health_check_after in (("noop check", 0.0), ("retry only", float("inf"))):
+        sink = SMTPSink(handshake_delay_ms=args.handshake_delay_ms).start()
+        pool = SMTPConnectionPool(
+            sink.host, sink.port, "bench", "bench", use_tls=False, size=args.pool_size,
+            health_check_after=health_check_after,
+        )
+        _run(pool.send_message, 20, args.pool_size)
+        sink.drop_connections()
+        time.sleep(0.1)
+        _run(pool.send_message, 20, args.pool_size)
+        print(
+            f"dropped sessions, {label}: delivered={sink.messages_received}/40 "
+            f"connections={pool.connections_opened} reconnects={pool.reconnects}"
+        )
+        pool.close_all()
+        sink.stop()
+
+
+if __name__ == "__main__":
+    main()
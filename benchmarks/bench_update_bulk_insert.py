@@ -0,0 +1,81 @@
+"""Per-row ORM inserts vs UpdateService.bulk_insert_updates against a real Postgres.
+
+Rows are written under throwaway topic ids and deleted afterwards.
+
+    BENCH_DATABASE_URL=postgresql://... python -m benchmarks.bench_update_bulk_insert --sizes 100 1000 10000
+"""
+import argparse
+import os
+import time
+
+from sqlalchemy import create_engine, delete
+from sqlalchemy.orm import sessionmaker
+
+from app.db.base import Base
+from app.models.update import Update
+from app.services.update_service import UpdateService
+from app.utils.random_generator import generate_random_string
+
+
+def _rows(topic_id: str, batch_id: str, count: int) -> list:
+    return [
+        {
+            "id": generate_random_string(32),
+            "associated_topic_id": topic_id,
+            "title": f"Benchmark story {i}",
+            "batch_id": batch_id,
+            "author": None,
+            "summary": "A multi-sentence summary of the story. " * 4,
+            "source_url": f"https://example.com/bench/{i}",
+            "date": None,
+            "key_points": ["First fact", "Second fact"],
+            "image_link": None,
+        }
+        for i in range(count)
+    ]
+
+
+def _per_row(db, rows) -> None:
+    for row in rows:
+        db.add(Update(**row))
+    db.commit()
+
+
+def _bulk(db, rows) -> None:
+    UpdateService().bulk_insert_updates(rows, db)
+    db.commit()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--database-url", default=os.environ.get("BENCH_DATABASE_URL"))
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 10000])
+    args = parser.parse_args()
+    if not args.database_url:
+        parser.error("set BENCH_DATABASE_URL or pass --database-url")
+
+    engine = create_engine(args.database_url)
+    Base.metadata.create_all(bind=engine, tables=[Update.__table__])
+    Session = sessionmaker(bind=engine, autoflush=False)
+
+    print(f"{'rows':>8} {'per-row ms':>12} {'bulk ms':>10} {'speedup':>8}")
+    for size in args.sizes:
+        timings = {}
+        for name, insert_fn in (("per_row", _per_row), ("bulk", _bulk)):
+            topic_id = f"bench-{generate_random_string(16)}"
+            rows = _rows(topic_id, generate_random_string(32), size)
+            db = Session()
+            try:
+                started = time.perf_counter()
+                insert_fn(db, rows)
+                timings[name] = (time.perf_counter() - started) * 1000
+            finally:
+                db.execute(delete(Update).where(Update.associated_topic_id == topic_id))
+                db.commit()
+                db.close()
+
+        print(f"{size:>8} {timings['per_row']:>12.1f} {timings['bulk']:>10.1f} {timings['per_row'] / timings['bulk']:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
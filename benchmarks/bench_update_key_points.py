@@ -0,0 +1,95 @@
+"""Per-request CPU spent turning update rows into response dicts.
+
+Compares the old path (key_points stored as a JSON string and decoded with
+json.loads for every row) with rows whose key_points come back from JSONB as a
+list. psycopg2 still decodes JSONB in the driver, so the "jsonb" column also
+reports that cost separately.
+
+    python -m benchmarks.bench_update_key_points --rows 1000 5000 20000
+"""
+import argparse
+import json
+import time
+from types import SimpleNamespace
+
+from app.services.update_service import _update_to_dict
+
+
+def _legacy_update_to_dict(update) -> dict:
+    key_points_value = []
+    if update.key_points:
+        try:
+            import json
+
+            parsed = json.loads(update.key_points)
+            if isinstance(parsed, list):
+                key_points_value = parsed
+        except Exception:
+            key_points_value = []
+
+    return {
+        "id": update.id,
+        "associated_topic_id": update.associated_topic_id,
+        "title": update.title,
+        "batch_id": update.batch_id,
+        "author": update.author,
+        "summary": update.summary,
+        "source_url": update.source_url,
+        "date": update.date,
+        "key_points": key_points_value,
+        "image_link": update.image_link,
+        "created_at": update.created_at,
+    }
+
+
+def _make_rows(count: int, key_points):
+    return [
+        SimpleNamespace(
+            id=f"update-{i:08d}",
+            associated_topic_id="topic-0001",
+            title=f"Story number {i}",
+            batch_id=f"batch-{i // 10:06d}",
+            author=None,
+            summary="A multi-sentence summary of the story. " * 4,
+            source_url=f"https://example.com/news/{i}",
+            date=None,
+            key_points=key_points,
+            image_link=None,
+            created_at=1_700_000_000_000 + i,
+        )
+        for i in range(count)
+    ]
+
+
+def _best_of(repeat: int, fn) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - started)
+    return best * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, nargs="+", default=[1000, 5000, 20000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    key_points = ["First short fact about the story", "Second short fact", "Third short fact"]
+    encoded = json.dumps(key_points)
+
+    print(f"{'rows':>8} {'string+loads ms':>16} {'jsonb ms':>10} {'driver decode ms':>17} {'saved ms':>10}")
+    for count in args.rows:
+        legacy_rows = _make_rows(count, encoded)
+        jsonb_rows = _make_rows(count, key_points)
+
+        legacy_ms = _best_of(args.repeat, lambda: [_legacy_update_to_dict(row) for row in legacy_rows])
+        jsonb_ms = _best_of(args.repeat, lambda: [_update_to_dict(row) for row in jsonb_rows])
+        driver_ms = _best_of(args.repeat, lambda: [json.loads(encoded) for _ in range(count)])
+
+        print(f"{count:>8} {legacy_ms:>16.2f} {jsonb_ms:>10.2f} {driver_ms:>17.2f} {legacy_ms - jsonb_ms - driver_ms:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""Mixed load against a running server: a login burst alongside ordinary API traffic.
+
+Signs up (or reuses) one account, then for ``--duration`` seconds runs
+``--login-clients`` loops posting to /auth/login next to ``--api-clients``
+loops calling ``--api-path`` with that account's token. Reports throughput,
+status codes and p50/p99 latency for each class. The API latency is the number
+to watch: with hashing on the password pool it should barely move while logins
+saturate, and excess logins should come back as quick 503s instead of piling up.
+
+All login loops share one account and one client IP, so the server has to run
+with RATE_LIMIT_ENABLED=false or nearly every login comes back as a 429 before it
+reaches the password pool.
+
+Run it twice to compare, e.g. with PASSWORD_POOL_WORKERS=0 (threadpool) and the default:
+
+    RATE_LIMIT_ENABLED=false uvicorn app.main:app --workers 1
+    python -m benchmarks.load_auth_mixed --base-url http://127.0.0.1:8000 --login-clients 32 --api-clients 16
+"""
+import argparse
+import asyncio
+import time
+import uuid
+from collections import Counter
+from typing import List
+
+import httpx
+
+
+class Stats:
+    def __init__(self):
+        self.latencies: List[float] = []
+        self.statuses: Counter = Counter()
+
+    def record(self, started: float, status: int) -> None:
+        self.latencies.append(time.perf_counter() - started)
+        self.statuses[status] += 1
+
+    def percentile(self, pct: float) -> float:
+        if not self.latencies:
+            return 0.0
+        ordered = sorted(self.latencies)
+        return ordered[max(0, min(len(ordered) - 1, int(round(pct / 100 * len(ordered))) - 1))] * 1000
+
+
+async def _login_token(client: httpx.AsyncClient, email: str, password: str) -> str:
+    response = await client.post("/api/v1/auth/signup", json={
+        "email": email, "password": password, "first_name": "Load", "last_name": "Test",
+    })
+    if response.status_code != 201:
+        response = await client.post("/api/v1/auth/login", json={"email": email, "password": password})
+    response.raise_for_status()
+    return response.json()["access_token"]
+
+
+async def _loop(deadline: float, stats: Stats, call) -> None:
+    while time.perf_counter() < deadline:
+        started = time.perf_counter()
+        try:
+            response = await call()
+            stats.record(started, response.status_code)
+        except httpx.HTTPError as e:
+            stats.record(started, type(e).__name__)
+
+
+async def run(args) -> None:
+    email = args.email or f"load-{uuid.uuid4().hex[:12]}@example.com"
+    limits = httpx.Limits(max_connections=args.login_clients + args.api_clients + 2)
+    async with httpx.AsyncClient(base_url=args.base_url, timeout=args.timeout, limits=limits) as client:
+        token = await _login_token(client, email, args.password)
+        headers = {"Authorization": f"Bearer {token}"}
+        login_body = {"email": email, "password": args.password}
+
+        logins, api = Stats(), Stats()
+        deadline = time.perf_counter() + args.duration
+        await asyncio.gather(
+            *(_loop(deadline, logins, lambda: client.post("/api/v1/auth/login", json=login_body))
+              for _ in range(args.login_clients)),
+            *(_loop(deadline, api, lambda: client.get(args.api_path, headers=headers))
+              for _ in range(args.api_clients)),
+        )
+
+    print(f"{'traffic':<8} {'clients':>7} {'req/s':>8} {'p50 ms':>9} {'p99 ms':>9}  statuses")
+    for name, clients, stats in (("login", args.login_clients, logins), ("api", args.api_clients, api)):
+        statuses = " ".join(f"{status}={count}" for status, count in sorted(stats.statuses.items(), key=str))
+        print(
+            f"{name:<8} {clients:>7} {len(stats.latencies) / args.duration:>8.1f} "
+            f"{stats.percentile(50):>9.1f} {stats.percentile(99):>9.1f}  {statuses}"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+    parser.add_argument("--duration", type=float, default=20.0)
+    parser.add_argument("--login-clients", type=int, default=32)
+    parser.add_argument("--api-clients", type=int, default=16)
+    parser.add_argument("--api-path", default="/api/v1/user/me")
+    parser.add_argument("--email", default=None, help="existing account to log in as; a new one is signed up by default")
+    parser.add_argument("--password", default="load-test-password")
+    parser.add_argument("--timeout", type=float, default=30.0)
+    args = parser.parse_args()
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
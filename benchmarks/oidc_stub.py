@@ -0,0 +1,184 @@
+"""Local OpenID Connect stand-in for Google, for exercising the OAuth flow offline.
+
+Serves a discovery document, a JWKS, an authorize endpoint that immediately
+redirects back with a code, a token endpoint returning an RS256 id_token for a
+fixed user, and userinfo. ``metadata_delay_ms`` is added to the discovery and
+JWKS responses to stand in for the round trips to accounts.google.com; the
+counters show which requests actually reached the provider.
+
+Point the app at it with GOOGLE_DISCOVERY_URL=http://127.0.0.1:<port>/.well-known/openid-configuration.
+
+    python -m benchmarks.oidc_stub --port 9000 --metadata-delay-ms 80
+"""
+import argparse
+import asyncio
+import secrets
+import threading
+import time
+from typing import Dict, Optional
+from urllib.parse import parse_qsl, urlencode
+
+import uvicorn
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from jose import jwk, jwt
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse, RedirectResponse
+from starlette.routing import Route
+
+KEY_ID = "stub-key-1"
+
+
+class OIDCStub:
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        metadata_delay_ms: float = 0.0,
+        max_age_seconds: int = 3600,
+        email: str = "oidc.user@example.com",
+    ):
+        self.host = host
+        self.port = port
+        self.metadata_delay = metadata_delay_ms / 1000
+        self.max_age_seconds = max_age_seconds
+        self.email = email
+
+        self.discovery_requests = 0
+        self.jwks_requests = 0
+        self.token_requests = 0
+
+        private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+        private_pem = private_key.private_bytes(
+            serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8, serialization.NoEncryption(),
+        ).decode()
+        # Parsed once; loading the PEM on every jwt.encode costs tens of milliseconds.
+        self._signing_key = jwk.construct(private_pem, "RS256")
+        public_pem = private_key.public_key().public_bytes(
+            serialization.Encoding.PEM, serialization.PublicFormat.SubjectPublicKeyInfo,
+        ).decode()
+        self._public_jwk = {**jwk.construct(public_pem, "RS256").to_dict(), "kid": KEY_ID, "use": "sig"}
+        self._codes: Dict[str, dict] = {}
+
+        self._server: Optional[uvicorn.Server] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    @property
+    def discovery_url(self) -> str:
+        return f"{self.base_url}/.well-known/openid-configuration"
+
+    def _cache_headers(self) -> dict:
+        return {"Cache-Control": f"public, max-age={self.max_age_seconds}"}
+
+    async def _discovery(self, request: Request) -> JSONResponse:
+        self.discovery_requests += 1
+        await asyncio.sleep(self.metadata_delay)
+        return JSONResponse({
+            "issuer": self.base_url,
+            "authorization_endpoint": f"{self.base_url}/authorize",
+            "token_endpoint": f"{self.base_url}/token",
+            "userinfo_endpoint": f"{self.base_url}/userinfo",
+            "jwks_uri": f"{self.base_url}/jwks",
+            "response_types_supported": ["code"],
+            "subject_types_supported": ["public"],
+            "id_token_signing_alg_values_supported": ["RS256"],
+            "scopes_supported": ["openid", "email", "profile"],
+        }, headers=self._cache_headers())
+
+    async def _jwks(self, request: Request) -> JSONResponse:
+        self.jwks_requests += 1
+        await asyncio.sleep(self.metadata_delay)
+        return JSONResponse({"keys": [self._public_jwk]}, headers=self._cache_headers())
+
+    async def _authorize(self, request: Request) -> RedirectResponse:
+        params = request.query_params
+        code = secrets.token_urlsafe(16)
+        self._codes[code] = {"client_id": params.get("client_id"), "nonce": params.get("nonce")}
+        query = urlencode({"code": code, "state": params.get("state", "")})
+        return RedirectResponse(f"{params['redirect_uri']}?{query}", status_code=302)
+
+    async def _token(self, request: Request) -> JSONResponse:
+        self.token_requests += 1
+        form = dict(parse_qsl((await request.body()).decode()))
+        grant = self._codes.pop(form.get("code", ""), None)
+        if grant is None:
+            return JSONResponse({"error": "invalid_grant"}, status_code=400)
+
+        now = int(time.time())
+        claims = {
+            "iss": self.base_url,
+            "aud": grant["client_id"] or form.get("client_id"),
+            "sub": "stub-user-1",
+            "email": self.email,
+            "email_verified": True,
+            "given_name": "OIDC",
+            "family_name": "User",
+            "iat": now,
+            "exp": now + 3600,
+        }
+        if grant["nonce"]:
+            claims["nonce"] = grant["nonce"]
+        id_token = jwt.encode(claims, self._signing_key, algorithm="RS256", headers={"kid": KEY_ID})
+        return JSONResponse({
+            "access_token": secrets.token_urlsafe(24),
+            "token_type": "Bearer",
+            "expires_in": 3600,
+            "scope": "openid email profile",
+            "id_token": id_token,
+        })
+
+    async def _userinfo(self, request: Request) -> JSONResponse:
+        return JSONResponse({"sub": "stub-user-1", "email": self.email, "email_verified": True})
+
+    def app(self) -> Starlette:
+        return Starlette(routes=[
+            Route("/.well-known/openid-configuration", self._discovery),
+            Route("/jwks", self._jwks),
+            Route("/authorize", self._authorize),
+            Route("/token", self._token, methods=["POST"]),
+            Route("/userinfo", self._userinfo),
+        ])
+
+    def start(self) -> "OIDCStub":
+        """Serve on a background thread; returns once the port is bound."""
+        config = uvicorn.Config(self.app(), host=self.host, port=self.port, log_level="warning", lifespan="off")
+        self._server = uvicorn.Server(config)
+        self._thread = threading.Thread(target=self._server.run, name="oidc-stub", daemon=True)
+        self._thread.start()
+        while not self._server.started:
+            time.sleep(0.01)
+        self.port = self._server.servers[0].sockets[0].getsockname()[1]
+        return self
+
+    def stop(self) -> None:
+        if self._server is not None:
+            self._server.should_exit = True
+            self._thread.join(timeout=5)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9000)
+    parser.add_argument("--metadata-delay-ms", type=float, default=0.0)
+    parser.add_argument("--max-age-seconds", type=int, default=3600)
+    args = parser.parse_args()
+
+    stub = OIDCStub(args.host, args.port, args.metadata_delay_ms, args.max_age_seconds).start()
+    print(f"OIDC stand-in at {stub.discovery_url}")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        print(
+            f"discovery={stub.discovery_requests} jwks={stub.jwks_requests} token={stub.token_requests}"
+        )
+        stub.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+"""Local SMTP stand-in that accepts and discards mail, for the email benchmarks.
+
+Speaks enough ESMTP for smtplib (EHLO, AUTH PLAIN/LOGIN, MAIL, RCPT, DATA, RSET,
+NOOP, QUIT) but no STARTTLS, so point the app at it with SMTP_USE_TLS=false.
+``handshake_delay_ms`` is added to the greeting and to AUTH to stand in for the
+TLS handshake and login round trips of a real provider.
+
+    python -m benchmarks.smtp_sink --port 2525 --handshake-delay-ms 40
+"""
+import argparse
+import asyncio
+import threading
+from typing import Optional, Set
+
+
+class SMTPSink:
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, handshake_delay_ms: float = 0.0, message_delay_ms: float = 0.0):
+        self.host = host
+        self.port = port
+        self.handshake_delay = handshake_delay_ms / 1000
+        self.message_delay = message_delay_ms / 1000
+
+        self.connections_opened = 0
+        self.messages_received = 0
+        self.open_connections = 0
+        self.peak_connections = 0
+
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._writers: Set[asyncio.StreamWriter] = set()
+        self._thread: Optional[threading.Thread] = None
+        self._started = threading.Event()
+
+    async def _reply(self, writer: asyncio.StreamWriter, line: str) -> None:
+        writer.write(line.encode() + b"\r\n")
+        await writer.drain()
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self.connections_opened += 1
+        self.open_connections += 1
+        self.peak_connections = max(self.peak_connections, self.open_connections)
+        self._writers.add(writer)
+        try:
+            await asyncio.sleep(self.handshake_delay)
+            await self._reply(writer, "220 sink ESMTP ready")
+            while True:
+                raw = await reader.readline()
+                if not raw:
+                    return
+                command = raw.decode(errors="replace").strip()
+                verb = command.split(" ", 1)[0].upper()
+
+                if verb == "EHLO":
+                    writer.write(b"250-sink\r\n250-AUTH PLAIN LOGIN\r\n250-8BITMIME\r\n250 SIZE 52428800\r\n")
+                    await writer.drain()
+                elif verb == "AUTH":
+                    parts = command.split()
+                    mechanism = parts[1].upper() if len(parts) > 1 else ""
+                    if mechanism == "LOGIN":
+                        await self._reply(writer, "334 VXNlcm5hbWU6")
+                        await reader.readline()
+                        await self._reply(writer, "334 UGFzc3dvcmQ6")
+                        await reader.readline()
+                    elif len(parts) < 3:
+                        await self._reply(writer, "334 ")
+                        await reader.readline()
+                    await asyncio.sleep(self.handshake_delay)
+                    await self._reply(writer, "235 Authentication successful")
+                elif verb == "DATA":
+                    await self._reply(writer, "354 End data with <CR><LF>.<CR><LF>")
+                    while (await reader.readline()) not in (b".\r\n", b".\n", b""):
+                        pass
+                    await asyncio.sleep(self.message_delay)
+                    self.messages_received += 1
+                    await self._reply(writer, "250 Queued")
+                elif verb == "QUIT":
+                    await self._reply(writer, "221 Bye")
+                    return
+                elif verb in ("HELO", "MAIL", "RCPT", "RSET", "NOOP"):
+                    await self._reply(writer, "250 OK")
+                else:
+                    await self._reply(writer, "502 Command not implemented")
+        except (ConnectionError, asyncio.CancelledError):
+            pass
+        finally:
+            self._writers.discard(writer)
+            self.open_connections -= 1
+            writer.close()
+
+    async def _serve(self) -> None:
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        self._started.set()
+        async with self._server:
+            await self._server.serve_forever()
+
+    def start(self) -> "SMTPSink":
+        """Serve on a background thread; returns once the port is bound."""
+        def run() -> None:
+            self._loop = asyncio.new_event_loop()
+            try:
+                self._loop.run_until_complete(self._serve())
+            except asyncio.CancelledError:
+                pass
+
+        self._thread = threading.Thread(target=run, name="smtp-sink", daemon=True)
+        self._thread.start()
+        self._started.wait()
+        return self
+
+    def drop_connections(self) -> None:
+        """Close every open session server-side, like a provider timing out idle clients."""
+        def close_all() -> None:
+            for writer in list(self._writers):
+                writer.close()
+
+        self._loop.call_soon_threadsafe(close_all)
+
+    def stop(self) -> None:
+        if self._loop is None:
+            return
+        self._loop.call_soon_threadsafe(self._server.close)
+        for task in asyncio.all_tasks(self._loop):
+            self._loop.call_soon_threadsafe(task.cancel)
+        self._thread.join(timeout=5)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=2525)
+    parser.add_argument("--handshake-delay-ms", type=float, default=0.0)
+    parser.add_argument("--message-delay-ms", type=float, default=0.0)
+    args = parser.parse_args()
+
+    sink = SMTPSink(args.host, args.port, args.handshake_delay_ms, args.message_delay_ms).start()
+    print(f"SMTP sink listening on {sink.host}:{sink.port}")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        print(f"received {sink.messages_received} messages over {sink.connections_opened} connections")
+        sink.stop()
+
+
+if __name__ == "__main__":
+    main()